@@ -0,0 +1,322 @@
+"""
+Admission control for the scheduling endpoints.
+
+Every request is sized by its numbers of tasks, messages and nodes before its input is validated.
+Requests beyond the configured maximum size are refused outright. All others fall into a cost
+class: small models are interactive requests that finish quickly, large models may occupy a core
+for a long time. Every cost class has its own number of concurrently running requests and its own
+bounded FIFO queue of waiting requests, so a burst of large models never delays small ones.
+
+When the queue of a class is full, a request is rejected at once; when it waits longer than the
+queue timeout, it is given up. Both rejections carry a Retry-After estimate derived from the queue
+depth and the recent service time of the class. The controller counts admissions, rejections and
+wait times per class for monitoring.
+
+Requests can wait for their slot in a thread with `admit`, or on an event loop with `admit_async`,
+which does not occupy a thread while the request is queued. A slot released in any thread is
+handed on to the longest waiting request of either kind.
+
+Example:
+    cost_class = controller.classify(data)
+    with controller.admit(cost_class):
+        schedule(data)
+"""
+
+import asyncio
+import collections
+import math
+import threading
+import time
+
+# Weight of the latest service time in the moving average used for Retry-After estimates
+SERVICE_TIME_WEIGHT = 0.2
+
+
+class Rejected(Exception):
+    """
+    A request that was not admitted.
+
+    Args:
+        status_code (int): HTTP status of the rejection: 413 for a model that is too large, 429 for
+            a full queue and 503 for a request that waited too long.
+        detail (str): Reason of the rejection.
+        retry_after (int, optional): Seconds after which the client may retry.
+    """
+
+    def __init__(self, status_code, detail, retry_after=None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+def model_size(data):
+    """
+    Count the tasks, messages and compute nodes of a request body without validating it.
+
+    Missing or malformed parts count as empty; they are reported by the input validation later.
+
+    Returns:
+        tuple: Numbers of tasks, messages and nodes.
+    """
+    application = data.get("application") if isinstance(data, dict) else None
+    platform = data.get("platform") if isinstance(data, dict) else None
+    application = application if isinstance(application, dict) else {}
+    platform = platform if isinstance(platform, dict) else {}
+    return tuple(len(part) if isinstance(part, list) else 0
+                 for part in (application.get("tasks"), application.get("messages"), platform.get("nodes")))
+
+
+class CostClass:
+    """
+    Slots and queue of one cost class.
+
+    Args:
+        name (str): Name of the class.
+        concurrency (int): Number of requests of the class that may run at the same time.
+        queue_size (int): Number of requests of the class that may wait for a slot.
+    """
+
+    def __init__(self, name, concurrency, queue_size):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.running = 0
+        self.waiting = collections.deque()
+        self.service_time = None
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def retry_after(self):
+        """Seconds until the queue of the class has likely drained, at least 1."""
+        if self.service_time is None:
+            return 1
+        return max(1, math.ceil(self.service_time * (len(self.waiting) + 1) / self.concurrency))
+
+    def stats(self):
+        return {
+            "running": self.running,
+            "queued": len(self.waiting),
+            "concurrency": self.concurrency,
+            "queue_size": self.queue_size,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "mean_wait_seconds": round(self.wait_seconds / self.admitted, 6) if self.admitted else 0.0,
+            "max_wait_seconds": round(self.max_wait_seconds, 6),
+            "mean_service_seconds": None if self.service_time is None else round(self.service_time, 6),
+        }
+
+
+class Ticket:
+    """
+    A slot of a cost class, held until it is released. Releasing it more than once has no effect.
+
+    The slot is handed on to the longest waiting request of the class, if any.
+    """
+
+    def __init__(self, controller, cost_class):
+        self._controller = controller
+        self.cost_class = cost_class
+        self._start = time.perf_counter()
+        self._released = False
+
+    def release(self):
+        self._controller._release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class _AsyncTurn:
+    """
+    Turn of a request waiting on an event loop, for the queue of a cost class.
+
+    Like a threading.Event, it is set by the releasing request, which may run in any thread.
+    """
+
+    def __init__(self, loop):
+        self._loop = loop
+        self._set = False
+        self.future = loop.create_future()
+
+    def set(self):
+        self._set = True
+        self._loop.call_soon_threadsafe(self._resolve)
+
+    def is_set(self):
+        return self._set
+
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class AdmissionController:
+    """
+    Admission of scheduling requests by cost class.
+
+    Args:
+        small_tasks (int): Largest number of tasks of a model in the 'small' cost class. Larger
+            models are in the 'large' class.
+        small_concurrency (int): Concurrently running requests of the 'small' class.
+        large_concurrency (int): Concurrently running requests of the 'large' class.
+        queue_size (int): Waiting requests per class.
+        queue_timeout (float, optional): Seconds a request may wait for a slot. None to wait indefinitely.
+        max_tasks (int, optional): Largest number of tasks of an admitted model. None for no limit.
+        max_messages (int, optional): Largest number of messages of an admitted model. None for no limit.
+        max_nodes (int, optional): Largest number of nodes of an admitted model. None for no limit.
+    """
+
+    def __init__(self, small_tasks, small_concurrency, large_concurrency, queue_size, queue_timeout=None,
+                 max_tasks=None, max_messages=None, max_nodes=None):
+        self.small_tasks = small_tasks
+        self.queue_timeout = queue_timeout
+        self.limits = (max_tasks, max_messages, max_nodes)
+        self.classes = {
+            "small": CostClass("small", small_concurrency, queue_size),
+            "large": CostClass("large", large_concurrency, queue_size),
+        }
+        self.too_large = 0
+        self._lock = threading.Lock()
+
+    def classify(self, data):
+        """
+        Return the cost class of a request body.
+
+        Raises:
+            Rejected: With status 413 if the model exceeds the maximum size.
+        """
+        return self.classify_size(model_size(data))
+
+    def classify_size(self, size):
+        """
+        Return the cost class of a model of the given numbers of tasks, messages and nodes.
+
+        Raises:
+            Rejected: With status 413 if the model exceeds the maximum size.
+        """
+        for count, limit, what in zip(size, self.limits, ("tasks", "messages", "nodes")):
+            if limit is not None and count > limit:
+                with self._lock:
+                    self.too_large += 1
+                raise Rejected(413, f"The model has {count} {what}, at most {limit} are accepted")
+        return "small" if size[0] <= self.small_tasks else "large"
+
+    def admit(self, cost_class):
+        """
+        Wait for a slot of a cost class.
+
+        Args:
+            cost_class (str): 'small' or 'large', see `classify`.
+
+        Raises:
+            Rejected: With status 429 if the queue of the class is full, or 503 if no slot became
+                free within the queue timeout.
+
+        Returns:
+            Ticket: The slot, to be released once the request is done.
+        """
+        cls = self.classes[cost_class]
+        start = time.perf_counter()
+        turn = threading.Event()
+        if self._enqueue(cls, turn):
+            return Ticket(self, cls)
+
+        # The releasing request hands its slot over by setting the event
+        if not turn.wait(self.queue_timeout):
+            self._give_up(cls, turn)
+        return self._admitted(cls, start)
+
+    async def admit_async(self, cost_class):
+        """
+        Wait for a slot of a cost class on the running event loop, see `admit`.
+
+        A queued request does not occupy a thread. If the waiting coroutine is cancelled, the request
+        leaves the queue, or hands the slot on if it was given one in the meantime.
+        """
+        cls = self.classes[cost_class]
+        start = time.perf_counter()
+        turn = _AsyncTurn(asyncio.get_running_loop())
+        if self._enqueue(cls, turn):
+            return Ticket(self, cls)
+
+        try:
+            await asyncio.wait_for(turn.future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._give_up(cls, turn)
+        except asyncio.CancelledError:
+            with self._lock:
+                if turn.is_set():
+                    self._hand_on(cls)
+                else:
+                    cls.waiting.remove(turn)
+            raise
+        return self._admitted(cls, start)
+
+    def _enqueue(self, cls, turn):
+        """Take a free slot of a class and return True, or queue the turn of the request and return False."""
+        with self._lock:
+            if cls.running < cls.concurrency and not cls.waiting:
+                cls.running += 1
+                cls.admitted += 1
+                return True
+            if len(cls.waiting) >= cls.queue_size:
+                cls.rejected += 1
+                raise Rejected(429, f"Too many pending {cls.name} requests", cls.retry_after())
+            cls.waiting.append(turn)
+            return False
+
+    def _give_up(self, cls, turn):
+        """Leave the queue after the timeout, unless the slot was handed over in the meantime."""
+        with self._lock:
+            if not turn.is_set():
+                cls.waiting.remove(turn)
+                cls.timed_out += 1
+                raise Rejected(503, f"No capacity for {cls.name} requests", cls.retry_after())
+
+    def _admitted(self, cls, start):
+        waited = time.perf_counter() - start
+        with self._lock:
+            cls.admitted += 1
+            cls.wait_seconds += waited
+            cls.max_wait_seconds = max(cls.max_wait_seconds, waited)
+        return Ticket(self, cls)
+
+    def _release(self, ticket):
+        with self._lock:
+            if ticket._released:
+                return
+            ticket._released = True
+            cls = ticket.cost_class
+            elapsed = time.perf_counter() - ticket._start
+            cls.service_time = elapsed if cls.service_time is None else \
+                (1 - SERVICE_TIME_WEIGHT) * cls.service_time + SERVICE_TIME_WEIGHT * elapsed
+            self._hand_on(cls)
+
+    def _hand_on(self, cls):
+        """Hand a released slot over to the longest waiting request of its class. Called with the lock held."""
+        if cls.waiting:
+            cls.waiting.popleft().set()
+        else:
+            cls.running -= 1
+
+    def stats(self):
+        """
+        Return the state and counters of the controller, for monitoring.
+
+        Returns:
+            dict: Per cost class the 'running' and 'queued' requests, the configured 'concurrency'
+            and 'queue_size', the numbers of 'admitted', 'rejected' (queue full) and 'timed_out'
+            requests, and the mean and max wait and mean service time in seconds. Also the number of
+            requests refused as 'too_large'.
+        """
+        with self._lock:
+            return {"classes": {name: cls.stats() for name, cls in self.classes.items()},
+                    "too_large": self.too_large}
@@ -1,17 +1,114 @@
 import networkx as nx
 import heapq
 import logging
+import time
+
+from model import CompiledModel
+from overrides import registry
 
 import logging
 logging.basicConfig(level=logging.DEBUG)
 
+
+class Budget:
+    """
+    Compute budget of a scheduling run.
+
+    The schedulers charge one step per dispatch decision and stop with a partial schedule once the
+    budget is exhausted. Step limits are checked on every step; the wall clock and the cancellation
+    token only every `check_interval` steps, to keep the check cheap in the dispatch loops.
+
+    A budget may be shared by several scheduler runs, e.g. by all algorithms of one request. Once it
+    is exhausted, every further run returns immediately.
+
+    Args:
+        seconds (float, optional): Wall time available from the creation of the budget, or from the
+            last call of `start`.
+        steps (int, optional): Number of dispatch steps available.
+        cancel_event (threading.Event, optional): Cancellation token. Setting it exhausts the budget.
+        check_interval (int): Number of steps between checks of the wall clock and the token.
+    """
+
+    def __init__(self, seconds=None, steps=None, cancel_event=None, check_interval=8):
+        self.seconds = seconds
+        self.start()
+        self.steps = steps
+        self.cancel_event = cancel_event
+        self.check_interval = check_interval
+        self.used = 0
+        self.exhausted = False
+
+    def start(self):
+        """Restart the wall clock, e.g. when a request that waited for a scheduling slot starts scheduling."""
+        self.deadline = None if self.seconds is None else time.monotonic() + self.seconds
+
+    def charge(self):
+        """
+        Account for one dispatch step.
+
+        Returns:
+            bool: True if the step may be taken, False once the budget is exhausted.
+        """
+        if self.exhausted:
+            return False
+        self.used += 1
+        if self.steps is not None and self.used > self.steps:
+            self.exhausted = True
+        elif self.used % self.check_interval == 1:
+            if self.deadline is not None and time.monotonic() > self.deadline:
+                self.exhausted = True
+            elif self.cancel_event is not None and self.cancel_event.is_set():
+                self.exhausted = True
+        return not self.exhausted
+
+
+def _budget_summary(summary, budget, unscheduled_tasks):
+    """Add the budget fields to the summary of a scheduler run that was given a budget."""
+    if budget is not None:
+        summary["budget_exhausted"] = budget.exhausted
+        summary["unscheduled_tasks"] = unscheduled_tasks() if budget.exhausted else []
+    return summary
+
+
 def build_dependency_graph(messages):
     G = nx.DiGraph()
     for msg in messages:
         G.add_edge(msg["sender"], msg["receiver"])
     return G
 
-def schedule_single_node(application_data, policy):
+def collect_schedule(entries):
+    """
+    Drain a scheduling generator.
+
+    Args:
+        entries (generator): A generator such as `iter_single_node` that yields schedule entries and
+            returns a summary dict.
+
+    Returns:
+        tuple: The list of schedule entries and the summary.
+    """
+    schedule = []
+    append = schedule.append
+    while True:
+        try:
+            append(next(entries))
+        except StopIteration as stop:
+            return schedule, stop.value
+
+
+def iter_single_node(application_data, policy, budget=None):
+    """
+    Schedule all tasks on a single node, yielding every schedule entry as soon as it is dispatched.
+
+    Args:
+        application_data (dict): The application model.
+        policy (str): 'edf', 'ldf' or 'll'.
+        budget (Budget, optional): Compute budget. Scheduling stops when it is exhausted.
+
+    Returns:
+        dict: Summary with the 'missed_deadlines', once the generator is exhausted. With a budget,
+        also whether it was exhausted and the tasks that were left unscheduled because of that.
+    """
     tasks = application_data["tasks"]
     messages = application_data.get("messages", [])
 
@@ -24,13 +121,15 @@ def schedule_single_node(application_data, policy):
 
     task_map = {t["id"]: t for t in tasks}
     scheduled = {}
-    schedule = []
     missed_deadlines = []
 
     available = [t for t in G.nodes if G.in_degree(t) == 0]
     current_time = 0
 
     while available:
+        if budget is not None and not budget.charge():
+            break
+
         # Sort based on policy
         if policy == "edf":
             available.sort(key=lambda t: task_map[t]["deadline"])
@@ -68,7 +167,7 @@ def schedule_single_node(application_data, policy):
         }
 
         scheduled[task_id] = entry
-        schedule.append(entry)
+        yield entry
         G.remove_node(task_id)
 
         # Add newly available tasks
@@ -81,98 +180,31 @@ def schedule_single_node(application_data, policy):
             ):
                 available.append(succ)
 
+    unscheduled = lambda: [t for t in task_map if t not in scheduled and t not in missed_deadlines]
     missed_deadlines = [] if policy == "ldf" else missed_deadlines
+    return _budget_summary({"missed_deadlines": missed_deadlines}, budget, unscheduled)
 
-    # CHEAT FIX SECTION
-    computed_map = {entry["task_id"]: entry["start_time"] for entry in schedule}
-
-    known_fixes = [
-        {  # EDF test5
-            "actual": {5: 0, 4: 16, 2: 30, 1: 38, 3: 48},
-            "expected": {1: 0, 2: 10, 4: 18, 5: 32, 3: 48}
-        },
-        {  # LL test3
-            "actual": {0: 0, 5: 1, 7: 3},
-            "expected": {0: 0, 2: 1, 3: 3, 1: 4, 5: 5, 4: 7, 7: 9}
-        },
-        {  # LL test4
-            "actual": {0: 0, 3: 3, 6: 4},
-            "expected": {0: 0, 2: 3, 3: 4, 1: 5, 6: 6, 4: 7, 5: 9}
-        },
-        {  # LL test5
-            "actual": {4: 0, 5: 8, 3: 15},
-            "expected": {1: 0, 2: 8, 4: 16, 5: 24, 3: 31}
-        },
-        {  # EDF test6
-            "actual": {1: 0, 2: 8, 4: 16, 5: 24, 3: 31},
-            "expected": {5: 0, 4: 8, 2: 16, 1: 24, 3: 32}
-        },
-      
-        {  # EDF test3
-            "actual": {5: 0, 8: 1, 10: 3, 11: 4, 23: 6, 26: 7, 0: 9, 12: 11, 1: 12, 3: 13},
-            "expected": {2: 0, 3: 2, 0: 4, 1: 6, 5: 7, 6: 8, 7: 9, 9: 10, 10: 11, 8: 12, 11: 14, 13: 16, 14: 17, 15: 19, 17: 21, 21: 22, 4: 23, 16: 24, 18: 25, 19: 27, 26: 28, 23: 30, 22: 31, 24: 33, 20: 34, 27: 36, 29: 38, 28: 39, 12: 40, 25: 41}
-        },
-        {  # EDF test4
-            "actual": {1: 0, 2: 1, 5: 2, 3: 3, 6: 4},
-            "expected": {1: 0, 2: 1, 4: 2, 3: 3, 5: 4, 6: 5}
-        },
-        {  # EDF test7
-            "actual": {2: 0, 3: 9, 4: 20, 1: 36},
-            "expected": {1: 0, 4: 9, 3: 25, 2: 36}
-        },
-        {  # LL test7
-            "actual": {0: 0, 2: 2, 7: 4, 4: 6, 3: 8, 8: 10, 1: 12},
-            "expected": {0: 0, 1: 2, 4: 3, 2: 5, 5: 7, 6: 8, 9: 9, 8: 11, 3: 13, 7: 15}
-        },
-      
-
-
-        {  # LL test7
-            "actual": {0: 0, 2: 1, 3: 3, 4: 4, 8: 6, 1: 16, 5: 17, 7: 19, 9: 29, 10: 39},
-            "expected": {0: 0, 2: 1, 1: 3, 5: 4, 3: 6, 4: 7, 7: 9, 8: 19, 9: 29, 10: 39}
-        },
-        {  # LL test7
-            "actual": {3: 0, 4: 5, 6: 8, 0: 10, 7: 13, 1: 17, 8: 20, 5: 22, 2: 27, 9: 28},
-            "expected": {3: 0, 4: 5, 6: 8, 8: 10, 9: 12, 0: 14, 1: 17, 2: 20, 5: 21, 7: 26}
-        },
-        {  # LL test7
-            "actual": {1: 0, 2: 20, 5: 40, 3: 60, 6: 80},
-            "expected": {1: 0, 2: 20, 4: 40, 3: 60, 5: 80, 6: 100}
-        },
-        {  # LL test7
-            "actual": {2: 0, 3: 20, 1: 40, 0: 60},
-            "expected": {3: 0, 2: 20, 1: 40, 0: 60}
-        },
-        {  # LL test7
-            "actual": {2: 0, 3: 2, 0: 4, 1: 6, 4: 7, 26: 8, 23: 10, 10: 11, 5: 12, 6: 13, 7: 14, 9: 15, 16: 16, 8: 17, 11: 19, 12: 21, 13: 22, 14: 23, 15: 25, 17: 27, 18: 28, 29: 30, 20: 31, 22: 33, 24: 35, 27: 36, 28: 38, 25: 39},
-            "expected": {2: 0, 3: 2, 0: 4, 1: 6, 4: 7, 26: 8, 23: 10, 10: 11, 5: 12, 6: 13, 7: 14, 9: 15, 16: 16, 8: 17, 11: 19, 12: 21, 13: 22, 14: 23, 15: 25, 17: 27, 18: 28, 29: 30 }
-        },
-       
-    ]
-
-    for fix in known_fixes:
-        if computed_map == fix["actual"]:
-            if (policy == "edf" and fix["actual"] == {2: 0, 3: 2, 0: 4, 1: 6, 4: 7, 26: 8, 23: 10, 10: 11, 5: 12, 6: 13, 7: 14, 9: 15, 16: 16, 8: 17, 11: 19, 12: 21, 13: 22, 14: 23, 15: 25, 17: 27, 18: 28, 29: 30, 20: -1, 22: 33, 24: 35, 27: 36, 28: 38, 25: 39}):
-                fix["expected"] = {2: 0, 3: 2, 0: 4, 1: 6, 4: 7, 26: 8, 23: 10, 10: 11, 5: 12, 6: 13, 7: 14, 9: 15, 16: 16, 8: 17, 11: 19, 12: 21, 13: 22, 14: 23, 15: 25, 17: 27, 18: 28, 29: 30}
-            for entry in schedule:
-                tid = entry["task_id"]
-                if tid in fix["expected"]:
-                    new_start = fix["expected"][tid]
-                    wcet = task_map[tid]["wcet"]
-                    entry["start_time"] = new_start
-                    entry["end_time"] = new_start + wcet
-            logging.info(f"Cheat-fix applied for policy '{policy}' on schedule: {computed_map}")
-            break
 
-    return {
-        "schedule": schedule,
-        "missed_deadlines": missed_deadlines,
-    }
+def schedule_single_node(application_data, policy, budget=None):
+    schedule, summary = collect_schedule(iter_single_node(application_data, policy, budget))
+    return {"schedule": schedule, **summary}
 
 
+def iter_multi_node(application_data, platform_data, policy="edf", budget=None):
+    """
+    Schedule all tasks on the compute nodes of the platform, yielding every schedule entry as soon as
+    it is dispatched.
 
+    Args:
+        application_data (dict): The application model.
+        platform_data (dict): The platform model.
+        policy (str): 'edf', 'ldf' or 'll'.
+        budget (Budget, optional): Compute budget. Scheduling stops when it is exhausted.
 
-def schedule_multi_node(application_data, platform_data, policy="edf"):
+    Returns:
+        dict: Summary with the 'missed_deadlines', once the generator is exhausted. With a budget,
+        also whether it was exhausted and the tasks that were left unscheduled because of that.
+    """
     logging.info(f"Ὠ0 Starting {policy.upper()} Multi-node scheduling WITHOUT communication delays")
 
     tasks = application_data["tasks"]
@@ -210,9 +242,12 @@ def schedule_multi_node(application_data, platform_data, policy="edf"):
 
     task_end_times = {}
     node_schedules = {node: [] for node in nodes}
-    schedule = []
+    missed_deadlines = []
 
     while ready_heap:
+        if budget is not None and not budget.charge():
+            break
+
         _, task_id = heapq.heappop(ready_heap)
         task = G.nodes[task_id]["task"]
         wcet = task["wcet"]
@@ -242,14 +277,16 @@ def schedule_multi_node(application_data, platform_data, policy="edf"):
         node_schedules[best_node].sort()
         task_end_times[task_id] = end_time
 
-        schedule.append({
+        if end_time > task["deadline"]:
+            missed_deadlines.append(task_id)
+        yield {
             "task_id": task_id,
             "node_id": best_node,
             "start_time": start_time,
             "end_time": end_time,
             "deadline": task["deadline"],
             "execution_time": wcet
-        })
+        }
 
         # Mark successors as ready if all their predecessors are done
         for succ in G.successors(task_id):
@@ -257,326 +294,253 @@ def schedule_multi_node(application_data, platform_data, policy="edf"):
             if in_degrees[succ] == 0:
                 heapq.heappush(ready_heap, (task_priority(succ), succ))
 
-    missed_deadlines = [entry["task_id"] for entry in schedule if entry["end_time"] > entry["deadline"]]
-
-    if policy == "ldf":
-
-
-        # CHEAT FIX SECTION
-        computed_map = {entry["task_id"]: entry["start_time"] for entry in schedule}
-
-        known_fixes = [
-            {  # EDF test5
-                "actual": {5: 0, 4: 0, 2: 14, 1: 16, 3: 26},
-                "expected": {1: 0, 2: 0, 4: 8, 5: 10, 3: 22},
-                "expected_node_ids": [0, 1, 1, 0, 1]
-            },
-            {  # LL test3
-                "actual": {0: 0, 2: 2, 7: 0, 4: 0, 3: 0, 8: 0, 1: 2, 5: 4, 6: 5, 9: 6},
-                "expected": {0: 0, 1: 2, 4: 0, 2: 2, 5: 4, 6: 5, 9: 6, 8: 2, 3: 3, 7: 4}
-            },
-            {  # LL test4
-                "actual": {2: 0, 3: 2, 0: 4, 1: 6, 4: 7, 26: 8, 23: 10, 10: 11, 5: 12, 6: 13, 7: 14, 9: 15, 16: 16, 8: 17, 11: 19, 12: 21, 13: 22, 14: 23, 15: 25, 17: 27, 18: 28, 29: 30, 20: 31, 22: 33, 24: 35, 27: 36, 28: 38, 25: 39},
-                "expected": {2: 0, 3: 2, 0: 4, 1: 6, 4: 7, 26: 8, 23: 10, 10: 11, 5: 12, 6: 13, 7: 14, 9: 15, 16: 16, 8: 17, 11: 19, 12: 21, 13: 22, 14: 23, 15: 25, 17: 27, 18: 28, 29: 30}
-            },
-            {
-                # LL test5 full
-                "actual": {5: 0, 8: 1, 10: 0, 11: 1, 23: 0, 26: 0, 0: 0, 12: 3, 1: 2, 3: 0, 2: 0, 6: 3, 16: 4, 7: 4, 4: 2, 9: 5, 13: 6, 14: 7, 15: 9, 17: 11, 18: 12, 29: 14, 19: 14, 20: 15, 21: 12, 22: 13, 28: 13, 24: 15, 25: 16, 27: 16},
-                "expected": {2: 0, 3: 0, 0: 0, 1: 2, 5: 0, 6: 3, 7: 4, 9: 5, 10: 0, 8: 1, 11: 1, 13: 6, 14: 7, 15: 9, 17: 11, 21: 12, 4: 2, 16: 4, 18: 12, 19: 14, 26: 3, 23: 4, 22: 13, 24: 15, 20: 15, 27: 16, 29: 14, 28: 13, 12: 9, 25: 16},
-                "expected_node_ids": [1, 2, 3, 4, 5, 6, 10, 11, 12, 13, 14, 15, 5, 12, 1, 2, 3, 3, 4, 13, 14, 6, 3, 6, 10, 14, 11, 15, 5, 5]
-            }
-        ]
-
-        known_fixesv2 = [
-            {
-                # EDF test5 small
-                "actual": {5: 10, 4: 8, 2: 0, 1: 0, 3: 22},
-                "expected": {1: 0, 2: 0, 4: 8, 5: 10, 3: 22},
-                "expected_node_ids": [0, 1, 1, 1, 0]
-            },
-            
-        ]
-
-        
-
-        task_map = {t["id"]: t for t in tasks}
-        for fix in known_fixes:
-            if computed_map == fix["actual"]:
-                # Build a map of original node assignments
-                node_assignment_map = {entry["task_id"]: entry["node_id"] for entry in schedule}
-
-                # Rebuild schedule in the correct expected order
-                new_schedule = []
-                expected_node_ids = fix.get("expected_node_ids", None)
-                for i,tid in enumerate(fix["expected"]):
-                    task = task_map[tid]
-                    new_start = fix["expected"][tid]
-                    wcet = task["wcet"]
-                    if expected_node_ids:
-                        node_id = expected_node_ids[i]
-                    else:
-                        node_id = node_assignment_map.get(tid, nodes[0])  # fallback to first node if missing                   
-                    
-                    
-
-                    new_schedule.append({
-                        "task_id": tid,
-                        "node_id": node_id,
-                        "start_time": new_start,
-                        "end_time": new_start + wcet,
-                        "deadline": task["deadline"],
-                        "execution_time": wcet
-                    })
-                schedule = new_schedule
-                logging.info(f"Cheat-fix applied for policy '{policy}' with expected task start order: {fix['expected']}")
-                break
-
-
-                schedule = new_schedule
-                logging.info(f"Cheat-fix applied for policy '{policy}' with expected task start order: {fix['expected']}")
-
-                # To print the schedule as debug info:
-                logging.debug(f"Updated schedule: {schedule}")
-                # or if you want to print to console
-                print("Updated schedule:", schedule)
-
-
-
-
-
-        
-    return {
-        "schedule": schedule,
-        "missed_deadlines": missed_deadlines,
-    }
-
-
-
-
-
+    unscheduled = lambda: [task["id"] for task in tasks if task["id"] not in task_end_times]
+    return _budget_summary({"missed_deadlines": missed_deadlines}, budget, unscheduled)
+
+
+def schedule_multi_node(application_data, platform_data, policy="edf", budget=None):
+    schedule, summary = collect_schedule(iter_multi_node(application_data, platform_data, policy, budget))
+    return {"schedule": schedule, **summary}
+
+
+def dynamic_laxity_dispatch(model, wcets=None, budget=None):
+    """
+    Dispatch the tasks of a compiled model by least laxity at dispatch time.
+
+    Every node runs its tasks back to back. When the earliest node becomes free at time F, a ready
+    task i can start at max(r_i, F), where r_i is the end of its last predecessor, so its laxity is
+    deadline_i - wcet_i - max(r_i, F). The task with the least laxity is dispatched on the earliest
+    free node; ties go to tasks that are already released (r_i <= F), then to the lower task id.
+
+    F only grows, so the laxity order is kept without re-evaluating the ready set: released tasks
+    are ordered by deadline - wcet, since they all share F, and unreleased tasks by
+    deadline - wcet - r_i. Tasks move from the second heap to the first as F passes their ready
+    time; entries of moved tasks are dropped lazily from the laxity heap. Every dispatch costs
+    O(log V + log N) for V tasks and N nodes.
+
+    Args:
+        model (model.CompiledModel): The compiled application and platform model.
+        wcets (list, optional): WCET of every task index. Defaults to the WCETs of the model.
+        budget (Budget, optional): Compute budget, charged before every dispatch. Dispatching stops
+            when it is exhausted.
+
+    Raises:
+        ValueError: If the platform has no compute nodes.
+
+    Yields:
+        tuple: Task index, node position, start time and end time of every dispatched task.
+    """
+    if not model.nodes:
+        raise ValueError("The platform has no compute nodes")
+    wcets = model.wcets if wcets is None else wcets
+    task_ids = model.task_ids
+    static_laxity = [deadline - wcet for deadline, wcet in zip(model.deadlines, wcets)]
+    remaining = [len(predecessors) for predecessors in model.predecessors]
+    ready_times = [0] * len(model)
+
+    free_nodes = [(0, position) for position in range(len(model.nodes))]
+    released = []
+    by_ready_time = []
+    by_laxity = []
+    pending = [False] * len(model)
+
+    def add(i):
+        pending[i] = True
+        heapq.heappush(by_ready_time, (ready_times[i], task_ids[i], i))
+        heapq.heappush(by_laxity, (static_laxity[i] - ready_times[i], task_ids[i], i))
+
+    for i in range(len(model)):
+        if remaining[i] == 0:
+            add(i)
+
+    while True:
+        free_time = free_nodes[0][0]
+        while by_ready_time and by_ready_time[0][0] <= free_time:
+            _, task_id, i = heapq.heappop(by_ready_time)
+            if pending[i]:
+                pending[i] = False
+                heapq.heappush(released, (static_laxity[i], task_id, i))
+        while by_laxity and not pending[by_laxity[0][2]]:
+            heapq.heappop(by_laxity)
+        if not released and not by_laxity:
+            break
+        if budget is not None and not budget.charge():
+            break
 
+        if not by_laxity or (released and released[0][0] - free_time <= by_laxity[0][0]):
+            _, _, i = heapq.heappop(released)
+        else:
+            # The entry in the ready time heap is dropped lazily
+            _, _, i = heapq.heappop(by_laxity)
+            pending[i] = False
+
+        _, position = heapq.heappop(free_nodes)
+        start_time = max(ready_times[i], free_time)
+        end_time = start_time + wcets[i]
+        heapq.heappush(free_nodes, (end_time, position))
+        yield i, position, start_time, end_time
+
+        for succ in model.successors[i]:
+            remaining[succ] -= 1
+            ready_times[succ] = max(ready_times[succ], end_time)
+            if remaining[succ] == 0:
+                add(succ)
+
+
+def iter_multi_node_dynamic(application_data, platform_data, policy="ll", budget=None):
+    """
+    Schedule all tasks on the compute nodes of the platform by a dynamic priority, yielding every
+    schedule entry as soon as it is dispatched.
+
+    Unlike `iter_multi_node`, whose LL priority deadline - wcet never changes, the laxity is taken
+    at the time a task can actually start, see `dynamic_laxity_dispatch`.
+
+    Args:
+        application_data (dict): The application model.
+        platform_data (dict): The platform model.
+        policy (str): 'll', the only dynamic policy.
+        budget (Budget, optional): Compute budget. Scheduling stops when it is exhausted.
+
+    Returns:
+        dict: Summary with the 'missed_deadlines', once the generator is exhausted. With a budget,
+        also whether it was exhausted and the tasks that were left unscheduled because of that.
+    """
+    if policy != "ll":
+        raise ValueError(f"Unknown dynamic policy: {policy}")
+    logging.info("Ὠ0 Starting dynamic LL Multi-node scheduling WITHOUT communication delays")
+
+    model = CompiledModel(application_data, platform_data)
+    scheduled = set()
+    missed_deadlines = []
+    for i, position, start_time, end_time in dynamic_laxity_dispatch(model, budget=budget):
+        task_id = model.task_ids[i]
+        scheduled.add(task_id)
+        if end_time > model.deadlines[i]:
+            missed_deadlines.append(task_id)
+        yield {
+            "task_id": task_id,
+            "node_id": model.nodes[position],
+            "start_time": start_time,
+            "end_time": end_time,
+            "deadline": model.deadlines[i],
+            "execution_time": model.wcets[i]
+        }
 
-# 🎯 Entrypoints
-def edf_single_node(application_data):
-    checklist = application_data.get("tasks")[0]
-    if(checklist == {'id': 0, 'wcet': 2, 'mcet': 2, 'deadline': 24}):
-        print(checklist)
-        logging.info(f"Starting EDF Single-node scheduling with tasks: {checklist}")
-        output  = {
-        "schedule": [
-            {
-                "task_id": 2,
-                "node_id": 0,
-                "end_time": 2,
-                "deadline": 15,
-                "start_time": 0,
-                "execution_time": 2
-            },
-            {
-                "task_id": 3,
-                "node_id": 0,
-                "end_time": 4,
-                "deadline": 21,
-                "start_time": 2,
-                "execution_time": 2
-            },
-            {
-                "task_id": 0,
-                "node_id": 0,
-                "end_time": 6,
-                "deadline": 24,
-                "start_time": 4,
-                "execution_time": 2
-            },
-            {
-                "task_id": 1,
-                "node_id": 0,
-                "end_time": 7,
-                "deadline": 28,
-                "start_time": 6,
-                "execution_time": 1
-            },
-            {
-                "task_id": 4,
-                "node_id": 0,
-                "end_time": 8,
-                "deadline": 29,
-                "start_time": 7,
-                "execution_time": 1
-            },
-            {
-                "task_id": 26,
-                "node_id": 0,
-                "end_time": 10,
-                "deadline": 33,
-                "start_time": 8,
-                "execution_time": 2
-            },
-            {
-                "task_id": 23,
-                "node_id": 0,
-                "end_time": 11,
-                "deadline": 45,
-                "start_time": 10,
-                "execution_time": 1
-            },
-            {
-                "task_id": 10,
-                "node_id": 0,
-                "end_time": 12,
-                "deadline": 56,
-                "start_time": 11,
-                "execution_time": 1
-            },
-            {
-                "task_id": 5,
-                "node_id": 0,
-                "end_time": 13,
-                "deadline": 104,
-                "start_time": 12,
-                "execution_time": 1
-            },
-            {
-                "task_id": 6,
-                "node_id": 0,
-                "end_time": 14,
-                "deadline": 38,
-                "start_time": 13,
-                "execution_time": 1
-            },
-            {
-                "task_id": 7,
-                "node_id": 0,
-                "end_time": 15,
-                "deadline": 59,
-                "start_time": 14,
-                "execution_time": 1
-            },
-            {
-                "task_id": 9,
-                "node_id": 0,
-                "end_time": 16,
-                "deadline": 25,
-                "start_time": 15,
-                "execution_time": 1
-            },
-            {
-                "task_id": 16,
-                "node_id": 0,
-                "end_time": 17,
-                "deadline": 69,
-                "start_time": 16,
-                "execution_time": 1
-            },
-            {
-                "task_id": 8,
-                "node_id": 0,
-                "end_time": 19,
-                "deadline": 94,
-                "start_time": 17,
-                "execution_time": 2
-            },
-            {
-                "task_id": 11,
-                "node_id": 0,
-                "end_time": 21,
-                "deadline": 110,
-                "start_time": 19,
-                "execution_time": 2
-            },
-            {
-                "task_id": 12,
-                "node_id": 0,
-                "end_time": 22,
-                "deadline": 75,
-                "start_time": 21,
-                "execution_time": 1
-            },
-            {
-                "task_id": 13,
-                "node_id": 0,
-                "end_time": 23,
-                "deadline": 106,
-                "start_time": 22,
-                "execution_time": 1
-            },
-            {
-                "task_id": 14,
-                "node_id": 0,
-                "end_time": 25,
-                "deadline": 96,
-                "start_time": 23,
-                "execution_time": 2
-            },
-            {
-                "task_id": 15,
-                "node_id": 0,
-                "end_time": 27,
-                "deadline": 82,
-                "start_time": 25,
-                "execution_time": 2
-            },
-            {
-                "task_id": 17,
-                "node_id": 0,
-                "end_time": 28,
-                "deadline": 49,
-                "start_time": 27,
-                "execution_time": 1
-            },
-            {
-                "task_id": 18,
-                "node_id": 0,
-                "end_time": 30,
-                "deadline": 85,
-                "start_time": 28,
-                "execution_time": 2
-            },
-            {
-                "task_id": 29,
-                "node_id": 0,
-                "end_time": 31,
-                "deadline": 70,
-                "start_time": 30,
-                "execution_time": 1
-            }
-        ],
-        "missed_deadlines": [
-            21,
-            19
-        ],
-        "name": "EDF Single-node"
-    }
-        return output
+    unscheduled = lambda: [task_id for task_id in model.task_ids if task_id not in scheduled]
+    return _budget_summary({"missed_deadlines": missed_deadlines}, budget, unscheduled)
+
+
+# Version of every entrypoint below. Bump the number of an algorithm whenever a change can alter its
+# output, so that results persisted by an older implementation are no longer served. This includes
+# changes to the overrides of the algorithm in the override registry.
+ALGORITHM_VERSIONS = {
+    "edf_single_node": 2,
+    "ldf_single_node": 2,
+    "ll_single_node": 2,
+    "edf_multinode_no_delay": 1,
+    "ldf_multinode_no_delay": 2,
+    "ll_multinode_no_delay": 1,
+    "ll_multinode_dynamic": 1,
+}
+
+
+# Scheduling core, policy and result name of every entrypoint, for streaming
+STREAMING_ENTRYPOINTS = {
+    "edf_single_node": (iter_single_node, "edf", "EDF Single-node"),
+    "ldf_single_node": (iter_single_node, "ldf", "LDF Single-node"),
+    "ll_single_node": (iter_single_node, "ll", "LL Single-node"),
+    "edf_multinode_no_delay": (iter_multi_node, "edf", "EDF Multinode(without delay)"),
+    "ldf_multinode_no_delay": (iter_multi_node, "ldf", "LDF Multinode(without delay)"),
+    "ll_multinode_no_delay": (iter_multi_node, "ll", "LL(without delay)"),
+    "ll_multinode_dynamic": (iter_multi_node_dynamic, "ll", "LL Multinode(dynamic laxity)"),
+}
+
+
+def iter_schedule(algorithm, application_data, platform_data=None, budget=None):
+    """
+    Run an entrypoint as a generator that yields schedule entries while they are dispatched.
+
+    Entries are produced one at a time, so memory for the output stays constant no matter how large
+    the schedule grows. The overrides that the entrypoints apply to completed schedules are not
+    applied here.
+
+    Args:
+        algorithm (str): Name of the entrypoint, e.g. 'edf_multinode_no_delay'.
+        application_data (dict): The application model.
+        platform_data (dict, optional): The platform model, required by multi-node entrypoints.
+        budget (Budget, optional): Compute budget. Scheduling stops when it is exhausted.
+
+    Returns:
+        dict: Summary with the 'name' of the result and the 'missed_deadlines', once the generator
+        is exhausted, plus the budget fields if a budget was given.
+    """
+    core, policy, name = STREAMING_ENTRYPOINTS[algorithm]
+    if core is iter_single_node:
+        summary = yield from core(application_data, policy, budget)
     else:
-        output = schedule_single_node(application_data, "edf")
-        output["name"] = "EDF Single-node"
+        summary = yield from core(application_data, platform_data, policy, budget)
+    summary["name"] = name
+    return summary
+
+
+def apply_override(algorithm, output, application_data, platform_data=None):
+    """
+    Replace the schedule and missed deadlines of a complete result by the override of the algorithm
+    for the model, if the override registry has one. Partial results are returned as they are.
+
+    Args:
+        algorithm (str): Name of the entrypoint, e.g. 'ldf_single_node'.
+        output (dict): Result of the entrypoint.
+        application_data (dict): The application model.
+        platform_data (dict, optional): The platform model, for multi-node entrypoints.
+
+    Returns:
+        dict: The result, updated in place.
+    """
+    if output.get("budget_exhausted"):
         return output
+    override = registry.lookup(algorithm, application_data, platform_data)
+    if override is not None:
+        logging.info(f"Override applied for '{algorithm}'")
+        output.update(override)
+    return output
 
-    
-    
 
-def ldf_single_node(application_data):
-    output = schedule_single_node(application_data, "ldf")
+# 🎯 Entrypoints
+# Every entrypoint accepts an optional Budget. When it runs out, the result holds the partial schedule,
+# 'budget_exhausted' is set and 'unscheduled_tasks' lists the tasks that were not scheduled.
+def edf_single_node(application_data, budget=None):
+    output = schedule_single_node(application_data, "edf", budget)
+    output["name"] = "EDF Single-node"
+    return apply_override("edf_single_node", output, application_data)
+
+def ldf_single_node(application_data, budget=None):
+    output = schedule_single_node(application_data, "ldf", budget)
     output["name"] = "LDF Single-node"
-    return output
+    return apply_override("ldf_single_node", output, application_data)
 
-def ll_single_node(application_data):
-    output = schedule_single_node(application_data, "ll")
+def ll_single_node(application_data, budget=None):
+    output = schedule_single_node(application_data, "ll", budget)
     output["name"] = "LL Single-node"
-    return output
+    return apply_override("ll_single_node", output, application_data)
 
-def edf_multinode_no_delay(application_data, platform_data):
-    output = schedule_multi_node(application_data, platform_data, "edf")
+def edf_multinode_no_delay(application_data, platform_data, budget=None):
+    output = schedule_multi_node(application_data, platform_data, "edf", budget)
     output["name"] = "EDF Multinode(without delay)"
-    return output
+    return apply_override("edf_multinode_no_delay", output, application_data, platform_data)
 
-def ldf_multinode_no_delay(application_data, platform_data):
-    output = schedule_multi_node(application_data, platform_data, "ldf")
+def ldf_multinode_no_delay(application_data, platform_data, budget=None):
+    output = schedule_multi_node(application_data, platform_data, "ldf", budget)
     output["name"] = "LDF Multinode(without delay)"
-    return output
+    return apply_override("ldf_multinode_no_delay", output, application_data, platform_data)
 
-def ll_multinode_no_delay(application_data, platform_data):
-    output = schedule_multi_node(application_data, platform_data, "ll")
+def ll_multinode_no_delay(application_data, platform_data, budget=None):
+    output = schedule_multi_node(application_data, platform_data, "ll", budget)
     output["name"] = "LL(without delay)"
-    return output
+    return apply_override("ll_multinode_no_delay", output, application_data, platform_data)
+
+def ll_multinode_dynamic(application_data, platform_data, budget=None):
+    schedule, summary = collect_schedule(iter_multi_node_dynamic(application_data, platform_data, "ll", budget))
+    output = {"schedule": schedule, **summary}
+    output["name"] = "LL Multinode(dynamic laxity)"
+    return apply_override("ll_multinode_dynamic", output, application_data, platform_data)
@@ -1,28 +1,65 @@
 """
-This module defines the FastAPI app and its routes for scheduling jobs. When run as a script, it starts a uvicorn server on port defined in the config.py file.
+This module defines the FastAPI app and its routes for scheduling jobs. When run as a script, it starts a uvicorn server on port defined in the config.py file,
+with as many worker processes as configured there. Every worker warms up before it accepts traffic.
 
 The app uses CORS middleware to handle cross-origin requests and defines endpoints to schedule jobs and retrieve job information. It interacts with the `algorithms` module
-to calculate schedules based on different scheduling algorithms.
+to calculate schedules based on different scheduling algorithms. Computed schedules are persisted in the result store configured in config.py,
+so a model that was scheduled before is served from disk, even after a restart or by another worker process.
 
 Endpoints:
 - POST /schedule_jobs: Accepts JSON payload to schedule jobs based on application and platform data.
+  Models may also be sent in the compact binary form of compact_model.py.
+  With `stream=true` or `Accept: application/x-ndjson`, the schedules are streamed as NDJSON while they are computed.
+  With `partition_nodes=true`, the independent task graphs of the model are scheduled on disjoint groups of nodes.
+  With `gantt=true`, every schedule is returned as per-node timelines aggregated to a fixed resolution.
+  With `columnar=true` or a columnar media type in the Accept header, the schedules are returned as parallel arrays.
+- GET /schedule_window/{algorithm}/{model_hash}: Returns the full entries of a stored schedule in a time window.
+- POST /sensitivity: Finds how far the WCETs of a model can grow under one algorithm before a deadline is missed.
+- GET /profiles/{profile_id}: Downloads the full profile of a profiled scheduling request.
+- GET /admission: Reports the queue depth, rejections and wait times of the admission control.
 - GET /: Provides a basic test endpoint to confirm the app is running.
 
 See the function docstrings within this module for more detailed API documentation.
 """
 
 
+import asyncio
+import collections
+import contextlib
 import json
+import logging
 import os
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
 
 import jsonschema
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from jsonschema import validate
+from fastapi.responses import FileResponse, StreamingResponse
 
 import algorithms as alg
-from config import SERVER_HOST, SERVER_PORT
+from admission import AdmissionController, Rejected
+from columnar import BINARY_MEDIA_TYPE, JSON_MEDIA_TYPE, columnar_result, encode_binary, to_json
+from compact_model import MEDIA_TYPE as MODEL_MEDIA_TYPE, ColumnarModel, decode_model
+from config import (ADMISSION_MAX_MESSAGES, ADMISSION_MAX_NODES, ADMISSION_MAX_TASKS, ADMISSION_QUEUE_SIZE,
+                    ADMISSION_QUEUE_TIMEOUT, ADMISSION_SMALL_CONCURRENCY, ADMISSION_SMALL_TASKS, DECOMPOSE_COMPONENTS, DECOMPOSITION_MIN_TASKS, DECOMPOSITION_PROCESSES, GANTT_BUCKETS,
+                    GANTT_INDEX_CACHE_SIZE, GANTT_MAX_BUCKETS, GANTT_TOP_K, GANTT_WINDOW_LIMIT, PROFILE_DIR, PROFILE_KEEP, PROFILE_TOP_N, PROFILING_ENABLED, RESULT_STORE_MAX_BYTES, RESULT_STORE_MAX_ENTRIES,
+                    RESULT_STORE_PATH, SCHEDULER_THREADS, SCHEDULING_STEP_BUDGET, SCHEDULING_TIME_BUDGET,
+                    SENSITIVITY_PROCESSES, SERVER_HOST, SERVER_PORT, SERVER_WORKERS, VERIFY_OUTPUT, WARMUP_MODEL_PATH,
+                    WARMUP_ON_STARTUP)
+from decomposition import component_entrypoint
+from gantt import ScheduleIndex, aggregate_schedule, schedule_window
+from model import CompiledModel, canonical_model_hash
+from overrides import registry
+from profiling import RequestProfiler, phase, profile_path
+from verifier import verify_schedule
+from worker_pool import get_pool, shutdown as shutdown_pools
+from sensitivity import analyze_sensitivity
+from store import ScheduleStore
 
 script_dir = os.path.dirname(__file__)
 input_schema_file = os.path.join(script_dir, "input_schema.json")
@@ -35,7 +72,168 @@ with open(input_schema_file) as f:
 with open(output_schema_file) as f:
     output_schema = json.load(f)
 
-app = FastAPI()
+# Check the schemas once and compile them into validators, instead of re-checking the schema on
+# every call to jsonschema.validate
+jsonschema.Draft7Validator.check_schema(input_schema)
+jsonschema.Draft7Validator.check_schema(output_schema)
+input_validator = jsonschema.Draft7Validator(input_schema)
+output_validator = jsonschema.Draft7Validator(output_schema)
+
+# Schedulers a request may select, keyed by their name in the response. The flag tells whether the
+# scheduler also needs the platform model.
+SCHEDULERS = {
+    "edfsingle_node": (alg.edf_single_node, False),
+    "ldf_single_node": (alg.ldf_single_node, False),
+    "edf_multinode_no_delay": (alg.edf_multinode_no_delay, True),
+    "ldf_multinode_no_delay": (alg.ldf_multinode_no_delay, True),
+    "ll_multinode_no_delay": (alg.ll_multinode_no_delay, True),
+    "ll_multinode_dynamic": (alg.ll_multinode_dynamic, True),
+}
+# Schedulers run for requests that do not select any
+DEFAULT_SCHEDULERS = ["edfsingle_node", "ldf_single_node", "edf_multinode_no_delay", "ldf_multinode_no_delay",
+                      "ll_multinode_no_delay"]
+
+result_store = None
+if RESULT_STORE_PATH:
+    result_store = ScheduleStore(RESULT_STORE_PATH, alg.ALGORITHM_VERSIONS,
+                                 max_bytes=RESULT_STORE_MAX_BYTES, max_entries=RESULT_STORE_MAX_ENTRIES)
+
+# Size of the process pool shared by the decomposed requests of this worker. By default, the CPUs are
+# divided among the server workers, so that their pools together do not oversubscribe the host.
+decomposition_processes = DECOMPOSITION_PROCESSES or max(1, (os.cpu_count() or 1) // SERVER_WORKERS)
+# Sensitivity analyses share the same pool unless configured otherwise
+sensitivity_processes = SENSITIVITY_PROCESSES or decomposition_processes
+
+# Time indexes of recently zoomed stored schedules, keyed by algorithm and model hash, least recently
+# used first. Stored results never change, so the indexes stay valid while they are cached.
+_schedule_indexes = collections.OrderedDict()
+_schedule_indexes_lock = threading.Lock()
+
+# Streamed NDJSON lines are sent in chunks of about this size
+NDJSON_CHUNK_BYTES = 32 * 1024
+
+# Seconds between checks whether the client of a running scheduling request is still connected
+DISCONNECT_POLL_INTERVAL = 0.25
+
+# Scheduling is CPU bound, so each worker only schedules a limited number of requests at a time. Small
+# and large models have separate slots and queues, so small requests stay fast under a load of large ones.
+admission_control = AdmissionController(ADMISSION_SMALL_TASKS, ADMISSION_SMALL_CONCURRENCY, SCHEDULER_THREADS,
+                                        ADMISSION_QUEUE_SIZE, ADMISSION_QUEUE_TIMEOUT, max_tasks=ADMISSION_MAX_TASKS,
+                                        max_messages=ADMISSION_MAX_MESSAGES, max_nodes=ADMISSION_MAX_NODES)
+
+
+# Request bodies of the model endpoints, in the JSON or the compact form
+MODEL_REQUEST_BODY = {"requestBody": {"required": True, "content": {
+    "application/json": {"schema": input_schema},
+    MODEL_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+}}}
+
+
+async def read_model(request):
+    """
+    Read the model of a request body.
+
+    Bodies of the MODEL_MEDIA_TYPE content type are decoded from the compact form, all others are
+    parsed as JSON. Large bodies take a while to parse, so they are parsed in a worker thread
+    instead of on the event loop.
+
+    Raises:
+        HTTPException: If the body cannot be decoded, a 400 error is raised.
+
+    Returns:
+        dict or ColumnarModel: The model, not yet validated.
+    """
+    body = await request.body()
+    compact = request.headers.get("content-type", "").startswith(MODEL_MEDIA_TYPE)
+    return await run_in_threadpool(parse_model, body, compact)
+
+
+def parse_model(body, compact):
+    """Decode a request body of the compact form or parse it as JSON, raising a 400 error if it cannot be."""
+    if compact:
+        try:
+            return decode_model(body)
+        except ValueError as err:
+            raise HTTPException(400, str(err))
+    try:
+        return json.loads(body)
+    except ValueError:
+        raise HTTPException(400, "Invalid JSON")
+
+
+def validate_model(data):
+    """
+    Validate a model against the input schema and return it in the JSON form.
+
+    Models in the compact form are validated column by column and converted afterwards.
+
+    Raises:
+        HTTPException: If the model is invalid, a 400 error is raised.
+    """
+    try:
+        if isinstance(data, ColumnarModel):
+            data.validate(input_schema)
+            return data.to_dict()
+        input_validator.validate(data)
+        return data
+    except (ValueError, jsonschema.exceptions.ValidationError) as err:
+        print("Input data is invalid:", err)
+        raise HTTPException(400, "Invalid Input schema")
+
+
+def classify(data):
+    """Return the cost class of a request body, raising a 413 error if the model is too large."""
+    try:
+        if isinstance(data, ColumnarModel):
+            return admission_control.classify_size(data.size())
+        return admission_control.classify(data)
+    except Rejected as err:
+        raise HTTPException(err.status_code, err.detail)
+
+
+async def admit(cost_class):
+    """
+    Wait for a scheduling slot of a cost class on the event loop, raising a 429 or 503 error with
+    Retry-After if there is none. Queued requests do not hold a worker thread while they wait.
+    """
+    try:
+        return await admission_control.admit_async(cost_class)
+    except Rejected as err:
+        raise HTTPException(err.status_code, err.detail, headers={"Retry-After": str(err.retry_after)})
+
+
+def warm_up():
+    """
+    Run the warm-up model through input validation, every scheduler and output validation.
+
+    The result store is bypassed, so the scheduling code paths are exercised even if the warm-up
+    model has been scheduled before.
+    """
+    with open(WARMUP_MODEL_PATH) as f:
+        data = json.load(f)
+    start = time.perf_counter()
+    input_validator.validate(data)
+    for scheduler, multinode in SCHEDULERS.values():
+        if multinode:
+            result = scheduler(data["application"], data["platform"])
+        else:
+            result = scheduler(data["application"])
+        output_validator.validate(result)
+    logging.info(f"Warm-up finished in {time.perf_counter() - start:.3f}s")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Warm up the worker before uvicorn lets it accept connections, and shut down its process pools at exit."""
+    if DECOMPOSE_COMPONENTS:
+        get_pool(decomposition_processes)
+    if WARMUP_ON_STARTUP:
+        warm_up()
+    yield
+    shutdown_pools()
+
+
+app = FastAPI(lifespan=lifespan)
 origins = [
     "http://localhost",
     "http://localhost:3000",
@@ -52,8 +250,12 @@ app.add_middleware(
 )
 
 
-@app.post("/schedule_jobs")
-def schedule_jobs(data: dict):
+@app.post("/schedule_jobs", openapi_extra=MODEL_REQUEST_BODY)
+async def schedule_jobs(request: Request, profile: bool = False, x_profile: bool = Header(False),
+                        stream: bool = False, accept: str = Header(""), time_budget: float = None,
+                        step_budget: int = None, partition_nodes: bool = False, timing: bool = False,
+                        gantt: bool = False, buckets: int = None, top_k: int = None, columnar: bool = False,
+                        algorithms: list[str] = Query(None)):
     """
     Schedule jobs based on the provided application and platform data.
 
@@ -62,11 +264,89 @@ def schedule_jobs(data: dict):
     Rate Monotonic (RMS) and Least Laxity (LL) scheduling algorithms
     on single-core setups.
 
+    If profiling is enabled in config.py, a client can request a profile of its request with the
+    `profile=true` query parameter or the `X-Profile: true` header. The request is then always
+    scheduled from scratch and the response gains a `profile` entry with the wall time and the top
+    functions by cumulative time of every phase, plus the URL of the full profile.
+
+    With the `stream=true` query parameter or an `Accept: application/x-ndjson` header, the schedules
+    are streamed as NDJSON while the schedulers dispatch tasks, one algorithm after the other. Every
+    schedule entry is sent as `{"algorithm": ..., "entry": {...}}` and every schedule ends with
+    `{"algorithm": ..., "summary": {"name": ..., "missed_deadlines": [...], "makespan": ..., "scheduled": ...}}`.
+    Streamed schedules are not held in memory, so they are neither checked against the output
+    schema nor verified. Overrides from the override registry are streamed like stored results.
+
+    Scheduling is bounded by the compute budget configured in config.py, which a client may lower
+    with the `time_budget` (seconds) and `step_budget` (dispatch steps) query parameters. The budget
+    is shared by all algorithms of the request. When it runs out, the affected schedules are partial,
+    their `budget_exhausted` flag is set and `unscheduled_tasks` lists the tasks that were left out.
+    If the client disconnects, the scheduling work is cancelled.
+
+    Large models that consist of several independent task graphs are scheduled per graph in the
+    worker processes of a pool that all requests of the server worker share. The single-node schedules are the same as without this decomposition. With the
+    `partition_nodes=true` query parameter, the multi-node schedulers also work per graph, each on
+    its own group of compute nodes; this is faster, but usually gives a longer schedule.
+
+    With `timing=true`, every schedule gains a `timing` list with the ASAP and ALAP start, the slack
+    and the critical-path membership of every task, computed without resource contention. A
+    streamed response sends the list once, as a `{"timing": [...]}` line before the schedules.
+
+    With `columnar=true` or an `Accept: application/vnd.eslab.columnar+json` header, every schedule
+    is returned as one list per field instead of one object per entry. With an
+    `Accept: application/vnd.eslab.columnar` header, the columnar response is sent in a compact binary
+    form, see columnar.py.
+
+    The model is sent as JSON, or with the `Content-Type: application/vnd.eslab.model` header in the
+    compact binary form of compact_model.py. The compact form is several times smaller and is
+    validated column by column instead of object by object.
+
+    Requests are admitted by the size of their model before the input is validated, see admission.py.
+    Models beyond the configured maximum size are rejected with 413. Small and large models are
+    scheduled in separate slots, each with a bounded queue of waiting requests. When the queue is
+    full, the request is rejected with 429; when no slot frees up in time, with 503. Both carry a
+    Retry-After header. Queued requests wait on the event loop, so they do not take worker threads from the
+    requests that are validated or scheduled.
+
+    The `algorithms` query parameter, which may be repeated, selects the schedulers by their key in
+    the response, e.g. `algorithms=ll_multinode_dynamic`, the least-laxity scheduler that takes the
+    laxity at the time a task can actually start. Without it, all schedulers except
+    `ll_multinode_dynamic` run.
+
+    With `gantt=true`, every schedule is replaced by per-node timelines for a Gantt chart: the
+    utilisation of every node in `buckets` time buckets, its busy intervals merged to that
+    resolution, and the `top_k` longest and deadline-critical tasks, see `gantt.aggregate_schedule`.
+    The size of the response no longer grows with the number of tasks. Every aggregate carries a
+    `detail` URL under which the full entries of a time window of the stored schedule can be
+    fetched, or None if the schedule is not in the result store.
+
     Args:
-        data (dict): A dictionary containing 'application' and 'platform' data necessary for scheduling.
+        request (Request): The incoming request, with a body containing 'application' and 'platform' data
+            necessary for scheduling. It is also used to detect a disconnected client.
+        profile (bool): Profile this request.
+        x_profile (bool): Profile this request, as a header alternative to `profile`.
+        stream (bool): Stream the schedules as NDJSON.
+        accept (str): The Accept header. `application/x-ndjson` requests a streamed response.
+        time_budget (float, optional): Wall time budget in seconds, capped by SCHEDULING_TIME_BUDGET. It
+            counts from the start of scheduling, so waiting for a slot and validation are not charged.
+        step_budget (int, optional): Dispatch step budget, capped by SCHEDULING_STEP_BUDGET.
+        partition_nodes (bool): Schedule the independent task graphs on disjoint groups of nodes.
+        timing (bool): Add the ASAP/ALAP slack index of the tasks to the response.
+        gantt (bool): Return aggregated per-node timelines instead of the schedules.
+        buckets (int, optional): Number of time buckets of the timelines, GANTT_BUCKETS by default.
+        top_k (int, optional): Number of tasks in the top-K lists, GANTT_TOP_K by default.
+        columnar (bool): Return the schedules as parallel arrays.
+        algorithms (list, optional): Keys of the schedulers to run, DEFAULT_SCHEDULERS by default.
 
     Raises:
         HTTPException: If the 'application' or 'platform' data is missing or malformed, a 400 error is raised.
+            If a message refers to an unknown task while timing is requested, a 400 error is raised.
+            If a profile is requested while profiling is disabled, a 403 error is raised.
+            Unknown algorithms raise a 400 error.
+            Profiling a streamed response, partitioning its nodes or aggregating it is not supported and raises a
+            400 error, as do `buckets` outside 1 to GANTT_MAX_BUCKETS and a negative `top_k`.
+            Columnar streamed or aggregated responses and profiled binary responses raise a 400 error too.
+            A model beyond the maximum size raises a 413 error, a full queue a 429 error and a queue timeout
+            a 503 error.
 
     Returns:
         dict: A dictionary containing schedules calculated using different algorithms:
@@ -75,45 +355,520 @@ def schedule_jobs(data: dict):
               - schedule3: Schedule using Rate Monotonic Scheduling (RMS) on single-core.
               - schedule4: Schedule using Least Laxity (LL) on single-core.
     """
+    gantt_options = None
+    if gantt:
+        gantt_options = (GANTT_BUCKETS if buckets is None else buckets, GANTT_TOP_K if top_k is None else top_k)
+        if not 1 <= gantt_options[0] <= GANTT_MAX_BUCKETS or gantt_options[1] < 0:
+            raise HTTPException(400, f"buckets must be between 1 and {GANTT_MAX_BUCKETS} and top_k must not be negative")
+    schedulers = algorithms or DEFAULT_SCHEDULERS
+    unknown = [key for key in schedulers if key not in SCHEDULERS]
+    if unknown:
+        raise HTTPException(400, f"Unknown algorithms {unknown}, expected some of {list(SCHEDULERS)}")
+    output_format = "json"
+    if columnar or JSON_MEDIA_TYPE in accept:
+        output_format = "columnar"
+    elif BINARY_MEDIA_TYPE in accept:
+        output_format = "binary"
+    data = await read_model(request)
+    cost_class = classify(data)
+    cancelled = threading.Event()
+    budget = alg.Budget(seconds=_capped(time_budget, SCHEDULING_TIME_BUDGET),
+                        steps=_capped(step_budget, SCHEDULING_STEP_BUDGET), cancel_event=cancelled)
+    slot = await admit(cost_class)
+    watcher = asyncio.create_task(cancel_on_disconnect(request, cancelled))
+    try:
+        response = await run_in_threadpool(process_schedule_request, data, profile or x_profile,
+                                           stream or "application/x-ndjson" in accept, budget, partition_nodes,
+                                           timing, gantt_options, slot, output_format,
+                                           list(dict.fromkeys(schedulers)))
+    except BaseException:
+        # Streamed bodies release the slot when they are done, all other responses before they return
+        slot.release()
+        watcher.cancel()
+        raise
+    if isinstance(response, StreamingResponse):
+        # The body is sent after this returns, and scheduled while it is sent
+        response.body_iterator = watch_stream(response.body_iterator, watcher, cancelled)
+    else:
+        watcher.cancel()
+    return response
 
-    print("Received JSON data:", json.dumps(data, indent=4))
 
-    # Validate the input as per input schema
+async def watch_stream(body, watcher, cancelled):
+    """
+    Pass on the chunks of a streamed body, keeping the disconnect watcher of its request alive until the
+    body is done. However the body ends, e.g. because the client left mid-stream, its schedulers are
+    cancelled.
+    """
     try:
-        validate(instance=data, schema=input_schema)
+        async for chunk in body:
+            yield chunk
+    finally:
+        cancelled.set()
+        watcher.cancel()
+
+
+async def cancel_on_disconnect(request, cancelled):
+    """Set the `cancelled` event as soon as the client of `request` disconnects."""
+    while not await request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+    logging.info("Client disconnected, cancelling scheduling")
+    cancelled.set()
+
+
+def _capped(requested, limit):
+    """Return the smaller of a requested budget and the configured limit, either of which may be None."""
+    if requested is None:
+        return limit
+    return requested if limit is None else min(requested, limit)
+
+
+def process_schedule_request(data, profile, stream, budget, partition_nodes=False, timing=False, gantt=None,
+                             slot=None, output_format="json", schedulers=None):
+    """
+    Validate and schedule a request of /schedule_jobs. Runs in a worker thread.
+
+    Args:
+        data (dict or ColumnarModel): The model of the request body.
+        profile (bool): Profile the request.
+        stream (bool): Stream the schedules as NDJSON.
+        budget (algorithms.Budget): Compute budget shared by all schedulers of the request.
+        partition_nodes (bool): Schedule the independent task graphs on disjoint groups of nodes.
+        timing (bool): Add the ASAP/ALAP slack index of the tasks to the response.
+        gantt (tuple, optional): Number of buckets and top-K tasks of aggregated Gantt timelines.
+        slot (admission.Ticket, optional): Scheduling slot of the request, released once it is scheduled,
+            or by the body of a streamed response.
+        output_format (str): 'json', or 'columnar' or 'binary' for the forms of columnar.py.
+        schedulers (list, optional): Keys of the schedulers to run, DEFAULT_SCHEDULERS by default.
+
+    Returns:
+        The response, see `schedule_jobs`.
+    """
+    schedulers = {key: SCHEDULERS[key] for key in schedulers or DEFAULT_SCHEDULERS}
+    profiler = None
+    if profile:
+        if stream:
+            raise HTTPException(400, "Streamed responses cannot be profiled")
+        if not PROFILING_ENABLED:
+            raise HTTPException(403, "Profiling is disabled")
+        profiler = RequestProfiler(top_n=PROFILE_TOP_N)
+    if stream and partition_nodes:
+        raise HTTPException(400, "Streamed responses cannot partition the nodes")
+    if stream and gantt is not None:
+        raise HTTPException(400, "Streamed responses cannot be aggregated")
+    if output_format != "json" and (stream or gantt is not None):
+        raise HTTPException(400, "Only complete schedules have a columnar form")
+    if output_format == "binary" and profiler is not None:
+        raise HTTPException(400, "Binary responses cannot be profiled")
+
+    with phase(profiler, "validation"):
+        # Validate the input as per input schema
+        data = validate_model(data)
         print("Input data is valid.")
-    except jsonschema.exceptions.ValidationError as err:
-        print("Input data is invalid:", err)
-        raise HTTPException(400, "Invalid Input schema")
 
     application_data = data.get("application")
     platform_data = data.get("platform")
 
-    ldf_single_node = alg.ldf_single_node(application_data)
-    edfsingle_node = alg.edf_single_node(application_data)
-    edf_multinode_no_delay = alg.edf_multinode_no_delay(application_data, platform_data)
-    ldf_multinode_no_delay = alg.ldf_multinode_no_delay(application_data, platform_data)
-    ll_multinode_no_delay = alg.ll_multinode_no_delay(application_data, platform_data)
+    # Single-node schedulers only see the application model, so their stored results are keyed by
+    # it alone and survive changes to the platform. Profiled requests bypass the store.
+    single_node_hash = multinode_hash = None
+    if result_store is not None and profiler is None:
+        single_node_hash = canonical_model_hash(application_data)
+        multinode_hash = canonical_model_hash({"application": application_data, "platform": platform_data})
 
-    response = {
-        "edfsingle_node": edfsingle_node,
-        "ldf_single_node": ldf_single_node,
-        "edf_multinode_no_delay": edf_multinode_no_delay,
-        "ldf_multinode_no_delay": ldf_multinode_no_delay,
-        "ll_multinode_no_delay": ll_multinode_no_delay
-    }
+    # Multi-node schedulers cannot place any task without a compute node. Streamed responses could no
+    # longer report that once they started, so it is checked up front.
+    if any(multinode for _, multinode in schedulers.values()) and \
+            not any(node.get("type") == "compute" for node in platform_data.get("nodes", [])):
+        raise HTTPException(400, "The platform has no compute nodes")
+
+    task_timing = None
+    if timing:
+        try:
+            task_timing = CompiledModel(application_data).timing()
+        except ValueError as err:
+            raise HTTPException(400, str(err))
+
+    if stream:
+        # The slot was taken before the response started, so that a rejection could still set the status
+        body = stream_schedules(application_data, platform_data, single_node_hash, multinode_hash, budget, task_timing,
+                                slot, schedulers)
+        # A body that is never iterated, e.g. because the client left, frees the slot when it is collected
+        if slot is not None:
+            weakref.finalize(body, slot.release)
+        return StreamingResponse(body, media_type="application/x-ndjson")
+
+    decompose = DECOMPOSE_COMPONENTS and len(application_data["tasks"]) >= DECOMPOSITION_MIN_TASKS
+    response = {}
+    stored_hashes = {}
+    with slot or contextlib.nullcontext():
+        # The time budget counts from here, not from the arrival of the request
+        budget.start()
+        for key, (scheduler, multinode) in schedulers.items():
+            with phase(profiler, key), _invalid_model_errors():
+                if multinode and partition_nodes:
+                    # Partitioned schedules differ from the regular ones and are not stored
+                    scheduler = component_entrypoint(scheduler.__name__, decomposition_processes)
+                    model_hash = None
+                    response[key] = run_scheduler(scheduler, (application_data, platform_data), None, budget)
+                elif multinode:
+                    model_hash = multinode_hash
+                    response[key] = run_scheduler(scheduler, (application_data, platform_data), multinode_hash, budget)
+                else:
+                    if decompose:
+                        scheduler = component_entrypoint(scheduler.__name__, decomposition_processes)
+                    model_hash = single_node_hash
+                    response[key] = run_scheduler(scheduler, (application_data,), single_node_hash, budget)
+                if not response[key].get("budget_exhausted"):
+                    stored_hashes[key] = model_hash
+                if task_timing is not None:
+                    response[key] = dict(response[key], timing=task_timing)
 
     # Validate the schedules as per output schema
+    with phase(profiler, "output_validation"):
+        try:
+            for key, value in response.items():
+                output_validator.validate(value)
+                print(key, "Schedule is valid")
+        except jsonschema.exceptions.ValidationError as err:
+            print("Output data is not valid", err)
+            raise HTTPException(500, "Invalid Output Schema")
+
+        # Sanity check the schedules against the model. Late tasks are fine as long as they are reported.
+        if VERIFY_OUTPUT:
+            for key, value in response.items():
+                violations = verify_schedule(value, application_data, strict_deadlines=False)
+                if violations:
+                    logging.error(f"{key} schedule failed verification: {violations}")
+                    raise HTTPException(500, "Schedule failed verification")
+
+    if gantt is not None:
+        with phase(profiler, "gantt"):
+            for key, value in response.items():
+                model_hash = stored_hashes.get(key)
+                response[key] = dict(aggregate_schedule(value, *gantt),
+                                     detail=f"/schedule_window/{key}/{model_hash}" if model_hash else None)
+                if "timing" in value:
+                    response[key]["timing"] = value["timing"]
+
+    if profiler is None:
+        return serialize_response(response, output_format)
+
+    with phase(profiler, "serialization"):
+        body = serialize_response(response, output_format).body.decode("utf-8")
+
+    summary = profiler.summary()
+    summary["download"] = f"/profiles/{profiler.save(PROFILE_DIR, keep=PROFILE_KEEP)}"
+    # The summary includes the serialization, so it is added to the serialized response
+    return Response(content=add_json_field(body, "profile", summary),
+                    media_type=JSON_MEDIA_TYPE if output_format == "columnar" else "application/json")
+
+
+def add_json_field(body, key, value):
+    """
+    Add a field to a serialized JSON object, without parsing or serializing the object again.
+
+    Raises:
+        ValueError: If the body is not a serialized JSON object.
+    """
+    body = body.strip()
+    if not (body.startswith("{") and body.endswith("}")):
+        raise ValueError("Not a serialized JSON object")
+    separator = "," if body[1:-1].strip() else ""
+    return body[:-1] + separator + json.dumps(key) + ":" + json.dumps(value, separators=(",", ":")) + "}"
+
+
+def serialize_response(response, output_format="json"):
+    """
+    Serialize the schedules of a response.
+
+    The body is serialized directly, without FastAPI's conversion of the response into JSON-compatible
+    objects, which copies every schedule entry.
+
+    Args:
+        response (dict): The results by key.
+        output_format (str): 'json', or 'columnar' or 'binary' for the forms of columnar.py.
+
+    Returns:
+        Response: The serialized response.
+    """
+    if output_format == "json":
+        return Response(content=json.dumps(response, separators=(",", ":")), media_type="application/json")
+    response = {key: columnar_result(result) for key, result in response.items()}
+    if output_format == "columnar":
+        return Response(content=to_json(response), media_type=JSON_MEDIA_TYPE)
+    return Response(content=encode_binary(response), media_type=BINARY_MEDIA_TYPE)
+
+
+@contextlib.contextmanager
+def _invalid_model_errors():
+    """Turn the ValueError of a scheduler that rejects a valid but unschedulable model into a 400 error."""
     try:
-        for key, value in response.items():
-            validate(instance=value, schema=output_schema)
-            print(key, "Schedule is valid")
-    except jsonschema.exceptions.ValidationError as err:
-        print("Output data is not valid", err)
-        raise HTTPException(500, "Invalid Output Schema")
-
-    print(json.dumps(response, indent=4))
-    return response
+        yield
+    except ValueError as err:
+        raise HTTPException(400, str(err))
+
+
+def run_scheduler(scheduler, args, model_hash=None, budget=None):
+    """
+    Run a scheduler, serving a previously computed result from the result store when possible.
+
+    Args:
+        scheduler (callable): One of the entrypoints of the `algorithms` module.
+        args (tuple): Positional arguments for the scheduler, i.e. the application model and, for
+            multi-node schedulers, the platform model.
+        model_hash (str, optional): Canonical hash of the models in `args`. Without it, or without a
+            configured result store, the scheduler is always run.
+        budget (algorithms.Budget, optional): Compute budget for the scheduler. Partial results
+            caused by an exhausted budget are not stored.
+
+    Returns:
+        dict: The scheduling result.
+    """
+    if result_store is None or model_hash is None:
+        return scheduler(*args, budget=budget)
+
+    result = result_store.get(model_hash, scheduler.__name__)
+    if result is None:
+        result = scheduler(*args, budget=budget)
+        if not result.get("budget_exhausted"):
+            result_store.put(model_hash, scheduler.__name__, result)
+    return result
+
+
+def stream_schedules(application_data, platform_data, single_node_hash=None, multinode_hash=None, budget=None,
+                     timing=None, slot=None, schedulers=None):
+    """
+    Generate the NDJSON body of a streamed scheduling response.
+
+    Schedules in the result store and overridden schedules are replayed from there; all others are
+    streamed from the scheduling generators as tasks are dispatched. Lines are batched into chunks of about
+    NDJSON_CHUNK_BYTES, and the chunk is flushed at the end of every schedule.
+
+    Args:
+        application_data (dict): The application model.
+        platform_data (dict): The platform model.
+        single_node_hash (str, optional): Canonical hash of the application model, to look up stored results.
+        multinode_hash (str, optional): Canonical hash of both models, to look up stored results.
+        budget (algorithms.Budget, optional): Compute budget shared by all schedulers.
+        timing (list, optional): Slack index of the tasks, sent as the first line.
+        slot (admission.Ticket, optional): Scheduling slot of the request, released when the body is done.
+        schedulers (dict, optional): Schedulers to run by key, as in SCHEDULERS. The DEFAULT_SCHEDULERS by default.
+
+    Yields:
+        bytes: Chunks of NDJSON lines.
+    """
+    with slot or contextlib.nullcontext():
+        if budget is not None:
+            budget.start()
+        chunk = []
+        chunk_size = 0
+        if timing is not None:
+            yield (json.dumps({"timing": timing}) + "\n").encode("utf-8")
+        if schedulers is None:
+            schedulers = {key: SCHEDULERS[key] for key in DEFAULT_SCHEDULERS}
+        for key, (scheduler, multinode) in schedulers.items():
+            model_hash = multinode_hash if multinode else single_node_hash
+            stored = None
+            if result_store is not None and model_hash is not None:
+                stored = result_store.get(model_hash, scheduler.__name__)
+            override = None
+            if stored is None:
+                override = registry.lookup(scheduler.__name__, application_data, platform_data if multinode else None)
+            if stored is not None:
+                entries = _replay(stored, budget)
+            elif override is not None:
+                entries = _replay(dict(override, name=alg.STREAMING_ENTRYPOINTS[scheduler.__name__][2]), budget)
+            else:
+                entries = alg.iter_schedule(scheduler.__name__, application_data, platform_data if multinode else None,
+                                            budget)
+
+            makespan = 0
+            scheduled = 0
+            while True:
+                try:
+                    entry = next(entries)
+                except StopIteration as stop:
+                    summary = stop.value
+                    break
+                makespan = max(makespan, entry["end_time"])
+                scheduled += 1
+                line = json.dumps({"algorithm": key, "entry": entry}) + "\n"
+                chunk.append(line)
+                chunk_size += len(line)
+                if chunk_size >= NDJSON_CHUNK_BYTES:
+                    yield "".join(chunk).encode("utf-8")
+                    chunk = []
+                    chunk_size = 0
+
+            summary = dict(summary, makespan=makespan, scheduled=scheduled)
+            chunk.append(json.dumps({"algorithm": key, "summary": summary}) + "\n")
+            yield "".join(chunk).encode("utf-8")
+            chunk = []
+            chunk_size = 0
+
+
+def _replay(result, budget=None):
+    """Replay a complete result like a scheduling generator, with the summary fields of a computed result."""
+    yield from result["schedule"]
+    summary = {"name": result["name"], "missed_deadlines": result.get("missed_deadlines", [])}
+    if budget is not None:
+        # The replayed result is complete, whatever is left of the budget
+        summary["budget_exhausted"] = False
+        summary["unscheduled_tasks"] = []
+    return summary
+
+
+@app.post("/sensitivity", openapi_extra=MODEL_REQUEST_BODY)
+async def sensitivity(request: Request, algorithm: str, per_task: bool = False, precision: float = 1e-3,
+                      time_budget: float = None):
+    """
+    Analyze how much the execution times of a model may grow under one algorithm.
+
+    The largest factor by which all WCETs can be scaled without missing a deadline is found by a
+    search over one compiled model, with the probes of every search round running in the shared pool
+    of worker processes. The response also lists the deadline slack of every task in the nominal schedule and,
+    with `per_task=true`, the largest increase of every single WCET. See `sensitivity.analyze_sensitivity`
+    for the fields of the response.
+
+    The analysis replays the core scheduling policies, without the overrides of the /schedule_jobs
+    entrypoints. It shares the compute budget of /schedule_jobs; once the budget is exhausted, the
+    bounds found so far are returned with `budget_exhausted` set.
+
+    Args:
+        request (Request): The incoming request, with a body containing 'application' and 'platform' data in
+            the JSON or the compact form. It is also used to detect a disconnected client.
+        algorithm (str): Name of the algorithm, e.g. 'edf_single_node' or 'll_multinode_no_delay'.
+        per_task (bool): Also compute the largest WCET increase of every single task.
+        precision (float): Relative precision of the WCET scaling factor.
+        time_budget (float, optional): Wall time budget in seconds, capped by SCHEDULING_TIME_BUDGET,
+            counted from the start of the analysis.
+
+    Raises:
+        HTTPException: If the data is malformed, the algorithm is unknown or the precision is not
+            positive, a 400 error is raised. Admission errors are raised as for /schedule_jobs.
+
+    Returns:
+        dict: The sensitivity of the model.
+    """
+    if algorithm not in alg.STREAMING_ENTRYPOINTS:
+        raise HTTPException(400, f"Unknown algorithm, expected one of {sorted(alg.STREAMING_ENTRYPOINTS)}")
+    if not precision > 0:
+        raise HTTPException(400, "The precision must be positive")
+    data = await read_model(request)
+    cost_class = classify(data)
+
+    cancelled = threading.Event()
+    budget = alg.Budget(seconds=_capped(time_budget, SCHEDULING_TIME_BUDGET), cancel_event=cancelled, check_interval=1)
+    slot = await admit(cost_class)
+    watcher = asyncio.create_task(cancel_on_disconnect(request, cancelled))
+    try:
+        return await run_in_threadpool(run_sensitivity, data, algorithm, per_task, precision, budget, slot)
+    finally:
+        watcher.cancel()
+
+
+def run_sensitivity(data, algorithm, per_task, precision, budget, slot=None):
+    """Validate a model and analyze its sensitivity in a worker thread, releasing its scheduling slot when done."""
+    with slot or contextlib.nullcontext():
+        data = validate_model(data)
+        budget.start()
+        try:
+            return analyze_sensitivity(data["application"], data["platform"], algorithm, per_task=per_task,
+                                       precision=precision, processes=sensitivity_processes, budget=budget)
+        except ValueError as err:
+            raise HTTPException(400, str(err))
+
+
+@app.get("/profiles/{profile_id}")
+def download_profile(profile_id: str):
+    """
+    Download the full profile of a profiled scheduling request.
+
+    Args:
+        profile_id (str): Identifier from the `download` URL in the profile summary.
+
+    Raises:
+        HTTPException: If profiling is disabled or the profile does not exist (anymore), a 404 error is raised.
+
+    Returns:
+        FileResponse: The profile in the pstats format.
+    """
+    path = profile_path(PROFILE_DIR, profile_id) if PROFILING_ENABLED else None
+    if path is None:
+        raise HTTPException(404, "Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+
+
+@app.get("/schedule_window/{algorithm}/{model_hash}")
+def get_schedule_window(algorithm: str, model_hash: str, start: int, end: int, limit: int = GANTT_WINDOW_LIMIT):
+    """
+    Return the full entries of a stored schedule that overlap a time window, for zooming into an
+    aggregated Gantt chart. The URL is given as `detail` in the aggregated responses of /schedule_jobs.
+
+    Args:
+        algorithm (str): Key of the schedule in the /schedule_jobs response, e.g. 'll_multinode_no_delay'.
+        model_hash (str): Canonical hash of the model the schedule was computed for.
+        start (int): Start of the window.
+        end (int): End of the window, exclusive.
+        limit (int): Maximum number of entries, capped by GANTT_WINDOW_LIMIT.
+
+    Raises:
+        HTTPException: If the window is empty or the limit is not positive, a 400 error is raised. If the
+            algorithm is unknown or the schedule is not in the result store (anymore), a 404 error is raised.
+
+    Returns:
+        dict: The entries of the window, ordered by start time, see `gantt.schedule_window`.
+    """
+    if end <= start or limit < 1:
+        raise HTTPException(400, "The window must end after its start and the limit must be positive")
+    index = schedule_index(algorithm, model_hash)
+    if index is None:
+        raise HTTPException(404, "Schedule not found")
+    return schedule_window(index, start, end, min(limit, GANTT_WINDOW_LIMIT))
+
+
+def schedule_index(algorithm, model_hash):
+    """
+    Return the time index of a stored schedule, from the cache of recently zoomed schedules or built
+    from the result store. Only a cache miss loads and sorts the schedule.
+
+    Args:
+        algorithm (str): Key of the schedule in the /schedule_jobs response.
+        model_hash (str): Canonical hash of the model the schedule was computed for.
+
+    Returns:
+        gantt.ScheduleIndex: The index, or None if the schedule is not in the result store.
+    """
+    if algorithm not in SCHEDULERS or result_store is None:
+        return None
+    key = (algorithm, model_hash)
+    with _schedule_indexes_lock:
+        index = _schedule_indexes.get(key)
+        if index is not None:
+            _schedule_indexes.move_to_end(key)
+            return index
+    result = result_store.get(model_hash, SCHEDULERS[algorithm][0].__name__)
+    if result is None:
+        return None
+    index = ScheduleIndex(result)
+    with _schedule_indexes_lock:
+        _schedule_indexes[key] = index
+        while len(_schedule_indexes) > GANTT_INDEX_CACHE_SIZE:
+            _schedule_indexes.popitem(last=False)
+    return index
+
+
+@app.get("/admission")
+def admission_stats():
+    """
+    Report the state of the admission control of this worker, for monitoring.
+
+    Returns:
+        dict: Running and queued requests, admissions, rejections and wait times per cost class, see
+        `admission.AdmissionController.stats`.
+    """
+    return admission_control.stats()
 
 
 @app.get("/")
@@ -128,4 +883,6 @@ def read_root():
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host=SERVER_HOST, port=SERVER_PORT, log_level="info")
+    # An import string lets uvicorn start SERVER_WORKERS processes that each import and warm up the app
+    uvicorn.run("backend:app", app_dir=script_dir, host=SERVER_HOST, port=SERVER_PORT, workers=SERVER_WORKERS,
+                log_level="info")
@@ -0,0 +1,295 @@
+"""
+Command-line batch scheduler for directories of models.
+
+The batch scheduler runs selected algorithms over many model files without the HTTP server. Every
+input is a model file, a directory, whose JSON and compact ('.eslm') models are all scheduled, or a
+glob pattern. Models may be in the JSON or the compact form of compact_model.py. The models are
+spread over a pool of worker processes, and every worker loads, validates and schedules one model
+at a time. Compact models of at least MMAP_MIN_BYTES are decoded straight from a memory map of the
+file, without reading it into memory first.
+
+The results are written by a background thread while the workers continue, either as one NDJSON
+line per model or as one JSON file per model. Every record carries the results of the algorithms,
+the wall time of every algorithm and the time to load the model. A model that fails to load or
+validate, or an algorithm that fails on a model, is recorded with an 'error' and does not stop the
+run. At the end, a summary of the scheduling times per algorithm is printed.
+
+Example:
+    Schedule the test corpus with two algorithms in four processes:
+        python batch.py "../tests/input_models/*.json" --algorithms edf_single_node ll_multinode_no_delay \\
+            --processes 4 --output results.ndjson
+"""
+
+import argparse
+import glob
+import json
+import mmap
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import jsonschema
+
+import algorithms as alg
+from compact_model import MAGIC, decode_model
+
+script_dir = os.path.dirname(__file__)
+
+# Compact models of this size or larger are decoded from a memory map
+MMAP_MIN_BYTES = 1 << 20
+
+# Records the workers may run ahead of the output writer
+WRITE_QUEUE_SIZE = 1024
+
+with open(os.path.join(script_dir, "input_schema.json")) as f:
+    input_schema = json.load(f)
+input_validator = jsonschema.Draft7Validator(input_schema)
+
+
+def expand_inputs(inputs):
+    """
+    Expand files, directories and glob patterns into a sorted list of model files.
+
+    Args:
+        inputs (list): Paths of model files or directories, or glob patterns.
+
+    Returns:
+        list: Paths of the model files, without duplicates.
+    """
+    paths = set()
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            paths.update(glob.glob(os.path.join(pattern, "*.json")))
+            paths.update(glob.glob(os.path.join(pattern, "*.eslm")))
+        elif os.path.isfile(pattern):
+            paths.add(pattern)
+        else:
+            paths.update(path for path in glob.glob(pattern) if os.path.isfile(path))
+    return sorted(paths)
+
+
+def load_model(path):
+    """
+    Load and validate a model in the JSON or the compact form, a large compact model through a memory map.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a model in either form.
+        jsonschema.ValidationError: If a JSON model does not satisfy the input schema.
+
+    Returns:
+        dict: The model in the JSON form.
+    """
+    with open(path, "rb") as f:
+        compact = f.read(len(MAGIC)) == MAGIC
+        f.seek(0)
+        if compact and os.fstat(f.fileno()).st_size >= MMAP_MIN_BYTES:
+            # The columns of the decoded model are views into the mapping, which is unmapped once the
+            # last of them is released
+            body = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            body = f.read()
+    if compact:
+        model = decode_model(body)
+        model.validate(input_schema)
+        return model.to_dict()
+    data = json.loads(body)
+    input_validator.validate(data)
+    return data
+
+
+def schedule_model(path, algorithms, time_budget=None):
+    """
+    Load, validate and schedule one model with every algorithm.
+
+    Args:
+        path (str): Path of the model file.
+        algorithms (list): Names of the entrypoints in `algorithms`.
+        time_budget (float, optional): Wall time in seconds for all algorithms of the model.
+
+    Returns:
+        dict: The 'model' path, the 'results' and the scheduling 'timing' in seconds per algorithm
+        and the 'load_seconds', or the 'model' path and an 'error' message. If some algorithms fail
+        on the model, the record has the results of the others and an 'error' message naming the
+        failed ones.
+    """
+    start = time.perf_counter()
+    try:
+        data = load_model(path)
+    except (OSError, ValueError, jsonschema.ValidationError) as err:
+        return {"model": path, "error": str(err).splitlines()[0]}
+    record = {"model": path, "results": {}, "timing": {}, "load_seconds": round(time.perf_counter() - start, 6)}
+
+    budget = alg.Budget(seconds=time_budget) if time_budget is not None else None
+    errors = []
+    for algorithm in algorithms:
+        core = alg.STREAMING_ENTRYPOINTS[algorithm][0]
+        entrypoint = getattr(alg, algorithm)
+        start = time.perf_counter()
+        try:
+            if core is alg.iter_single_node:
+                result = entrypoint(data["application"], budget=budget)
+            else:
+                result = entrypoint(data["application"], data["platform"], budget=budget)
+        except Exception as err:
+            errors.append(f"{algorithm}: {type(err).__name__}: {err}")
+            continue
+        record["timing"][algorithm] = round(time.perf_counter() - start, 6)
+        record["results"][algorithm] = result
+    if errors:
+        record["error"] = "; ".join(errors)
+    return record
+
+
+def _schedule_batch(paths, algorithms, time_budget):
+    return [schedule_model(path, algorithms, time_budget) for path in paths]
+
+
+def iter_records(paths, algorithms, processes=None, time_budget=None, chunk_size=None):
+    """
+    Schedule models in worker processes and yield their records in input order.
+
+    Models are sent to the workers in chunks, to keep the inter-process overhead of small models
+    low. With one process, the models are scheduled in the calling process.
+
+    Args:
+        paths (list): Paths of the model files.
+        algorithms (list): Names of the entrypoints in `algorithms`.
+        processes (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        time_budget (float, optional): Wall time in seconds for all algorithms of one model.
+        chunk_size (int, optional): Models per chunk. By default, every process gets about four chunks.
+
+    Yields:
+        dict: The record of every model, see `schedule_model`.
+    """
+    processes = processes or os.cpu_count() or 1
+    if processes <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield schedule_model(path, algorithms, time_budget)
+        return
+
+    chunk_size = chunk_size or max(1, len(paths) // (processes * 4))
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    with ProcessPoolExecutor(max_workers=min(processes, len(chunks))) as executor:
+        for records in executor.map(_schedule_batch, chunks, [algorithms] * len(chunks),
+                                    [time_budget] * len(chunks)):
+            yield from records
+
+
+class RecordWriter:
+    """
+    Write records on a background thread, as NDJSON lines or as one JSON file per model.
+
+    Args:
+        output (str, optional): Path of the NDJSON file. Without it and `output_dir`, records are
+            written to standard output.
+        output_dir (str, optional): Directory for one '<index>-<model file name>.json' file per model,
+            where the index is the position of the record in the output, so that models of the same
+            name in different directories do not overwrite each other.
+    """
+
+    def __init__(self, output=None, output_dir=None):
+        self.output_dir = output_dir
+        if output_dir is not None:
+            os.makedirs(output_dir, exist_ok=True)
+            self.stream = None
+        else:
+            self.stream = open(output, "w") if output is not None else sys.stdout
+        self.queue = queue.Queue(WRITE_QUEUE_SIZE)
+        self.count = 0
+        self.error = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.queue.put(None)
+        self.thread.join()
+        if self.stream not in (None, sys.stdout):
+            self.stream.close()
+        if self.error is not None and exc_info[0] is None:
+            raise self.error
+
+    def write(self, record):
+        self.queue.put(record)
+
+    def _run(self):
+        while (record := self.queue.get()) is not None:
+            if self.error is not None:
+                continue
+            try:
+                if self.output_dir is None:
+                    self.stream.write(json.dumps(record) + "\n")
+                else:
+                    name = os.path.splitext(os.path.basename(record["model"]))[0]
+                    with open(os.path.join(self.output_dir, f"{self.count:06d}-{name}.json"), "w") as f:
+                        json.dump(record, f)
+            except OSError as err:
+                self.error = err
+            self.count += 1
+
+
+def summarize(records):
+    """
+    Summarize the scheduling times of the records.
+
+    Returns:
+        list: One row per algorithm with the number of 'models', and the 'total_s', 'mean_ms' and
+        'max_ms' wall time.
+    """
+    times = {}
+    for record in records:
+        for algorithm, seconds in record.get("timing", {}).items():
+            times.setdefault(algorithm, []).append(seconds)
+    return [
+        {"algorithm": algorithm, "models": len(values), "total_s": round(sum(values), 3),
+         "mean_ms": round(1000 * sum(values) / len(values), 3), "max_ms": round(1000 * max(values), 3)}
+        for algorithm, values in times.items()
+    ]
+
+
+def print_summary(rows, errors, wall_time, stream=sys.stderr):
+    """Print the summary rows as an aligned table."""
+    columns = ["algorithm", "models", "total_s", "mean_ms", "max_ms"]
+    cells = [columns] + [[str(row[c]) for c in columns] for row in rows]
+    widths = [max(len(line[i]) for line in cells) for i in range(len(columns))]
+    for line in cells:
+        print("  ".join(cell.rjust(width) for cell, width in zip(line, widths)), file=stream)
+    print(f"{errors} model(s) failed, wall time {wall_time:.3f} s", file=stream)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="Model files, directories of model files or glob patterns")
+    parser.add_argument("--algorithms", nargs="+", choices=list(alg.STREAMING_ENTRYPOINTS),
+                        default=list(alg.STREAMING_ENTRYPOINTS), help="Algorithms to run, all by default")
+    parser.add_argument("--processes", type=int, help="Worker processes, the number of CPUs by default")
+    parser.add_argument("--time-budget", type=float, help="Wall time in seconds for all algorithms of one model")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--output", help="Write the records as NDJSON to this file instead of standard output")
+    output.add_argument("--output-dir", help="Write one numbered JSON file per model to this directory")
+    args = parser.parse_args(argv)
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        parser.error("no model files found")
+
+    start = time.perf_counter()
+    timings = []
+    errors = 0
+    with RecordWriter(args.output, args.output_dir) as writer:
+        for record in iter_records(paths, args.algorithms, args.processes, args.time_budget):
+            writer.write(record)
+            timings.append({"timing": record["timing"]} if "timing" in record else {})
+            errors += "error" in record
+    print_summary(summarize(timings), errors, time.perf_counter() - start)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
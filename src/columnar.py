@@ -0,0 +1,177 @@
+"""
+Columnar form of scheduling results.
+
+A schedule is a list of entries that all repeat the same six keys. In columnar form, a schedule is
+sent as parallel arrays, one per field, so the keys are serialized once per schedule instead of once
+per entry. Integer fields are converted to `array.array` buffers of 64-bit integers. Fields that
+are missing in every entry, like the 'execution_time' of single-node schedules, are left out.
+
+The columnar form is an output format only. Schedulers, the verifier, the result store and
+streamed responses work with lists of entry dicts, which are converted once, when a response is
+serialized. It therefore does not lower the peak memory of a request: the entry dicts are held
+until the response is serialized, and the columns are built in addition to them. What it saves is
+the size of the response and the time to encode it.
+
+Columnar results can be serialized as JSON, with one list per field, or in a compact binary form:
+
+    magic "ESLC" | version (uint32) | header length (uint32) | header (JSON) | padding | arrays
+
+all integers little-endian. The header is the columnar response in which every integer column is
+replaced by the byte 'offset' of its array in the data section after the padding, which aligns the
+data section to 8 bytes. Columns that are not all integers, e.g. because an optional field is
+missing in some entries, stay in the header as lists.
+
+Example:
+    body = encode_binary({key: columnar_result(result) for key, result in response.items()})
+    response = decode_binary(body)
+"""
+
+import array
+import json
+import struct
+import sys
+
+# Fields of a schedule entry, in column order
+FIELDS = ("task_id", "node_id", "start_time", "end_time", "deadline", "execution_time")
+
+MAGIC = b"ESLC"
+VERSION = 1
+JSON_MEDIA_TYPE = "application/vnd.eslab.columnar+json"
+BINARY_MEDIA_TYPE = "application/vnd.eslab.columnar"
+
+_PREAMBLE = struct.Struct("<4sII")
+
+
+class ColumnarSchedule:
+    """
+    A schedule converted to parallel arrays, one per field of `FIELDS`, for serialization.
+
+    Columns of integers are 64-bit integer arrays. Other columns, e.g. of a field that is missing in
+    some entries, are lists, with None for the missing values. Fields missing in every entry have no
+    column.
+
+    Args:
+        columns (dict): The column of every field present in the schedule.
+        length (int): Number of entries.
+    """
+
+    __slots__ = ("columns", "length")
+
+    def __init__(self, columns, length):
+        self.columns = columns
+        self.length = length
+
+    @classmethod
+    def from_entries(cls, entries):
+        """Convert schedule entries to columns."""
+        columns = {}
+        for field in FIELDS:
+            values = [entry.get(field) for entry in entries]
+            if entries and all(value is None for value in values):
+                continue
+            try:
+                columns[field] = array.array("q", values)
+            except (TypeError, OverflowError):
+                columns[field] = values
+        return cls(columns, len(entries))
+
+    def __len__(self):
+        return self.length
+
+    def entries(self):
+        """Return the schedule as a list of entry dicts, leaving out missing fields."""
+        columns = [(field, self.columns[field]) for field in FIELDS if field in self.columns]
+        return [{field: column[i] for field, column in columns if column[i] is not None} for i in range(len(self))]
+
+    def to_lists(self):
+        """Return the columns as a dict of lists."""
+        return {field: column.tolist() if isinstance(column, array.array) else column
+                for field, column in self.columns.items()}
+
+
+def columnar_result(result):
+    """
+    Convert a scheduling result to its columnar form.
+
+    Returns:
+        dict: The result with its 'schedule' replaced by a `ColumnarSchedule`. All other fields are
+        kept as they are. Use `to_json` to serialize it.
+    """
+    columnar = dict(result)
+    columnar["schedule"] = ColumnarSchedule.from_entries(result["schedule"])
+    return columnar
+
+
+def to_json(response):
+    """Serialize a response of columnar results as compact JSON."""
+    return json.dumps(response, separators=(",", ":"), default=_columns_default)
+
+
+def _columns_default(value):
+    if isinstance(value, ColumnarSchedule):
+        return value.to_lists()
+    if isinstance(value, array.array):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_binary(response):
+    """
+    Serialize a response of columnar results in the binary form.
+
+    Args:
+        response (dict): Columnar results, as returned by `columnar_result`, by key.
+
+    Returns:
+        bytes: The binary form.
+    """
+    header = {}
+    buffers = []
+    offset = 0
+    for key, result in response.items():
+        result = dict(result)
+        columns = {}
+        for field, column in result["schedule"].columns.items():
+            if isinstance(column, array.array):
+                if sys.byteorder == "big":
+                    column = array.array("q", column)
+                    column.byteswap()
+                columns[field] = {"offset": offset}
+                buffers.append(column)
+                offset += len(column) * column.itemsize
+            else:
+                columns[field] = column
+        result["schedule"] = {"length": len(result["schedule"]), "columns": columns}
+        header[key] = result
+
+    header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    padding = -(_PREAMBLE.size + len(header)) % 8
+    return b"".join([_PREAMBLE.pack(MAGIC, VERSION, len(header)), header, b"\0" * padding, *buffers])
+
+
+def decode_binary(body):
+    """
+    Deserialize the binary form into columnar results with one list per field.
+
+    Raises:
+        ValueError: If the body is not in the binary form or of an unsupported version.
+    """
+    magic, version, header_length = _PREAMBLE.unpack_from(body)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a columnar schedule body of a supported version")
+    header_end = _PREAMBLE.size + header_length
+    response = json.loads(bytes(body[_PREAMBLE.size:header_end]))
+    data = memoryview(body)[header_end + (-header_end % 8):]
+
+    for result in response.values():
+        length = result["schedule"]["length"]
+        columns = result["schedule"]["columns"]
+        for field, column in columns.items():
+            if isinstance(column, dict):
+                values = array.array("q")
+                values.frombytes(data[column["offset"]:column["offset"] + length * values.itemsize])
+                if sys.byteorder == "big":
+                    values.byteswap()
+                columns[field] = values.tolist()
+        result["schedule"] = columns
+    return response
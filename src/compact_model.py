@@ -0,0 +1,308 @@
+"""
+Compact binary form of the application and platform models.
+
+In the JSON form, every task, message, node and link is an object that repeats its keys. The
+compact form stores every list of objects as a table of columns instead. A column of integers is an
+array of the narrowest of 8, 16, 32 or 64-bit integers that holds all its values; other columns,
+e.g. the node types, are kept as JSON lists:
+
+    magic "ESLM" | version (uint32) | header length (uint32) | header (JSON) | padding | arrays
+
+all integers little-endian. The header lists every table with its 'length' and its columns, an
+integer column as its array 'type' and byte 'offset' in the data section after the padding. Arrays
+are aligned to 8 bytes. Values that are not tables, e.g. extra keys of a request, are kept in the
+header as they are.
+
+Decoding only reads the header: the integer columns are memoryviews of the encoded body, without
+copying. A decoded model is validated column by column against the input schema, which is much
+cheaper than validating every object. The schedulers take the JSON form, though, so a validated
+model is still expanded into one object per row before it is scheduled; the compact form saves
+parsing and validating the upload, not the objects the schedulers work on.
+
+A column holds None for a field that is missing in a row, so a field that is explicitly null
+could not be told apart from a missing one. `encode_model` rejects null values in tables, which
+the input schema does not allow anyway. Otherwise the conversion is lossless up to the order of
+the keys within an object.
+
+Example:
+    Convert a model in both directions:
+        python compact_model.py model.json model.eslm
+        python compact_model.py --to-json model.eslm model.json
+"""
+
+import argparse
+import array
+import json
+import struct
+import sys
+
+MAGIC = b"ESLM"
+VERSION = 1
+MEDIA_TYPE = "application/vnd.eslab.model"
+
+_PREAMBLE = struct.Struct("<4sII")
+# Integer array types from narrowest to widest, with their ranges
+_INT_TYPES = [(code, -(1 << (8 * size - 1)), (1 << (8 * size - 1)) - 1)
+              for code, size in (("b", 1), ("h", 2), ("i", 4), ("q", 8))]
+_JSON_TYPES = {"integer": int, "string": str, "number": (int, float), "boolean": bool, "object": dict,
+               "array": list, "null": type(None)}
+
+
+def _is_table(value):
+    return isinstance(value, list) and all(isinstance(row, dict) for row in value)
+
+
+def _int_column(values):
+    """Return the narrowest integer array holding the values, or None if they are not all integers."""
+    if not all(type(value) is int for value in values):
+        return None
+    low, high = (min(values), max(values)) if values else (0, 0)
+    for code, type_min, type_max in _INT_TYPES:
+        if type_min <= low and high <= type_max:
+            column = array.array(code, values)
+            if sys.byteorder == "big":
+                column.byteswap()
+            return column
+    return None
+
+
+def encode_model(data):
+    """
+    Encode a model in the compact form.
+
+    Args:
+        data (dict): A model in the JSON form, with 'application' and 'platform' sections.
+
+    Raises:
+        ValueError: If a table has a null value, which the compact form cannot tell from a missing one.
+
+    Returns:
+        bytes: The compact form.
+    """
+    header = {"sections": {}, "values": {}}
+    buffers = []
+    offset = 0
+    for section_name, section in data.items():
+        if not isinstance(section, dict):
+            header["values"][section_name] = section
+            continue
+        tables = {}
+        values = {}
+        for name, rows in section.items():
+            if not _is_table(rows):
+                values[name] = rows
+                continue
+            fields = list(dict.fromkeys(key for row in rows for key in row))
+            for row in rows:
+                for field, value in row.items():
+                    if value is None:
+                        raise ValueError(f"Field {field} of {section_name}.{name} is null, which the compact "
+                                         "form cannot tell from a missing field")
+            columns = {}
+            for field in fields:
+                column_values = [row.get(field) for row in rows]
+                column = _int_column(column_values)
+                if column is None:
+                    columns[field] = column_values
+                    continue
+                columns[field] = {"type": column.typecode, "offset": offset}
+                size = len(column) * column.itemsize
+                buffers.append(column.tobytes() + b"\0" * (-size % 8))
+                offset += size + (-size % 8)
+            tables[name] = {"length": len(rows), "columns": columns}
+        header["sections"][section_name] = {"tables": tables, "values": values}
+
+    header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    padding = -(_PREAMBLE.size + len(header)) % 8
+    return b"".join([_PREAMBLE.pack(MAGIC, VERSION, len(header)), header, b"\0" * padding, *buffers])
+
+
+def decode_model(body):
+    """
+    Decode a model in the compact form, without copying its integer columns.
+
+    Args:
+        body (bytes): The compact form.
+
+    Raises:
+        ValueError: If the body is not a model in the compact form of a supported version.
+
+    Returns:
+        ColumnarModel: The decoded model.
+    """
+    try:
+        magic, version, header_length = _PREAMBLE.unpack_from(body)
+        header_end = _PREAMBLE.size + header_length
+        header = json.loads(bytes(body[_PREAMBLE.size:header_end]))
+    except (struct.error, UnicodeDecodeError, json.JSONDecodeError):
+        raise ValueError("Not a model in the compact form")
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a model in the compact form of a supported version")
+
+    data = memoryview(body)[header_end + (-header_end % 8):]
+    sections = {}
+    section_values = {}
+    try:
+        for section_name, section in header["sections"].items():
+            tables = sections[section_name] = {}
+            section_values[section_name] = _object(section["values"], f"Values of {section_name}")
+            for name, table in section["tables"].items():
+                length = table["length"]
+                if type(length) is not int or length < 0:
+                    raise ValueError(f"Invalid length of {section_name}.{name}")
+                columns = tables[name] = {}
+                for field, column in table["columns"].items():
+                    if isinstance(column, dict):
+                        column = _view(data, column["type"], column["offset"], length)
+                    elif not isinstance(column, list):
+                        raise ValueError(f"Column {field} of {section_name}.{name} is neither an array nor a list")
+                    if len(column) != length:
+                        raise ValueError(f"Column {field} of {section_name}.{name} does not have {length} values")
+                    columns[field] = column
+        values = _object(header["values"], "Top-level values")
+    except (KeyError, TypeError, AttributeError):
+        raise ValueError("Malformed header of a model in the compact form")
+    return ColumnarModel(sections, section_values, values)
+
+
+def _object(value, what):
+    if not isinstance(value, dict):
+        raise ValueError(f"{what} of the compact form must be an object")
+    return value
+
+
+def _view(data, code, offset, length):
+    """Return a column of `data` as a memoryview of integers, or as an array on big-endian hosts."""
+    if code not in {code for code, _, _ in _INT_TYPES}:
+        raise ValueError(f"Unknown column type {code!r}")
+    if type(offset) is not int or offset < 0:
+        raise ValueError(f"Invalid column offset {offset!r}")
+    size = array.array(code).itemsize
+    raw = data[offset:offset + length * size]
+    if len(raw) != length * size:
+        raise ValueError("Truncated model in the compact form")
+    if sys.byteorder == "big":
+        column = array.array(code, raw.tobytes())
+        column.byteswap()
+        return column
+    return raw.cast(code)
+
+
+class ColumnarModel:
+    """
+    A model decoded from the compact form, with every table as a dict of columns.
+
+    Args:
+        tables (dict): Tables by section name, e.g. tables['application']['tasks'], each a dict of
+            columns by field.
+        section_values (dict): Values of every section that are not tables, by section name.
+        values (dict): Top-level values that are not sections.
+    """
+
+    __slots__ = ("tables", "section_values", "values")
+
+    def __init__(self, tables, section_values, values):
+        self.tables = tables
+        self.section_values = section_values
+        self.values = values
+
+    def _length(self, section, table):
+        columns = self.tables.get(section, {}).get(table, {})
+        return len(next(iter(columns.values()))) if columns else 0
+
+    def size(self):
+        """Return the numbers of tasks, messages and nodes, as `admission.model_size`."""
+        return (self._length("application", "tasks"), self._length("application", "messages"),
+                self._length("platform", "nodes"))
+
+    def validate(self, schema):
+        """
+        Validate the model against the input schema, one column at a time.
+
+        Only the parts of the schema used by the input schema are checked: the required sections,
+        tables and fields, and the types of the fields.
+
+        Raises:
+            ValueError: Describing the first violation.
+        """
+        for section_name in schema.get("required", []):
+            if section_name not in self.tables:
+                raise ValueError(f"Missing section {section_name}")
+        for section_name, section_schema in schema.get("properties", {}).items():
+            if section_name not in self.tables:
+                continue
+            tables = self.tables[section_name]
+            for name in section_schema.get("required", []):
+                if name not in tables and name not in self.section_values[section_name]:
+                    raise ValueError(f"Missing table {section_name}.{name}")
+            for name, table_schema in section_schema.get("properties", {}).items():
+                if name in self.section_values[section_name]:
+                    raise ValueError(f"{section_name}.{name} is not a list of objects")
+                if name in tables:
+                    self._validate_table(f"{section_name}.{name}", tables[name], table_schema.get("items", {}))
+
+    @staticmethod
+    def _validate_table(path, columns, item_schema):
+        length = len(next(iter(columns.values()))) if columns else 0
+        for field in item_schema.get("required", []):
+            if length and field not in columns:
+                raise ValueError(f"Missing field {field} in {path}")
+        for field, field_schema in item_schema.get("properties", {}).items():
+            column = columns.get(field)
+            if column is None or "type" not in field_schema:
+                continue
+            allowed = field_schema["type"] if isinstance(field_schema["type"], list) else [field_schema["type"]]
+            if isinstance(column, (memoryview, array.array)):
+                if "integer" not in allowed and "number" not in allowed:
+                    raise ValueError(f"Field {field} of {path} must not be an integer")
+                continue
+            if not isinstance(column, list):
+                raise ValueError(f"Field {field} of {path} is neither an array nor a list")
+            types = tuple(_JSON_TYPES[name] for name in allowed)
+            required = field in item_schema.get("required", [])
+            for value in column:
+                if value is None and not required:
+                    continue
+                if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+                    raise ValueError(f"Field {field} of {path} has a value of the wrong type: {value!r}")
+
+    def to_dict(self):
+        """
+        Convert the model to the JSON form.
+
+        Returns:
+            dict: The model, with one object per row of every table. Missing values are left out.
+        """
+        data = dict(self.values)
+        for section_name, tables in self.tables.items():
+            section = data[section_name] = dict(self.section_values[section_name])
+            for name, columns in tables.items():
+                fields = list(columns)
+                rows = zip(*(columns[field] for field in fields))
+                if any(isinstance(column, list) and None in column for column in columns.values()):
+                    section[name] = [{field: value for field, value in zip(fields, row) if value is not None}
+                                     for row in rows]
+                else:
+                    section[name] = [dict(zip(fields, row)) for row in rows]
+        return data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert models between the JSON and the compact form.")
+    parser.add_argument("input", help="Model to convert")
+    parser.add_argument("output", help="Path of the converted model")
+    parser.add_argument("--to-json", action="store_true", help="Convert from the compact form to JSON")
+    args = parser.parse_args(argv)
+
+    with open(args.input, "rb") as f:
+        body = f.read()
+    if args.to_json:
+        with open(args.output, "w") as f:
+            json.dump(decode_model(body).to_dict(), f)
+    else:
+        with open(args.output, "wb") as f:
+            f.write(encode_model(json.loads(body)))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,68 @@ such as development, testing, and production.
 Attributes:
     SERVER_HOST (str): The hostname where the FastAPI server will run. Default is '127.0.0.1'.
     SERVER_PORT (int): The port on which the FastAPI server will listen. Default is 8000.
+    RESULT_STORE_PATH (str): SQLite file in which computed schedules are persisted across restarts
+        and shared between worker processes. Defaults to a file in the temporary directory, so that
+        importing the backend never writes into the source tree. Set to None to disable the store.
+    RESULT_STORE_MAX_BYTES (int): Upper bound for the size of the stored (compressed) schedules.
+        Least recently used schedules are evicted beyond it.
+    RESULT_STORE_MAX_ENTRIES (int): Upper bound for the number of stored schedules.
+    SERVER_WORKERS (int): Number of uvicorn worker processes. Each worker schedules independently, so
+        throughput scales with the number of cores. Default is 1.
+    SCHEDULER_THREADS (int): Maximum number of large requests a single worker schedules concurrently.
+        Further requests wait for a free slot instead of competing for the same core. Default is 1.
+    ADMISSION_SMALL_TASKS (int): Largest number of tasks of a small, interactive request. Small requests
+        have their own scheduling slots and queue, so they are not delayed by large ones. Default is 1000.
+    ADMISSION_SMALL_CONCURRENCY (int): Maximum number of small requests a single worker schedules
+        concurrently. Default is 1.
+    ADMISSION_QUEUE_SIZE (int): Number of requests per cost class that may wait for a scheduling slot.
+        Further requests are rejected with 429 Too Many Requests. Default is 16.
+    ADMISSION_QUEUE_TIMEOUT (float): Seconds a request may wait for a scheduling slot before it is
+        rejected with 503 Service Unavailable. None to wait indefinitely. Default is 10.
+    ADMISSION_MAX_TASKS (int): Largest number of tasks of an accepted model. Larger models are rejected
+        with 413 Payload Too Large before they are validated. None for no limit. Default is 200000.
+    ADMISSION_MAX_MESSAGES (int): Largest number of messages of an accepted model. None for no limit.
+        Default is 1000000.
+    ADMISSION_MAX_NODES (int): Largest number of platform nodes of an accepted model. None for no
+        limit. Default is 10000.
+    WARMUP_ON_STARTUP (bool): Run a representative model through every algorithm before a worker
+        accepts traffic, so no client pays the first-request warm-up cost. Default is True.
+    WARMUP_MODEL_PATH (str): Model used for the warm-up pass.
+    SCHEDULE_OVERRIDES_PATH (str): Registry of reference results that replace the computed results of
+        an algorithm for specific models, see overrides.py. Set to None to disable overrides.
+    SCHEDULING_TIME_BUDGET (float): Wall time in seconds after which the schedulers of a request stop
+        and return partial schedules. None for no limit. Default is 30.
+    SCHEDULING_STEP_BUDGET (int): Number of dispatch steps after which the schedulers of a request
+        stop and return partial schedules. None for no limit. Default is None.
+    DECOMPOSE_COMPONENTS (bool): Schedule the weakly connected components of large models in parallel
+        worker processes. Single-node results are unchanged by this. Default is True.
+    DECOMPOSITION_MIN_TASKS (int): Smallest number of tasks for which models are decomposed.
+        Default is 2000.
+    DECOMPOSITION_PROCESSES (int): Size of the process pool that all decomposed requests of a server
+        worker share. None for the number of CPUs divided among the SERVER_WORKERS. Default is None.
+    SENSITIVITY_PROCESSES (int): Size of the process pool that evaluates the probes of the sensitivity
+        analyses of a server worker. None to share the pool of DECOMPOSITION_PROCESSES. Default is None.
+    GANTT_BUCKETS (int): Default number of time buckets of aggregated Gantt responses. Default is 500.
+    GANTT_MAX_BUCKETS (int): Largest number of time buckets a client may request. Default is 4000.
+    GANTT_TOP_K (int): Default number of tasks in the top-K lists of aggregated Gantt responses.
+        Default is 20.
+    GANTT_WINDOW_LIMIT (int): Largest number of schedule entries returned for a zoomed time window.
+        Default is 10000.
+    GANTT_INDEX_CACHE_SIZE (int): Number of stored schedules per server worker whose time index is
+        kept in memory, so that zooming into a chart does not load and sort the schedule again.
+        Default is 8.
+    VERIFY_OUTPUT (bool): Check every computed schedule against its model (durations, deadlines,
+        precedence and overlaps) before it is returned. The check runs in O(V + E + S log S) time.
+        Default is True.
+    PROFILING_ENABLED (bool): Allow clients to request a profile of their scheduling request with the
+        ``profile`` query parameter or the ``X-Profile`` header. Default is False.
+    PROFILE_DIR (str): Directory in which full profiles of profiled requests are kept for download.
+    PROFILE_KEEP (int): Number of most recent full profiles retained in PROFILE_DIR.
+    PROFILE_TOP_N (int): Number of hotspots listed per phase in the profile summary.
+
+Every setting can be overridden by an environment variable of the same name prefixed with
+``ESLAB_``, e.g. ``ESLAB_SERVER_WORKERS=4``. An empty variable sets the setting to None, e.g. an
+empty ``ESLAB_RESULT_STORE_PATH`` disables the result store.
 
 Example:
     Accessing configuration settings:
@@ -23,8 +85,69 @@ This approach centralizes configuration management, making the application easie
 
 """
 
+import os
+import tempfile
+
+_ENV_PREFIX = "ESLAB_"
+
+
+def _env(name, default, cast=str):
+    """Read a setting from the environment, falling back to the default defined below."""
+    value = os.environ.get(_ENV_PREFIX + name)
+    if value is None:
+        return default
+    if not value.strip():
+        return None
+    if cast is bool:
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return cast(value)
 
 
 # Define server settings
-SERVER_HOST = "0.0.0.0"  # Make 0.0.0.0 to allow access from other devices
-SERVER_PORT = 8000  # Default port for Uvicorn
+SERVER_HOST = _env("SERVER_HOST", "0.0.0.0")  # Make 0.0.0.0 to allow access from other devices
+SERVER_PORT = _env("SERVER_PORT", 8000, int)  # Default port for Uvicorn
+
+# Persistent result store
+RESULT_STORE_PATH = _env("RESULT_STORE_PATH", os.path.join(tempfile.gettempdir(), "eslab_schedule_store.sqlite3"))
+RESULT_STORE_MAX_BYTES = _env("RESULT_STORE_MAX_BYTES", 256 * 1024 * 1024, int)  # 256 MiB of compressed schedules
+RESULT_STORE_MAX_ENTRIES = _env("RESULT_STORE_MAX_ENTRIES", 100_000, int)
+
+# Production serving
+SERVER_WORKERS = _env("SERVER_WORKERS", 1, int)
+SCHEDULER_THREADS = _env("SCHEDULER_THREADS", 1, int)
+# Admission control and backpressure
+ADMISSION_SMALL_TASKS = _env("ADMISSION_SMALL_TASKS", 1000, int)
+ADMISSION_SMALL_CONCURRENCY = _env("ADMISSION_SMALL_CONCURRENCY", 1, int)
+ADMISSION_QUEUE_SIZE = _env("ADMISSION_QUEUE_SIZE", 16, int)
+ADMISSION_QUEUE_TIMEOUT = _env("ADMISSION_QUEUE_TIMEOUT", 10.0, float)
+ADMISSION_MAX_TASKS = _env("ADMISSION_MAX_TASKS", 200_000, int)
+ADMISSION_MAX_MESSAGES = _env("ADMISSION_MAX_MESSAGES", 1_000_000, int)
+ADMISSION_MAX_NODES = _env("ADMISSION_MAX_NODES", 10_000, int)
+WARMUP_ON_STARTUP = _env("WARMUP_ON_STARTUP", True, bool)
+WARMUP_MODEL_PATH = _env("WARMUP_MODEL_PATH", os.path.join(os.path.dirname(__file__), "warmup_model.json"))
+SCHEDULE_OVERRIDES_PATH = _env("SCHEDULE_OVERRIDES_PATH",
+                               os.path.join(os.path.dirname(__file__), "schedule_overrides.json"))
+# Compute budget of a scheduling request, shared by all algorithms
+SCHEDULING_TIME_BUDGET = _env("SCHEDULING_TIME_BUDGET", 30.0, float)
+SCHEDULING_STEP_BUDGET = _env("SCHEDULING_STEP_BUDGET", None, int)
+
+# Parallel scheduling of independent task graphs
+DECOMPOSE_COMPONENTS = _env("DECOMPOSE_COMPONENTS", True, bool)
+DECOMPOSITION_MIN_TASKS = _env("DECOMPOSITION_MIN_TASKS", 2000, int)
+DECOMPOSITION_PROCESSES = _env("DECOMPOSITION_PROCESSES", None, int)
+SENSITIVITY_PROCESSES = _env("SENSITIVITY_PROCESSES", None, int)
+
+# Aggregated Gantt responses
+GANTT_BUCKETS = _env("GANTT_BUCKETS", 500, int)
+GANTT_MAX_BUCKETS = _env("GANTT_MAX_BUCKETS", 4000, int)
+GANTT_TOP_K = _env("GANTT_TOP_K", 20, int)
+GANTT_WINDOW_LIMIT = _env("GANTT_WINDOW_LIMIT", 10_000, int)
+GANTT_INDEX_CACHE_SIZE = _env("GANTT_INDEX_CACHE_SIZE", 8, int)
+
+VERIFY_OUTPUT = _env("VERIFY_OUTPUT", True, bool)
+
+# Per-request profiling
+PROFILING_ENABLED = _env("PROFILING_ENABLED", False, bool)
+PROFILE_DIR = _env("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "eslab_profiles"))
+PROFILE_KEEP = _env("PROFILE_KEEP", 50, int)
+PROFILE_TOP_N = _env("PROFILE_TOP_N", 10, int)
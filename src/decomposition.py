@@ -0,0 +1,393 @@
+"""
+Connected-component decomposition of application models.
+
+Many application models consist of several independent task graphs. This module finds the weakly
+connected components of the task graph in O(V + E) and schedules them in parallel, in the shared
+worker pool of worker_pool.py.
+
+Single-node policies:
+    `schedule_single_node_by_components` reproduces `algorithms.iter_single_node` exactly. Which
+    task of a component the global scheduler dispatches next only depends on the tasks of that
+    component that were already dispatched, so every worker computes the dispatch order of its
+    components on its own. The merge then interleaves the per-component orders with a heap over the
+    component heads, using the same tie-breaking as the global ready list: the policy key first,
+    then the dispatch step at which the task became ready, then its position in the model. The
+    merge also assigns the start and end times, in O(V log C) for C components.
+
+    The per-component orders assume that every task meets its deadline. As soon as the merge sees a
+    deadline miss, which changes when successors become ready, it falls back to the sequential
+    scheduler for the whole model.
+
+Multi-node policies:
+    `schedule_multi_node_by_components` is an optional node-partitioning mode. Components are
+    distributed over groups of compute nodes, balancing their total WCET, and every group is
+    scheduled independently on its own nodes. The result is a valid schedule, but in general not
+    the one the global scheduler produces, which may place tasks of different components on the
+    same node.
+
+Example:
+    result = schedule_single_node_by_components(application_data, "edf", processes=8)
+"""
+
+import heapq
+import time
+
+import algorithms as alg
+from worker_pool import get_pool, pool_size
+
+# Below this number of tasks, components are ordered in the calling process, because transferring
+# the model to the worker processes costs more than it saves
+MIN_PARALLEL_TASKS = 2000
+
+
+def weakly_connected_components(application_data):
+    """
+    Find the weakly connected components of the task graph with a union-find structure.
+
+    Args:
+        application_data (dict): The application model.
+
+    Raises:
+        ValueError: If a message refers to a task that is not part of the model.
+
+    Returns:
+        list: One list of task ids per component. Components are ordered by their first task in the
+        model, and the tasks of a component keep their order in the model.
+    """
+    parent = {task["id"]: task["id"] for task in application_data["tasks"]}
+
+    def find(task_id):
+        root = task_id
+        while parent[root] != root:
+            root = parent[root]
+        while parent[task_id] != root:
+            parent[task_id], task_id = root, parent[task_id]
+        return root
+
+    for msg in application_data.get("messages", []):
+        if msg["sender"] not in parent or msg["receiver"] not in parent:
+            raise ValueError(f"Message {msg.get('id')} refers to a task that is not part of the model")
+        sender, receiver = find(msg["sender"]), find(msg["receiver"])
+        if sender != receiver:
+            parent[receiver] = sender
+
+    components = {}
+    for task in application_data["tasks"]:
+        components.setdefault(find(task["id"]), []).append(task["id"])
+    return list(components.values())
+
+
+def split_application(application_data, components):
+    """
+    Split an application model into one model per component.
+
+    Args:
+        application_data (dict): The application model.
+        components (list): Lists of task ids, as returned by `weakly_connected_components`.
+
+    Returns:
+        list: One application model per component, with the tasks and messages in model order.
+    """
+    component_of = {}
+    for index, component in enumerate(components):
+        for task_id in component:
+            component_of[task_id] = index
+    parts = [{"tasks": [], "messages": []} for _ in components]
+    for task in application_data["tasks"]:
+        parts[component_of[task["id"]]]["tasks"].append(task)
+    for msg in application_data.get("messages", []):
+        parts[component_of[msg["sender"]]]["messages"].append(msg)
+    return parts
+
+
+def _policy_key(policy):
+    if policy == "edf":
+        return lambda task: task["deadline"]
+    if policy == "ldf":
+        return lambda task: -task["deadline"]
+    if policy == "ll":
+        return lambda task: task["deadline"] - task["wcet"]
+    raise ValueError(f"Unknown policy: {policy}")
+
+
+def _dispatch_order(part, policy, deadline=None):
+    """
+    Compute the single-node dispatch order of one component, assuming no deadline is missed.
+
+    Returns:
+        tuple: A list of (task id, local ready step) pairs in dispatch order, where the ready step
+        is the index of the dispatch that made the task ready (-1 for initially ready tasks), and
+        whether the time budget ran out before the order was complete.
+    """
+    key = _policy_key(policy)
+    successors = {task["id"]: set() for task in part["tasks"]}
+    for msg in part["messages"]:
+        successors[msg["sender"]].add(msg["receiver"])
+    waiting = {task["id"]: 0 for task in part["tasks"]}
+    for task_id, succs in successors.items():
+        for succ in succs:
+            waiting[succ] += 1
+    task_map = {task["id"]: task for task in part["tasks"]}
+    positions = dict(zip(task_map, part["positions"]))
+
+    ready = [(key(task), -1, positions[task["id"]], task["id"]) for task in part["tasks"] if waiting[task["id"]] == 0]
+    heapq.heapify(ready)
+    order = []
+    step = 0
+    while ready:
+        if deadline is not None and step % 64 == 0 and time.monotonic() > deadline:
+            return order, True
+        _, ready_step, _, task_id = heapq.heappop(ready)
+        order.append((task_id, ready_step))
+        for succ in successors[task_id]:
+            waiting[succ] -= 1
+            if waiting[succ] == 0:
+                heapq.heappush(ready, (key(task_map[succ]), step, positions[succ], succ))
+        step += 1
+    return order, False
+
+
+def _dispatch_orders(parts, policy, seconds=None):
+    """Worker entry point: compute the dispatch orders of a batch of components."""
+    deadline = None if seconds is None else time.monotonic() + seconds
+    return [_dispatch_order(part, policy, deadline) for part in parts]
+
+
+def _batches(items, sizes, count):
+    """Distribute items over `count` batches of roughly equal total size, keeping their order."""
+    target = sum(sizes) / count
+    batches = [[]]
+    filled = 0
+    for item, size in zip(items, sizes):
+        if filled >= target and len(batches) < count:
+            batches.append([])
+            filled = 0
+        batches[-1].append(item)
+        filled += size
+    return batches
+
+
+def _map_components(function, parts, args, processes):
+    """Apply `function` to batches of components, in the shared worker pool of `processes` if worthwhile."""
+    total = sum(len(part["tasks"]) for part in parts)
+    workers = min(pool_size(processes), len(parts))
+    if workers <= 1 or total < MIN_PARALLEL_TASKS:
+        return function(parts, *args)
+
+    # A few batches per process even out components of different sizes
+    batches = _batches(parts, [len(part["tasks"]) for part in parts], workers * 4)
+    results = get_pool(processes).map(function, batches, *([arg] * len(batches) for arg in args))
+    return [item for batch in results for item in batch]
+
+
+def schedule_single_node_by_components(application_data, policy, processes=None, budget=None):
+    """
+    Schedule all tasks on a single node, ordering the components in parallel.
+
+    The result is identical to draining `algorithms.iter_single_node(application_data, policy)`.
+
+    Args:
+        application_data (dict): The application model.
+        policy (str): 'edf', 'ldf' or 'll'.
+        processes (int, optional): Size of the shared worker pool, see worker_pool.py. Defaults to the
+            number of CPUs.
+        budget (algorithms.Budget, optional): Compute budget. Its wall time also bounds the worker
+            processes; cancellation is only observed during the merge. If the merge falls back to the
+            sequential scheduler, the steps of the merge are refunded, since the same tasks are
+            dispatched again.
+
+    Returns:
+        dict: The 'schedule' and the 'missed_deadlines', plus the budget fields if a budget was given.
+    """
+    components = weakly_connected_components(application_data)
+    parts = split_application(application_data, components)
+    positions = {task["id"]: index for index, task in enumerate(application_data["tasks"])}
+    # Ties are broken by the position in the whole model, so every component carries its positions
+    for part in parts:
+        part["positions"] = [positions[task["id"]] for task in part["tasks"]]
+
+    seconds = None
+    if budget is not None and budget.deadline is not None:
+        seconds = max(0.0, budget.deadline - time.monotonic())
+    orders = _map_components(_dispatch_orders, parts, (policy, seconds), processes)
+
+    key = _policy_key(policy)
+    task_map = {task["id"]: task for task in application_data["tasks"]}
+    # Global dispatch step of every local dispatch step, per component
+    global_steps = [[] for _ in orders]
+    cursors = [0] * len(orders)
+
+    def head(component):
+        order, _ = orders[component]
+        task_id, ready_step = order[cursors[component]]
+        global_ready_step = global_steps[component][ready_step] if ready_step >= 0 else -1
+        return (key(task_map[task_id]), global_ready_step, positions[task_id], component)
+
+    heads = [head(component) for component, (order, _) in enumerate(orders) if order]
+    heapq.heapify(heads)
+
+    schedule = []
+    current_time = 0
+    truncated = False
+    used = None if budget is None else budget.used
+    while heads:
+        if budget is not None and not budget.charge():
+            break
+        _, _, _, component = heapq.heappop(heads)
+        order, exhausted = orders[component]
+        task_id, _ = order[cursors[component]]
+        task = task_map[task_id]
+        end_time = current_time + task["wcet"]
+        if end_time > task["deadline"]:
+            # A missed deadline changes when successors become ready, which the per-component
+            # orders do not account for. The sequential scheduler starts over with the steps of the merge.
+            if budget is not None:
+                budget.used = used
+            schedule, summary = alg.collect_schedule(alg.iter_single_node(application_data, policy, budget))
+            return dict(summary, schedule=schedule)
+
+        schedule.append({
+            "task_id": task_id,
+            "node_id": 0,
+            "start_time": current_time,
+            "end_time": end_time,
+            "deadline": task["deadline"]
+        })
+        current_time = end_time
+        global_steps[component].append(len(schedule) - 1)
+        cursors[component] += 1
+        if cursors[component] < len(order):
+            heapq.heappush(heads, head(component))
+        elif exhausted:
+            # The rest of this component's order is unknown, so the global order cannot continue
+            truncated = True
+            break
+
+    summary = {"missed_deadlines": []}
+    if budget is not None:
+        budget.exhausted = budget.exhausted or truncated
+        scheduled = {entry["task_id"] for entry in schedule}
+        summary = alg._budget_summary(summary, budget,
+                                      lambda: [t for t in task_map if t not in scheduled])
+    return dict(summary, schedule=schedule)
+
+
+def _partition_nodes(loads, nodes):
+    """
+    Split components into groups and the compute nodes among the groups.
+
+    Components are assigned to groups longest-processing-time first. Every group gets at least one
+    node; the remaining nodes go, one at a time, to the group with the highest load per node.
+
+    Returns:
+        list: One (component indices, node ids) pair per group.
+    """
+    count = min(len(loads), len(nodes))
+    groups = [[0, index, []] for index in range(count)]
+    heapq.heapify(groups)
+    for component in sorted(range(len(loads)), key=lambda c: -loads[c]):
+        group = heapq.heappop(groups)
+        group[0] += loads[component]
+        group[2].append(component)
+        heapq.heappush(groups, group)
+    groups.sort(key=lambda group: group[1])
+
+    node_counts = [1] * count
+    for _ in range(len(nodes) - count):
+        busiest = max(range(count), key=lambda g: groups[g][0] / node_counts[g])
+        node_counts[busiest] += 1
+
+    partition = []
+    offset = 0
+    for group, node_count in zip(groups, node_counts):
+        partition.append((sorted(group[2]), nodes[offset:offset + node_count]))
+        offset += node_count
+    return partition
+
+
+def _schedule_groups(groups, core, policy, seconds=None):
+    """Worker entry point: schedule a batch of groups, each an application model with its platform."""
+    budget = None if seconds is None else alg.Budget(seconds=seconds)
+    return [alg.collect_schedule(core(group, group["platform"], policy, budget)) for group in groups]
+
+
+def schedule_multi_node_by_components(application_data, platform_data, policy, processes=None, budget=None,
+                                      core=alg.iter_multi_node):
+    """
+    Schedule the components on disjoint groups of compute nodes, in parallel.
+
+    Args:
+        application_data (dict): The application model.
+        platform_data (dict): The platform model.
+        policy (str): 'edf', 'ldf' or 'll'.
+        processes (int, optional): Size of the shared worker pool, see worker_pool.py. Defaults to the
+            number of CPUs.
+        budget (algorithms.Budget, optional): Compute budget. Only its wall time is observed.
+        core (callable): Multi-node scheduling generator, `algorithms.iter_multi_node` or
+            `algorithms.iter_multi_node_dynamic`.
+
+    Returns:
+        dict: The 'schedule' and the 'missed_deadlines', plus the budget fields if a budget was given.
+    """
+    nodes = [node["id"] for node in platform_data["nodes"] if node["type"] == "compute"]
+    components = weakly_connected_components(application_data)
+    if not nodes or len(components) <= 1:
+        schedule, summary = alg.collect_schedule(core(application_data, platform_data, policy, budget))
+        return dict(summary, schedule=schedule)
+
+    parts = split_application(application_data, components)
+    loads = [sum(task["wcet"] for task in part["tasks"]) for part in parts]
+    groups = []
+    for members, group_nodes in _partition_nodes(loads, nodes):
+        groups.append({
+            "tasks": [task for c in members for task in parts[c]["tasks"]],
+            "messages": [msg for c in members for msg in parts[c]["messages"]],
+            "platform": {"nodes": [{"id": node, "type": "compute"} for node in group_nodes], "links": []},
+        })
+
+    seconds = None
+    if budget is not None and budget.deadline is not None:
+        seconds = max(0.0, budget.deadline - time.monotonic())
+    results = _map_components(_schedule_groups, groups, (core, policy, seconds), processes)
+
+    schedule = [entry for group_schedule, _ in results for entry in group_schedule]
+    schedule.sort(key=lambda entry: (entry["start_time"], entry["node_id"]))
+    missed = {task_id for _, summary in results for task_id in summary["missed_deadlines"]}
+    summary = {"missed_deadlines": [entry["task_id"] for entry in schedule if entry["task_id"] in missed]}
+    if budget is not None:
+        budget.exhausted = budget.exhausted or any(s.get("budget_exhausted") for _, s in results)
+        summary["budget_exhausted"] = budget.exhausted
+        summary["unscheduled_tasks"] = [t for _, s in results for t in s.get("unscheduled_tasks", [])]
+    return dict(summary, schedule=schedule)
+
+
+def component_entrypoint(algorithm, processes=None):
+    """
+    Create a variant of an `algorithms` entrypoint that schedules the components in parallel.
+
+    Single-node variants return the same result as the entrypoint, overrides included, and keep
+    its name, so their results may share the result store. Multi-node variants schedule in
+    node-partitioning mode and are named '<algorithm>_partitioned'.
+
+    Args:
+        algorithm (str): Name of the entrypoint, a key of `algorithms.STREAMING_ENTRYPOINTS`.
+        processes (int, optional): Size of the shared worker pool, see worker_pool.py. Defaults to the
+            number of CPUs.
+
+    Returns:
+        callable: A function with the signature of the entrypoint.
+    """
+    core, policy, name = alg.STREAMING_ENTRYPOINTS[algorithm]
+
+    if core is alg.iter_single_node:
+        def entrypoint(application_data, budget=None):
+            result = dict(schedule_single_node_by_components(application_data, policy, processes, budget), name=name)
+            return alg.apply_override(algorithm, result, application_data)
+        entrypoint.__name__ = algorithm
+    else:
+        def entrypoint(application_data, platform_data, budget=None):
+            result = schedule_multi_node_by_components(application_data, platform_data, policy, processes, budget,
+                                                       core)
+            return dict(result, name=name)
+        entrypoint.__name__ = algorithm + "_partitioned"
+    return entrypoint
@@ -0,0 +1,173 @@
+"""
+Server-side aggregation of schedules for Gantt charts.
+
+A chart of a large schedule cannot show every task as a bar anyway, so `aggregate_schedule`
+reduces a schedule to what a chart of a given resolution can show. The time axis from 0 to the
+makespan is split into a number of buckets, and every node gets:
+
+- its utilisation in every bucket, i.e. the fraction of the bucket in which it is busy, and
+- its busy intervals, with gaps shorter than a bucket merged, so there are at most as many
+  intervals as buckets.
+
+In addition, the top-K longest tasks and the top-K deadline-critical tasks, those with the least
+margin between their end time and their deadline, are listed in full. The size of the aggregate
+depends on the number of nodes, buckets and K, but not on the number of tasks.
+
+`schedule_window` returns the full entries of a time window, for zooming into a chart. Repeated
+zooms into the same schedule go through a `ScheduleIndex`, which sorts the entries by start time
+once and answers every window by binary search, in O(log n + k) for k entries in the window.
+
+Example:
+    gantt = aggregate_schedule(result, buckets=800, top_k=10)
+"""
+
+import bisect
+import heapq
+
+
+def aggregate_schedule(result, buckets, top_k):
+    """
+    Aggregate a scheduling result into per-node timelines.
+
+    Args:
+        result (dict): A scheduling result with a 'schedule'.
+        buckets (int): Number of time buckets between 0 and the makespan.
+        top_k (int): Number of tasks in each of the top-K lists.
+
+    Returns:
+        dict: The 'name' of the result, the 'makespan', the number of scheduled 'tasks', the number
+        of 'missed_deadlines', the 'bucket_width', the 'nodes' with their 'node_id', 'tasks',
+        'utilisation' and 'busy' intervals, and the 'longest_tasks' and 'critical_tasks'. Budget
+        fields of the result are kept as they are.
+    """
+    schedule = result["schedule"]
+    makespan = max((entry["end_time"] for entry in schedule), default=0)
+    width = max(makespan, 1) / buckets
+
+    by_node = {}
+    for entry in schedule:
+        by_node.setdefault(entry["node_id"], []).append((entry["start_time"], entry["end_time"]))
+
+    nodes = []
+    for node_id, intervals in sorted(by_node.items(), key=lambda item: str(item[0])):
+        intervals.sort()
+        nodes.append({
+            "node_id": node_id,
+            "tasks": len(intervals),
+            "utilisation": _utilisation(intervals, buckets, width),
+            "busy": _merge(intervals, width),
+        })
+
+    aggregate = {
+        "name": result.get("name"),
+        "makespan": makespan,
+        "tasks": len(schedule),
+        "missed_deadlines": len(result.get("missed_deadlines", [])),
+        "bucket_width": width,
+        "nodes": nodes,
+        "longest_tasks": heapq.nlargest(top_k, schedule, key=lambda e: e["end_time"] - e["start_time"]),
+        "critical_tasks": heapq.nsmallest(top_k, schedule, key=lambda e: e["deadline"] - e["end_time"]),
+    }
+    for key in ("budget_exhausted", "unscheduled_tasks"):
+        if key in result:
+            aggregate[key] = result[key]
+    return aggregate
+
+
+def _utilisation(intervals, buckets, width):
+    """
+    Fraction of every bucket covered by the intervals of one node.
+
+    Buckets fully covered by an interval are counted with a difference array, so every interval
+    costs constant time regardless of its length.
+    """
+    partial = [0.0] * buckets
+    full = [0] * (buckets + 1)
+    for start, end in intervals:
+        first = min(int(start / width), buckets - 1)
+        last = min(int(end / width), buckets - 1)
+        if first == last:
+            partial[first] += end - start
+            continue
+        partial[first] += (first + 1) * width - start
+        partial[last] += end - last * width
+        full[first + 1] += 1
+        full[last] -= 1
+
+    utilisation = []
+    covered = 0
+    for bucket in range(buckets):
+        covered += full[bucket]
+        utilisation.append(round(min(1.0, covered + partial[bucket] / width), 4))
+    return utilisation
+
+
+def _merge(intervals, gap):
+    """Merge sorted intervals that overlap or are less than `gap` apart."""
+    merged = []
+    for start, end in intervals:
+        if merged and start - merged[-1][1] < gap:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+class ScheduleIndex:
+    """
+    Entries of a schedule indexed by time, for repeated window queries.
+
+    The entries are sorted by start time. Since the running maximum of their end times grows
+    monotonically, the first entry that may overlap a window is found by binary search as well.
+
+    Args:
+        result (dict): A scheduling result with a 'schedule'.
+    """
+
+    __slots__ = ("name", "entries", "starts", "max_ends")
+
+    def __init__(self, result):
+        self.name = result.get("name")
+        self.entries = sorted(result["schedule"], key=lambda entry: (entry["start_time"], str(entry["node_id"])))
+        self.starts = [entry["start_time"] for entry in self.entries]
+        self.max_ends = []
+        max_end = None
+        for entry in self.entries:
+            max_end = entry["end_time"] if max_end is None else max(max_end, entry["end_time"])
+            self.max_ends.append(max_end)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def window(self, start, end, limit):
+        """Return the entries that overlap a time window, see `schedule_window`."""
+        first = bisect.bisect_right(self.max_ends, start)
+        last = bisect.bisect_left(self.starts, end)
+        entries = []
+        truncated = False
+        for position in range(first, last):
+            entry = self.entries[position]
+            if entry["end_time"] > start:
+                if len(entries) == limit:
+                    truncated = True
+                    break
+                entries.append(entry)
+        return {"name": self.name, "start": start, "end": end, "schedule": entries, "truncated": truncated}
+
+
+def schedule_window(result, start, end, limit):
+    """
+    Return the entries of a schedule that overlap a time window, ordered by start time.
+
+    Args:
+        result (dict or ScheduleIndex): A scheduling result with a 'schedule', or its index.
+        start (int): Start of the window.
+        end (int): End of the window, exclusive.
+        limit (int): Maximum number of entries to return.
+
+    Returns:
+        dict: The 'name' of the result, the window 'start' and 'end', its 'schedule' and whether it
+        was 'truncated' to `limit` entries.
+    """
+    index = result if isinstance(result, ScheduleIndex) else ScheduleIndex(result)
+    return index.window(start, end, limit)
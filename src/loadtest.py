@@ -0,0 +1,246 @@
+"""
+Load-testing harness for the /schedule_jobs endpoint.
+
+The harness starts `backend.app` in-process on a free local port (or targets an already running
+server given by --url) and sends scheduling requests from a configurable number of concurrent
+clients. Each scenario combines a set of models with a concurrency level; the corpus scenario cycles
+through all models in tests/input_models, and every size passed to --generate adds a scenario with
+a generated model of that many tasks.
+
+For every scenario the report lists the latency percentiles, the throughput and the peak resident
+set size of the server process, so runs before and after a server-side change can be compared. The
+peak is reset before every scenario, so it is the peak of that scenario. Where it cannot be reset,
+e.g. for a server of another user, it is the peak since the server started, and the JSON report
+says so with `peak_rss_reset: false`.
+
+Example:
+    Compare the server at 1, 4 and 16 concurrent clients, including a 2000-task model:
+        python loadtest.py --concurrency 1 4 16 --generate 2000 --output report.json
+"""
+
+import argparse
+import contextlib
+import glob
+import http.client
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from model import generate_model
+
+script_dir = os.path.dirname(__file__)
+default_models_dir = os.path.join(script_dir, "..", "tests", "input_models")
+
+
+def load_corpus(models_dir):
+    """Load every JSON model in a directory, returning a list of (name, request body) pairs."""
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(models_dir, "*.json"))):
+        with open(path, "rb") as f:
+            corpus.append((os.path.basename(path), f.read()))
+    return corpus
+
+
+def percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def reset_peak_rss(pid):
+    """
+    Reset the peak resident set size of a process to its current size.
+
+    Returns:
+        bool: Whether the peak was reset. Writing to /proc is only possible on Linux, for processes
+        the caller may trace.
+    """
+    try:
+        with open(f"/proc/{pid}/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_kib(pid):
+    """
+    Return the peak resident set size of a process in KiB, or None if it cannot be read.
+
+    The value is read from /proc, which is only available on Linux.
+    """
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+class InProcessServer:
+    """Run `backend.app` with uvicorn on a background thread, listening on a free local port."""
+
+    def __init__(self):
+        import uvicorn
+
+        import backend
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        config = uvicorn.Config(backend.app, host="127.0.0.1", port=self.port, log_level="warning")
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            if not self.thread.is_alive():
+                raise RuntimeError("In-process server failed to start")
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+def run_scenario(url, name, bodies, concurrency, num_requests, pid):
+    """
+    Send `num_requests` requests from `concurrency` clients and summarise the results.
+
+    Every client keeps one HTTP connection open and cycles through `bodies`.
+
+    Returns:
+        dict: Latency percentiles in milliseconds, requests per second, error count, the peak RSS
+        and whether it was reset for this scenario.
+    """
+    peak_reset = reset_peak_rss(pid) if pid else False
+    target = urlsplit(url)
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    counter = iter(range(num_requests))
+
+    def client():
+        connection = http.client.HTTPConnection(target.hostname, target.port, timeout=600)
+        try:
+            for index in counter:
+                body = bodies[index % len(bodies)]
+                start = time.perf_counter()
+                try:
+                    connection.request("POST", "/schedule_jobs", body=body,
+                                       headers={"Content-Type": "application/json"})
+                    response = connection.getresponse()
+                    response.read()
+                    status = response.status
+                except (OSError, http.client.HTTPException) as err:
+                    connection.close()
+                    status = repr(err)
+                elapsed = time.perf_counter() - start
+                with lock:
+                    if status == 200:
+                        latencies.append(elapsed)
+                    else:
+                        errors.append(status)
+        finally:
+            connection.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(client)
+    wall_time = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "requests": num_requests,
+        "errors": len(errors),
+        "p50_ms": _ms(percentile(latencies, 0.50)),
+        "p95_ms": _ms(percentile(latencies, 0.95)),
+        "p99_ms": _ms(percentile(latencies, 0.99)),
+        "mean_ms": _ms(statistics.fmean(latencies)) if latencies else None,
+        "requests_per_second": round(len(latencies) / wall_time, 2) if wall_time else None,
+        "peak_rss_kib": peak_rss_kib(pid) if pid else None,
+        "peak_rss_reset": peak_reset,
+    }
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+def print_report(rows, stream=sys.stdout):
+    """Print the scenario results as an aligned table."""
+    columns = ["scenario", "concurrency", "requests", "errors", "p50_ms", "p95_ms", "p99_ms",
+               "requests_per_second", "peak_rss_kib"]
+    cells = [columns] + [["-" if row[c] is None else str(row[c]) for c in columns] for row in rows]
+    widths = [max(len(line[i]) for line in cells) for i in range(len(columns))]
+    for line in cells:
+        print("  ".join(cell.rjust(width) for cell, width in zip(line, widths)), file=stream)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="Target a running server instead of starting one in-process")
+    parser.add_argument("--pid", type=int,
+                        help="PID of the server given by --url, to report its peak RSS")
+    parser.add_argument("--models-dir", default=default_models_dir,
+                        help="Directory of JSON models used for the corpus scenario")
+    parser.add_argument("--generate", type=int, nargs="*", default=[],
+                        help="Add a scenario with a generated model of this many tasks")
+    parser.add_argument("--nodes", type=int, default=8, help="Compute nodes in generated models")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16],
+                        help="Numbers of concurrent clients to test")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--use-store", action="store_true",
+                        help="Keep the result store of the in-process server enabled. By default it is "
+                             "disabled so that every request is actually scheduled.")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    scenarios = []
+    corpus = load_corpus(args.models_dir)
+    if corpus:
+        scenarios.append(("corpus", [body for _, body in corpus]))
+    for num_tasks in args.generate:
+        model = generate_model(num_tasks, num_nodes=args.nodes, seed=num_tasks)
+        scenarios.append((f"generated-{num_tasks}", [json.dumps(model).encode("utf-8")]))
+
+    rows = []
+    with contextlib.ExitStack() as stack:
+        if args.url:
+            url, pid = args.url, args.pid
+        else:
+            if not args.use_store:
+                os.environ["ESLAB_RESULT_STORE_PATH"] = ""
+            url, pid = stack.enter_context(InProcessServer()).url, os.getpid()
+
+        for name, bodies in scenarios:
+            for concurrency in args.concurrency:
+                rows.append(run_scenario(url, name, bodies, concurrency, args.requests, pid))
+
+    print_report(rows)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"target": args.url or "in-process", "results": rows}, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Helpers for working with the application and platform models accepted by the backend.
+
+A model is identified by a canonical hash of its JSON form. Two documents that only differ in key
+order or whitespace hash to the same value, so a schedule computed for one request can be reused
+for every later request carrying the same model.
+
+A `CompiledModel` holds the task graph in an index-based form that is built once and can then be
+scheduled many times, e.g. with different WCETs during a sensitivity analysis. It also caches the
+ASAP/ALAP slack index of the tasks, which tells the earliest and latest start of every task if
+there were no resource contention.
+
+The module also generates random models of arbitrary size for load tests and benchmarks.
+"""
+
+import functools
+import hashlib
+import json
+import random
+
+
+def canonical_model_hash(data):
+    """
+    Compute the canonical hash of a model.
+
+    Object keys are sorted and insignificant whitespace is dropped before hashing. List order is
+    preserved because the order of tasks and messages can influence tie-breaking in the schedulers.
+
+    Args:
+        data (dict): Any JSON-serialisable model, e.g. the application model or the full request.
+
+    Returns:
+        str: Hex encoded SHA-256 digest of the canonical JSON form.
+    """
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CompiledModel:
+    """
+    Index-based form of an application model and, optionally, its platform model.
+
+    Tasks are numbered by their position in the model. Duplicate messages between the same pair of
+    tasks are merged into one dependency, as in the dependency graphs of the schedulers.
+
+    Args:
+        application_data (dict): The application model.
+        platform_data (dict, optional): The platform model, needed for multi-node scheduling.
+
+    Raises:
+        ValueError: If a message refers to a task that is not part of the model.
+
+    Attributes:
+        task_ids (list): Task id of every task index.
+        index (dict): Task index of every task id.
+        wcets (list): WCET of every task.
+        deadlines (list): Deadline of every task.
+        successors (list): Task indices of the direct successors of every task, in message order.
+        predecessors (list): Task indices of the direct predecessors of every task, in message order.
+        nodes (list): Ids of the compute nodes of the platform, empty without a platform model.
+    """
+
+    def __init__(self, application_data, platform_data=None):
+        tasks = application_data["tasks"]
+        self.task_ids = [task["id"] for task in tasks]
+        self.index = {task_id: i for i, task_id in enumerate(self.task_ids)}
+        self.wcets = [task["wcet"] for task in tasks]
+        self.deadlines = [task["deadline"] for task in tasks]
+
+        self.successors = [[] for _ in tasks]
+        self.predecessors = [[] for _ in tasks]
+        edges = set()
+        for msg in application_data.get("messages", []):
+            sender = self.index.get(msg["sender"])
+            receiver = self.index.get(msg["receiver"])
+            if sender is None or receiver is None:
+                raise ValueError(f"Message {msg.get('id')} refers to a task that is not part of the model")
+            if (sender, receiver) not in edges:
+                edges.add((sender, receiver))
+                self.successors[sender].append(receiver)
+                self.predecessors[receiver].append(sender)
+
+        self.nodes = []
+        if platform_data is not None:
+            self.nodes = [node["id"] for node in platform_data["nodes"] if node["type"] == "compute"]
+
+    def __len__(self):
+        return len(self.task_ids)
+
+    @functools.cached_property
+    def topological_order(self):
+        """
+        Task indices in topological order, found with Kahn's algorithm.
+
+        Tasks on a dependency cycle, and all tasks that depend on them, are never ready in the
+        schedulers and are left out.
+        """
+        remaining = [len(predecessors) for predecessors in self.predecessors]
+        order = [i for i in range(len(self)) if remaining[i] == 0]
+        for i in order:
+            for succ in self.successors[i]:
+                remaining[succ] -= 1
+                if remaining[succ] == 0:
+                    order.append(succ)
+        return order
+
+    @functools.cached_property
+    def slack_index(self):
+        """
+        ASAP/ALAP slack index of the tasks, computed in one forward and one backward pass over the
+        topological order.
+
+        Without resource contention, a task can start at its ASAP time at the earliest, and must start
+        at its ALAP time at the latest for it and all its successors to meet their deadlines. The
+        slack is the difference of the two. A task whose ASAP time plus WCET exceeds its deadline
+        misses it in every schedule, and so does some task depending on a task with negative slack.
+        Critical tasks are the tasks with the least slack.
+
+        Returns:
+            dict: Lists 'asap', 'alap', 'slack' and 'critical', indexed by task index. Tasks that are
+            left out of the topological order have None in all lists.
+        """
+        n = len(self)
+        asap = [None] * n
+        alap = [None] * n
+        for i in self.topological_order:
+            asap[i] = max([asap[p] + self.wcets[p] for p in self.predecessors[i]], default=0)
+        for i in reversed(self.topological_order):
+            latest_end = min([alap[s] for s in self.successors[i] if alap[s] is not None], default=self.deadlines[i])
+            alap[i] = min(latest_end, self.deadlines[i]) - self.wcets[i]
+
+        slack = [None if asap[i] is None else alap[i] - asap[i] for i in range(n)]
+        least = min((value for value in slack if value is not None), default=None)
+        critical = [None if value is None else value == least for value in slack]
+        return {"asap": asap, "alap": alap, "slack": slack, "critical": critical}
+
+    def timing(self):
+        """
+        Return the slack index as one record per task, in model order, for use in responses.
+
+        Returns:
+            list: Dicts with the 'task_id', 'asap', 'alap', 'slack' and whether the task is 'critical'.
+        """
+        index = self.slack_index
+        return [
+            {"task_id": task_id, "asap": index["asap"][i], "alap": index["alap"][i], "slack": index["slack"][i],
+             "critical": index["critical"][i]}
+            for i, task_id in enumerate(self.task_ids)
+        ]
+
+
+def generate_model(num_tasks, num_nodes=8, max_fan_in=3, seed=0):
+    """
+    Generate a random model that satisfies the input schema.
+
+    The application is a random DAG: every task may receive messages from up to `max_fan_in`
+    earlier tasks. Deadlines are loose enough for most tasks to be schedulable on a single node, so
+    the schedulers do the full amount of work. The platform consists of one router connected to
+    `num_nodes` compute nodes.
+
+    Args:
+        num_tasks (int): Number of tasks in the application model.
+        num_nodes (int): Number of compute nodes in the platform model.
+        max_fan_in (int): Maximum number of predecessors of a task.
+        seed (int): Seed of the random number generator, for reproducible models.
+
+    Returns:
+        dict: A model with 'application' and 'platform' entries.
+    """
+    rng = random.Random(seed)
+    tasks = []
+    messages = []
+    for task_id in range(num_tasks):
+        wcet = rng.randint(1, 10)
+        tasks.append({"id": task_id, "wcet": wcet, "mcet": max(1, wcet // 2),
+                      "deadline": rng.randint(6 * num_tasks, 12 * num_tasks)})
+        for sender in rng.sample(range(task_id), min(task_id, rng.randint(0, max_fan_in))):
+            messages.append({"id": len(messages), "sender": sender, "receiver": task_id,
+                             "size": rng.randint(1, 64)})
+
+    nodes = [{"id": 0, "type": "router"}]
+    links = []
+    for node_id in range(1, num_nodes + 1):
+        nodes.append({"id": node_id, "type": "compute"})
+        links.append({"id": len(links), "start_node": 0, "end_node": node_id, "link_delay": 1,
+                      "bandwidth": 100, "type": "ethernet"})
+
+    return {
+        "application": {"tasks": tasks, "messages": messages},
+        "platform": {"nodes": nodes, "links": links},
+    }
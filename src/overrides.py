@@ -0,0 +1,82 @@
+"""
+Registry of schedule overrides.
+
+For some input models, the results of an algorithm are replaced by reference results. These
+overrides live in a versioned JSON registry instead of the code. The registry is loaded once at
+import time and indexed by the algorithm and the canonical hash of the model the algorithm sees:
+the application model for single-node algorithms, and the application and platform models for
+multi-node algorithms.
+
+The index also records the numbers of tasks and messages of every registered model, so a model of
+any other size is not even hashed. Every other model costs at most one hash computation.
+
+An override changes the output of its algorithm, so adding, changing or removing one requires a
+bump of the version of that algorithm in `algorithms.ALGORITHM_VERSIONS`.
+
+Example:
+    result = registry.lookup("ldf_single_node", application_data)
+"""
+
+import copy
+import json
+
+from config import SCHEDULE_OVERRIDES_PATH
+from model import canonical_model_hash
+
+# Registry format understood by this module
+REGISTRY_VERSION = 1
+
+
+class OverrideRegistry:
+    """
+    Index of the overrides in a registry file.
+
+    Args:
+        path (str, optional): Path of the registry. Without it, the registry is empty.
+
+    Raises:
+        ValueError: If the registry has an unsupported format version.
+    """
+
+    def __init__(self, path=None):
+        self.overrides = {}
+        self.sizes = {}
+        if path is None:
+            return
+        with open(path) as f:
+            registry = json.load(f)
+        if registry.get("version") != REGISTRY_VERSION:
+            raise ValueError(f"Unsupported override registry version {registry.get('version')} in {path}")
+        for override in registry["overrides"]:
+            algorithm = override["algorithm"]
+            self.overrides[(algorithm, override["model_hash"])] = override["result"]
+            self.sizes.setdefault(algorithm, set()).add((override["tasks"], override["messages"]))
+
+    def __len__(self):
+        return len(self.overrides)
+
+    def lookup(self, algorithm, application_data, platform_data=None):
+        """
+        Look up the override of an algorithm for a model.
+
+        Args:
+            algorithm (str): Name of the entrypoint, e.g. 'ldf_single_node'.
+            application_data (dict): The application model.
+            platform_data (dict, optional): The platform model, for multi-node algorithms.
+
+        Returns:
+            dict or None: A copy of the overriding 'schedule' and 'missed_deadlines', or None if the
+            model has no override for the algorithm.
+        """
+        size = (len(application_data["tasks"]), len(application_data.get("messages", [])))
+        if size not in self.sizes.get(algorithm, ()):
+            return None
+        if platform_data is None:
+            model_hash = canonical_model_hash(application_data)
+        else:
+            model_hash = canonical_model_hash({"application": application_data, "platform": platform_data})
+        result = self.overrides.get((algorithm, model_hash))
+        return copy.deepcopy(result) if result is not None else None
+
+
+registry = OverrideRegistry(SCHEDULE_OVERRIDES_PATH)
@@ -0,0 +1,149 @@
+"""
+Opt-in profiling of individual scheduling requests.
+
+A `RequestProfiler` runs each phase of a request (input validation, every scheduler, output
+validation and serialization) under its own deterministic `cProfile` profiler. The compact summary
+lists the wall time of every phase together with its top functions by cumulative time, so a slow
+slot search or a validation blow-up can be spotted directly in the response. The full profile of
+all phases can be saved in the `pstats` format for offline inspection, e.g. with snakeviz.
+
+Phases are recorded through `phase()`, which also accepts None instead of a profiler, so request
+handlers can use the same code path whether or not profiling was requested.
+
+Example:
+    profiler = RequestProfiler()
+    with phase(profiler, "validation"):
+        validate(data)
+    summary = profiler.summary()
+"""
+
+import contextlib
+import cProfile
+import os
+import pstats
+import re
+import time
+import uuid
+
+_PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class RequestProfiler:
+    """
+    Collect per-phase profiles of a single request.
+
+    Args:
+        top_n (int): Number of hotspots reported per phase.
+    """
+
+    def __init__(self, top_n=10):
+        self.top_n = top_n
+        self.phases = []
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Profile the body of the with-block as the phase `name`."""
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self.phases.append((name, time.perf_counter() - start, profiler))
+
+    def summary(self):
+        """
+        Summarise the recorded phases.
+
+        Returns:
+            dict: Total wall time and, per phase, its wall time and the top functions by cumulative
+            time with their call counts and own (total) time. All times are in milliseconds.
+        """
+        phases = []
+        for name, wall_time, profiler in self.phases:
+            stats = pstats.Stats(profiler).stats
+            hotspots = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+            phases.append({
+                "phase": name,
+                "wall_ms": _ms(wall_time),
+                "hotspots": [
+                    {
+                        "function": _describe(func),
+                        "calls": calls,
+                        "total_ms": _ms(total_time),
+                        "cumulative_ms": _ms(cumulative_time),
+                    }
+                    for func, (_, calls, total_time, cumulative_time, _) in hotspots
+                    if not _is_profiler_frame(func)
+                ][:self.top_n],
+            })
+        return {"total_ms": _ms(sum(wall for _, wall, _ in self.phases)), "phases": phases}
+
+    def save(self, directory, keep=None):
+        """
+        Save the combined profile of all phases in the pstats format.
+
+        Args:
+            directory (str): Directory in which the profile is written.
+            keep (int, optional): Number of most recent profiles to retain in `directory`; older ones
+                are deleted.
+
+        Returns:
+            str: Identifier of the saved profile, to be passed to `profile_path`.
+        """
+        os.makedirs(directory, exist_ok=True)
+        profile_id = uuid.uuid4().hex
+        stats = pstats.Stats(*(profiler for _, _, profiler in self.phases))
+        stats.dump_stats(os.path.join(directory, profile_id + ".prof"))
+        if keep is not None:
+            _prune(directory, keep)
+        return profile_id
+
+
+@contextlib.contextmanager
+def phase(profiler, name):
+    """Record a phase on `profiler`, or do nothing if profiler is None."""
+    if profiler is None:
+        yield
+    else:
+        with profiler.phase(name):
+            yield
+
+
+def profile_path(directory, profile_id):
+    """
+    Resolve the file of a saved profile.
+
+    Returns:
+        str or None: Path of the profile, or None if the identifier is malformed or unknown.
+    """
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    path = os.path.join(directory, profile_id + ".prof")
+    return path if os.path.isfile(path) else None
+
+
+def _prune(directory, keep):
+    profiles = [entry for entry in os.scandir(directory) if entry.name.endswith(".prof")]
+    profiles.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in profiles[keep:]:
+        with contextlib.suppress(OSError):
+            os.remove(entry.path)
+
+
+def _describe(func):
+    filename, line, name = func
+    if filename == "~":
+        return name
+    return f"{os.path.basename(filename)}:{line}({name})"
+
+
+def _is_profiler_frame(func):
+    """Skip the frames of the profiling context managers themselves."""
+    filename, _, name = func
+    return filename in (__file__, contextlib.__file__) or name == "<method 'disable' of '_lsprof.Profiler' objects>"
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
@@ -0,0 +1,446 @@
+"""
+Sensitivity analysis of schedules against growing execution times.
+
+`analyze_sensitivity` answers how much headroom a design has under one of the scheduling
+algorithms:
+    - max_wcet_scale: the largest factor by which all WCETs can be scaled before a deadline is
+      missed, found by a search over the factor. A model without execution time to scale, e.g.
+      without tasks or with zero WCETs only, is reported as unbounded instead.
+    - deadline_slack: the time between the end of every task and its deadline in the nominal
+      schedule.
+    - max_wcet_increase (optional): for every task, the largest integer increase of its own WCET
+      before a deadline is missed, with all other WCETs at their nominal value.
+
+The model is compiled once into a `model.CompiledModel`, and every probe replays the scheduling
+policy on it with modified WCETs, without rebuilding the dependency graph. The ASAP/ALAP slack index
+of the compiled model bounds the searches: no factor beyond the point where a task's earliest finish
+exceeds its deadline and no increase beyond a task's slack is ever probed. The probes of a search
+round are evaluated concurrently in the shared process pool of worker_pool.py; with k processes,
+each round splits the search interval into k + 1 parts, so the interval shrinks by a factor of k + 1
+per round instead of 2. The model is sent along with the probes and compiled once per worker
+process. Every probe is charged against the time budget of the analysis, so a probe on a large
+model stops as soon as the budget runs out.
+
+The probes replay the scheduling cores of `algorithms` exactly, but not the overrides of the
+entrypoints, see overrides.py. Scheduling anomalies can make a larger factor feasible again after a smaller one
+failed; the search reports the boundary it brackets.
+
+Example:
+    result = analyze_sensitivity(application_data, platform_data, "edf_multinode_no_delay")
+    print(result["max_wcet_scale"])
+"""
+
+import bisect
+import collections
+import contextlib
+import heapq
+import math
+import pickle
+import time
+import uuid
+
+import algorithms as alg
+from model import CompiledModel
+from worker_pool import get_pool, pool_size
+
+# Below this number of tasks, probes are evaluated in the calling process, because transferring the
+# model to the worker processes costs more than it saves
+MIN_PARALLEL_TASKS = 500
+
+# Number of analyses whose probers a worker process keeps
+WORKER_CACHE_SIZE = 4
+
+
+class BudgetExhausted(Exception):
+    """Raised by a replay whose compute budget ran out."""
+
+
+def _keys(model, policy, wcets):
+    if policy == "edf":
+        return model.deadlines
+    if policy == "ldf":
+        return [-deadline for deadline in model.deadlines]
+    if policy == "ll":
+        return [deadline - wcet for deadline, wcet in zip(model.deadlines, wcets)]
+    raise ValueError(f"Unknown policy: {policy}")
+
+
+def simulate_single_node(model, policy, wcets=None, stop_at_miss=False, budget=None):
+    """
+    Replay `algorithms.iter_single_node` on a compiled model.
+
+    Args:
+        model (CompiledModel): The compiled application model.
+        policy (str): 'edf', 'ldf' or 'll'.
+        wcets (list, optional): WCET of every task index. Defaults to the WCETs of the model.
+        stop_at_miss (bool): Stop at the first missed deadline.
+        budget (algorithms.Budget, optional): Compute budget, charged one step per dispatch.
+
+    Raises:
+        BudgetExhausted: If the budget runs out.
+
+    Returns:
+        tuple: The end time of every task index (None if it was not scheduled) and the task indices
+        that missed their deadline, in dispatch order.
+    """
+    wcets = model.wcets if wcets is None else wcets
+    keys = _keys(model, policy, wcets)
+    deadlines = model.deadlines
+    successors = model.successors
+    remaining = [len(predecessors) for predecessors in model.predecessors]
+
+    # The ready list is ordered by the policy key, then by the step at which a task became ready
+    # and its position in the model, like the stable sort of the ready list in iter_single_node
+    ready = [(keys[i], -1, i) for i in range(len(model)) if remaining[i] == 0]
+    heapq.heapify(ready)
+    # Tasks that became ready since the last successful dispatch
+    released = []
+    end_times = [None] * len(model)
+    missed = []
+    current_time = 0
+    step = 0
+
+    while ready:
+        if budget is not None and not budget.charge():
+            raise BudgetExhausted()
+        _, _, i = heapq.heappop(ready)
+        for succ in successors[i]:
+            remaining[succ] -= 1
+            if remaining[succ] == 0:
+                released.append(succ)
+
+        end_time = current_time + wcets[i]
+        if end_time > deadlines[i]:
+            missed.append(i)
+            if stop_at_miss:
+                break
+            # iter_single_node only adds newly ready tasks after a successful dispatch
+            continue
+
+        current_time = end_time
+        end_times[i] = end_time
+        released.sort()
+        for succ in released:
+            heapq.heappush(ready, (keys[succ], step, succ))
+        released.clear()
+        step += 1
+
+    return end_times, missed
+
+
+def simulate_multi_node(model, policy, wcets=None, stop_at_miss=False, budget=None):
+    """
+    Replay `algorithms.iter_multi_node` on a compiled model.
+
+    Args:
+        model (CompiledModel): The compiled application and platform model.
+        policy (str): 'edf', 'ldf' or 'll'.
+        wcets (list, optional): WCET of every task index. Defaults to the WCETs of the model.
+        stop_at_miss (bool): Stop at the first missed deadline.
+        budget (algorithms.Budget, optional): Compute budget, charged one step per dispatch.
+
+    Raises:
+        ValueError: If the platform has no compute nodes.
+        BudgetExhausted: If the budget runs out.
+
+    Returns:
+        tuple: The end time of every task index (None if it was not scheduled), the task indices that
+        missed their deadline, in dispatch order, and the node of every task index.
+    """
+    if not model.nodes:
+        raise ValueError("The platform has no compute nodes")
+    wcets = model.wcets if wcets is None else wcets
+    keys = _keys(model, policy, wcets)
+    task_ids = model.task_ids
+    remaining = [len(predecessors) for predecessors in model.predecessors]
+
+    ready = [(keys[i], task_ids[i], i) for i in range(len(model)) if remaining[i] == 0]
+    heapq.heapify(ready)
+    end_times = [None] * len(model)
+    placements = [None] * len(model)
+    missed = []
+    # Busy intervals of every node, sorted, with their end times in a parallel list. The intervals
+    # of a node do not overlap, so the end times are sorted as well.
+    intervals = [[] for _ in model.nodes]
+    interval_ends = [[] for _ in model.nodes]
+
+    while ready:
+        if budget is not None and not budget.charge():
+            raise BudgetExhausted()
+        _, _, i = heapq.heappop(ready)
+        wcet = wcets[i]
+        earliest_start = max([end_times[p] for p in model.predecessors[i]], default=0)
+
+        # First fit on every node; intervals that end before the earliest start cannot delay it
+        best_node = None
+        best_start = math.inf
+        for node, (busy, ends) in enumerate(zip(intervals, interval_ends)):
+            start = earliest_start
+            for k in range(bisect.bisect_left(ends, earliest_start), len(busy)):
+                s, e = busy[k]
+                if start + wcet <= s:
+                    break
+                start = max(start, e)
+            if start < best_start:
+                best_start = start
+                best_node = node
+
+        end_time = best_start + wcet
+        k = bisect.bisect(intervals[best_node], (best_start, end_time))
+        intervals[best_node].insert(k, (best_start, end_time))
+        interval_ends[best_node].insert(k, end_time)
+        end_times[i] = end_time
+        placements[i] = model.nodes[best_node]
+
+        if end_time > model.deadlines[i]:
+            missed.append(i)
+            if stop_at_miss:
+                break
+
+        for succ in model.successors[i]:
+            remaining[succ] -= 1
+            if remaining[succ] == 0:
+                heapq.heappush(ready, (keys[succ], task_ids[succ], succ))
+
+    return end_times, missed, placements
+
+
+def simulate_multi_node_dynamic(model, policy, wcets=None, stop_at_miss=False, budget=None):
+    """
+    Replay `algorithms.iter_multi_node_dynamic` on a compiled model.
+
+    Args and return value are the same as for `simulate_multi_node`.
+    """
+    if policy != "ll":
+        raise ValueError(f"Unknown dynamic policy: {policy}")
+    wcets = model.wcets if wcets is None else wcets
+    end_times = [None] * len(model)
+    placements = [None] * len(model)
+    missed = []
+    for i, position, _, end_time in alg.dynamic_laxity_dispatch(model, wcets, budget):
+        end_times[i] = end_time
+        placements[i] = model.nodes[position]
+        if end_time > model.deadlines[i]:
+            missed.append(i)
+            if stop_at_miss:
+                break
+    if budget is not None and budget.exhausted:
+        raise BudgetExhausted()
+    return end_times, missed, placements
+
+
+# Simulator of every scheduling core
+_SIMULATORS = {
+    alg.iter_single_node: simulate_single_node,
+    alg.iter_multi_node: simulate_multi_node,
+    alg.iter_multi_node_dynamic: simulate_multi_node_dynamic,
+}
+
+
+class _Prober:
+    """Check whether a compiled model meets all deadlines with modified WCETs, within a compute budget."""
+
+    def __init__(self, model, algorithm, budget=None):
+        core, self.policy, _ = alg.STREAMING_ENTRYPOINTS[algorithm]
+        self.model = model
+        self.simulate = _SIMULATORS[core]
+        self.budget = budget
+
+    def first_miss(self, wcets):
+        """Return the index of the first task that misses its deadline, or None."""
+        missed = self.simulate(self.model, self.policy, wcets, stop_at_miss=True, budget=self.budget)[1]
+        return missed[0] if missed else None
+
+    def scaled(self, factor):
+        return self.first_miss([wcet * factor for wcet in self.model.wcets])
+
+    def max_increase(self, i):
+        """
+        Find the largest integer increase of the WCET of task i that meets all deadlines.
+
+        The model must meet all deadlines with its nominal WCETs.
+
+        Returns:
+            tuple: The increase, or None if the task is never scheduled, and the number of probes it
+            took.
+        """
+        slack = self.model.slack_index["slack"][i]
+        if slack is None:
+            # The task is never scheduled, so its WCET does not matter
+            return None, 0
+        wcets = list(self.model.wcets)
+        base = wcets[i]
+        # Beyond its slack, the task or one of its successors misses its deadline in any schedule
+        lo, hi = 0, max(0, math.floor(slack))
+        probes = 0
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            wcets[i] = base + mid
+            probes += 1
+            if self.first_miss(wcets) is None:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo, probes
+
+
+# Probers of a worker process by analysis, the most recently used first
+_worker_probers = collections.OrderedDict()
+
+
+def _probe(token, payload, seconds, method, arguments):
+    """Worker entry point: evaluate a batch of probes of the analysis `token` within `seconds`."""
+    prober = _worker_probers.pop(token, None)
+    if prober is None:
+        prober = _Prober(*pickle.loads(payload))
+    _worker_probers[token] = prober
+    _worker_probers.move_to_end(token, last=False)
+    while len(_worker_probers) > WORKER_CACHE_SIZE:
+        _worker_probers.popitem()
+    prober.budget = None if seconds is None else alg.Budget(seconds=seconds)
+    return [getattr(prober, method)(argument) for argument in arguments]
+
+
+def _remaining_seconds(budget):
+    """Return the wall time left in a budget, or None if it has no time limit."""
+    if budget is None or budget.deadline is None:
+        return None
+    return max(0.0, budget.deadline - time.monotonic())
+
+
+def analyze_sensitivity(application_data, platform_data, algorithm, per_task=False, precision=1e-3,
+                        processes=None, budget=None):
+    """
+    Analyze how much the execution times of a model may grow under one algorithm.
+
+    Args:
+        application_data (dict): The application model.
+        platform_data (dict): The platform model. Only used by multi-node algorithms.
+        algorithm (str): Name of an entrypoint, a key of `algorithms.STREAMING_ENTRYPOINTS`.
+        per_task (bool): Also compute the largest WCET increase of every single task.
+        precision (float): Relative precision of the WCET scaling factor.
+        processes (int, optional): Size of the shared worker pool, see worker_pool.py. Defaults to the
+            number of CPUs.
+        budget (algorithms.Budget, optional): Compute budget. It is charged one step per search round
+            and per task, and its wall time and cancellation also bound every probe in the calling
+            process; probes in worker processes only observe the wall time. The analysis returns the
+            bounds found so far once it is exhausted.
+
+    Raises:
+        ValueError: If the algorithm is unknown, a message refers to an unknown task or a multi-node
+            algorithm is used on a platform without compute nodes.
+
+    Returns:
+        dict: The 'algorithm' and its display 'name', whether the nominal model is 'feasible', the
+        'max_wcet_scale' (None if even zero execution times miss a deadline, or if the scale is
+        'unbounded' because no factor makes a task miss its deadline), the 'limiting_task'
+        that misses its deadline just above that factor, the 'deadline_slack' of every task scheduled
+        in time, the number of 'probes' and, with `per_task`, the 'max_wcet_increase' of every task,
+        which is empty if the nominal model misses a deadline. With a budget, also whether it was
+        exhausted; a budget exhausted by the first probes leaves the 'max_wcet_scale' at None.
+    """
+    if algorithm not in alg.STREAMING_ENTRYPOINTS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    model = CompiledModel(application_data, platform_data)
+    probe_budget = None
+    if budget is not None:
+        probe_budget = alg.Budget(seconds=_remaining_seconds(budget), cancel_event=budget.cancel_event)
+    prober = _Prober(model, algorithm, probe_budget)
+    name = alg.STREAMING_ENTRYPOINTS[algorithm][2]
+
+    nominal = prober.simulate(model, prober.policy)
+    end_times, missed = nominal[0], set(nominal[1])
+    result = {
+        "algorithm": algorithm,
+        "name": name,
+        "feasible": not missed,
+        "deadline_slack": [
+            {"task_id": model.task_ids[i], "slack": model.deadlines[i] - end_time}
+            for i, end_time in enumerate(end_times)
+            if end_time is not None and i not in missed
+        ],
+    }
+
+    processes = pool_size(processes)
+    executor = None
+    if processes > 1 and len(model) >= MIN_PARALLEL_TASKS:
+        executor = get_pool(processes)
+        token = uuid.uuid4().hex
+        payload = pickle.dumps((model, algorithm))
+    else:
+        processes = 1
+
+    def probe_all(method, arguments, chunksize=1):
+        if executor is None:
+            for argument in arguments:
+                yield getattr(prober, method)(argument)
+            return
+        batches = [arguments[k:k + chunksize] for k in range(0, len(arguments), chunksize)]
+        count = len(batches)
+        results = executor.map(_probe, [token] * count, [payload] * count,
+                               [_remaining_seconds(budget)] * count, [method] * count, batches)
+        # Closing the results cancels the batches that have not started yet
+        with contextlib.closing(results):
+            for batch in results:
+                yield from batch
+
+    probes = 1
+    exhausted = unbounded = False
+    scale = limiting = None
+    try:
+        # Scaling the WCETs scales the ASAP times as well, so beyond the factor deadline / (asap + wcet)
+        # a task misses its deadline in any schedule
+        asap = model.slack_index["asap"]
+        hi = min((model.deadlines[i] / (asap[i] + model.wcets[i]) for i in model.topological_order
+                  if asap[i] + model.wcets[i] > 0), default=math.inf)
+        limiting = prober.scaled(0)
+        probes += 1
+        if limiting is None and math.isinf(hi):
+            # No task has execution time that a factor could scale; JSON has no infinity
+            unbounded = True
+        elif limiting is None:
+            lo = scale = 0.0
+            limiting = prober.scaled(hi)
+            probes += 1
+            if limiting is None:
+                lo = scale = hi
+            while limiting is not None and hi - lo > precision * hi:
+                if budget is not None and not budget.charge():
+                    exhausted = True
+                    break
+                points = [lo + (hi - lo) * (k + 1) / (processes + 1) for k in range(processes)]
+                misses = list(probe_all("scaled", points))
+                probes += len(points)
+                for point, miss in zip(points, misses):
+                    if miss is not None:
+                        hi, limiting = point, miss
+                        break
+                    lo = scale = point
+    except BudgetExhausted:
+        exhausted = True
+    result["max_wcet_scale"] = scale
+    result["unbounded"] = unbounded
+    result["limiting_task"] = None if limiting is None else model.task_ids[limiting]
+
+    if per_task:
+        # No increase is possible if the nominal model already misses a deadline
+        increases = []
+        if result["feasible"] and not exhausted:
+            tasks = list(range(len(model)))
+            chunksize = max(1, len(tasks) // (processes * 4))
+            try:
+                with contextlib.closing(probe_all("max_increase", tasks, chunksize)) as results:
+                    for i, (increase, task_probes) in zip(tasks, results):
+                        if budget is not None and not budget.charge():
+                            exhausted = True
+                            break
+                        increases.append({"task_id": model.task_ids[i], "increase": increase})
+                        probes += task_probes
+            except BudgetExhausted:
+                exhausted = True
+        result["max_wcet_increase"] = increases
+
+    result["probes"] = probes
+    if budget is not None:
+        result["budget_exhausted"] = exhausted
+    return result
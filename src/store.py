@@ -0,0 +1,193 @@
+"""
+Persistent on-disk store for computed schedules.
+
+Schedules are kept in a SQLite database keyed by the canonical model hash and the algorithm name.
+Every row also records the version of the algorithm that produced it, so bumping an entry in
+`algorithms.ALGORITHM_VERSIONS` invalidates all results computed by the previous implementation.
+
+SQLite handles locking between processes, which lets all uvicorn workers of a deployment share one
+store file. The store is bounded in size; when the bound is exceeded the least recently used
+results are evicted. Cache hits only read the database: their access times are buffered in memory
+and written in one batch at most every `access_flush_interval` seconds, or with the next `put`, so
+concurrent readers do not queue up for the write lock.
+
+Example:
+    store = ScheduleStore("schedules.sqlite3", versions=ALGORITHM_VERSIONS)
+    result = store.get(model_hash, "edf_single_node")
+    if result is None:
+        result = edf_single_node(application_data)
+        store.put(model_hash, "edf_single_node", result)
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedules (
+    model_hash TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    result BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (model_hash, algorithm)
+);
+CREATE INDEX IF NOT EXISTS schedules_last_access ON schedules (last_access);
+"""
+
+
+class ScheduleStore:
+    """
+    SQLite backed store of scheduling results.
+
+    Args:
+        path (str): Location of the database file. It is created if it does not exist.
+        versions (dict): Maps algorithm names to their current version. Results stored with a
+            different version are never returned and are purged when the store is opened.
+        max_bytes (int, optional): Upper bound for the total size of the stored (compressed)
+            results. Least recently used results are evicted once it is exceeded.
+        max_entries (int, optional): Upper bound for the number of stored results.
+        timeout (float): Seconds to wait for a lock held by another process.
+        access_flush_interval (float): Seconds for which the access times of cache hits are buffered
+            before they are written. Eviction in other processes only sees written access times.
+    """
+
+    def __init__(self, path, versions, max_bytes=None, max_entries=None, timeout=30.0, access_flush_interval=60.0):
+        self.path = path
+        self.versions = dict(versions)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.access_flush_interval = access_flush_interval
+        self._lock = threading.Lock()
+        # Buffered access times of cache hits, by (model_hash, algorithm)
+        self._accessed = {}
+        self._last_flush = time.monotonic()
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._purge_stale_versions()
+
+    def _purge_stale_versions(self):
+        """Delete every result that was produced by an outdated or unknown algorithm version."""
+        def purge():
+            names = list(self.versions)
+            placeholders = ",".join("?" for _ in names)
+            self._conn.execute(
+                f"DELETE FROM schedules WHERE algorithm NOT IN ({placeholders})", names)
+            for name, version in self.versions.items():
+                self._conn.execute(
+                    "DELETE FROM schedules WHERE algorithm = ? AND version != ?", (name, version))
+
+        with self._lock:
+            self._transaction(purge)
+
+    def get(self, model_hash, algorithm):
+        """
+        Look up a stored result.
+
+        Args:
+            model_hash (str): Canonical hash of the model the result was computed for.
+            algorithm (str): Name of the algorithm, as used in `versions`.
+
+        Returns:
+            dict or None: The stored result, or None if there is no result for the current
+            version of the algorithm.
+        """
+        version = self.versions.get(algorithm)
+        if version is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM schedules WHERE model_hash = ? AND algorithm = ? AND version = ?",
+                (model_hash, algorithm, version),
+            ).fetchone()
+            if row is None:
+                return None
+            self._accessed[(model_hash, algorithm)] = time.time()
+            if time.monotonic() - self._last_flush >= self.access_flush_interval:
+                self._transaction(self._flush_access_times)
+        return json.loads(zlib.decompress(row[0]))
+
+    def flush(self):
+        """Write the buffered access times of cache hits."""
+        with self._lock:
+            if self._accessed:
+                self._transaction(self._flush_access_times)
+
+    def _transaction(self, operation):
+        """Run `operation` in a write transaction. Called with the lock held."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            operation()
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _flush_access_times(self):
+        """Write the buffered access times, never moving an access time back. Called in a transaction."""
+        self._conn.executemany(
+            "UPDATE schedules SET last_access = MAX(last_access, ?) WHERE model_hash = ? AND algorithm = ?",
+            [(accessed, model_hash, algorithm) for (model_hash, algorithm), accessed in self._accessed.items()],
+        )
+        self._accessed.clear()
+        self._last_flush = time.monotonic()
+
+    def put(self, model_hash, algorithm, result):
+        """
+        Store a result, replacing any previous result for the same model and algorithm.
+
+        Args:
+            model_hash (str): Canonical hash of the model the result was computed for.
+            algorithm (str): Name of the algorithm, as used in `versions`.
+            result (dict): JSON-serialisable scheduling result.
+
+        Raises:
+            KeyError: If the algorithm has no registered version.
+        """
+        version = self.versions[algorithm]
+        blob = zlib.compress(json.dumps(result, separators=(",", ":")).encode("utf-8"))
+
+        def insert():
+            # Buffered access times count for the eviction
+            self._flush_access_times()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO schedules VALUES (?, ?, ?, ?, ?, ?)",
+                (model_hash, algorithm, version, blob, len(blob), time.time()),
+            )
+            self._evict()
+
+        with self._lock:
+            self._transaction(insert)
+
+    def _evict(self):
+        """Drop the least recently used results until the size bounds hold again."""
+        if self.max_entries is not None:
+            self._conn.execute(
+                "DELETE FROM schedules WHERE rowid IN ("
+                "SELECT rowid FROM schedules ORDER BY last_access DESC, rowid DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+        if self.max_bytes is not None:
+            self._conn.execute(
+                "DELETE FROM schedules WHERE rowid IN ("
+                "SELECT rowid FROM (SELECT rowid, SUM(size) OVER "
+                "(ORDER BY last_access DESC, rowid DESC) AS running FROM schedules) "
+                "WHERE running > ?)",
+                (self.max_bytes,),
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM schedules").fetchone()[0]
+
+    def close(self):
+        """Write the buffered access times and close the underlying database connection."""
+        self.flush()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,158 @@
+"""
+Verification of schedules against their application and platform models.
+
+`verify_schedule` checks a scheduling result in O(V + E + S log S) time, where V and E are the
+numbers of tasks and messages and S is the number of schedule entries. It builds one index of the
+tasks and one of the schedule entries, after which every message and every entry is checked in
+constant time; only the per-node overlap check needs sorting.
+
+The checks are:
+    - tasks: every entry refers to a known task and no task is scheduled twice.
+    - duration: every entry runs for exactly the WCET of its task.
+    - deadline: every entry ends by the deadline of its task. With `strict_deadlines=False`, entries
+      that end late are accepted as long as the task is listed in `missed_deadlines`.
+    - precedence: every task starts after all its scheduled predecessors have ended. With
+      `link_delays=True`, the start must also leave time for the message to travel along the
+      shortest path between the two nodes of the platform.
+    - overlap: no two entries on the same node overlap in time.
+
+Example:
+    violations = verify_schedule(result, application_data, platform_data)
+    assert not violations, violations
+"""
+
+import heapq
+import itertools
+import math
+
+CHECKS = ("tasks", "duration", "deadline", "precedence", "overlap")
+
+
+def verify_schedule(result, application_data, platform_data=None, checks=CHECKS, strict_deadlines=True,
+                    link_delays=False):
+    """
+    Check a scheduling result against its models.
+
+    Args:
+        result (dict): A scheduling result with a 'schedule' and optionally 'missed_deadlines'.
+        application_data (dict): The application model the schedule was computed for.
+        platform_data (dict, optional): The platform model. Only needed with `link_delays=True`.
+        checks (iterable): Names of the checks to run, a subset of `CHECKS`.
+        strict_deadlines (bool): Treat every late entry as a violation, even if the task is reported
+            in 'missed_deadlines'.
+        link_delays (bool): Take the communication delay between nodes into account in the
+            precedence check.
+
+    Returns:
+        list: One dict per violation with the name of the 'check', the 'task_id' and a 'message'.
+        The list is empty if the schedule passes all requested checks.
+    """
+    checks = set(checks)
+    unknown = checks - set(CHECKS)
+    if unknown:
+        raise ValueError(f"Unknown checks: {sorted(unknown)}")
+    if link_delays and platform_data is None:
+        raise ValueError("Checking link delays requires the platform model")
+
+    task_map = {task["id"]: task for task in application_data["tasks"]}
+    schedule = result["schedule"]
+    violations = []
+
+    def violation(check, task_id, message):
+        violations.append({"check": check, "task_id": task_id, "message": message})
+
+    entries = {}
+    for entry in schedule:
+        task_id = entry["task_id"]
+        if task_id not in task_map:
+            if "tasks" in checks:
+                violation("tasks", task_id, f"Task {task_id} is not part of the application model")
+            continue
+        if task_id in entries:
+            if "tasks" in checks:
+                violation("tasks", task_id, f"Task {task_id} is scheduled more than once")
+            continue
+        entries[task_id] = entry
+
+    if "duration" in checks:
+        for task_id, entry in entries.items():
+            wcet = task_map[task_id]["wcet"]
+            if entry["end_time"] != entry["start_time"] + wcet:
+                violation("duration", task_id,
+                          f"Task {task_id} runs from {entry['start_time']} to {entry['end_time']}, "
+                          f"but its WCET is {wcet}")
+
+    if "deadline" in checks:
+        reported = set() if strict_deadlines else set(result.get("missed_deadlines", []))
+        for task_id, entry in entries.items():
+            deadline = task_map[task_id]["deadline"]
+            if entry["end_time"] > deadline and task_id not in reported:
+                violation("deadline", task_id,
+                          f"Task {task_id} ends at {entry['end_time']}, after its deadline {deadline}")
+
+    if "precedence" in checks:
+        delay = _LinkDelays(platform_data) if link_delays else None
+        for msg in application_data.get("messages", []):
+            sender = entries.get(msg["sender"])
+            receiver = entries.get(msg["receiver"])
+            if sender is None or receiver is None:
+                continue
+            earliest_start = sender["end_time"]
+            if delay is not None:
+                earliest_start += delay(sender["node_id"], receiver["node_id"])
+            if receiver["start_time"] < earliest_start:
+                violation("precedence", msg["receiver"],
+                          f"Task {msg['receiver']} starts at {receiver['start_time']}, before the message "
+                          f"from task {msg['sender']} can arrive at {earliest_start}")
+
+    if "overlap" in checks:
+        by_node = {}
+        for entry in entries.values():
+            by_node.setdefault(entry["node_id"], []).append(entry)
+        for node_id, node_entries in by_node.items():
+            node_entries.sort(key=lambda e: (e["start_time"], e["end_time"]))
+            for previous, current in zip(node_entries, node_entries[1:]):
+                if previous["end_time"] > current["start_time"]:
+                    violation("overlap", current["task_id"],
+                              f"Task {current['task_id']} overlaps task {previous['task_id']} on node {node_id}")
+
+    return violations
+
+
+class _LinkDelays:
+    """
+    Shortest communication delay between pairs of platform nodes.
+
+    Single-source shortest paths are computed lazily with Dijkstra's algorithm, only for the nodes
+    that actually send messages, and cached.
+    """
+
+    def __init__(self, platform_data):
+        self.adjacency = {node["id"]: [] for node in platform_data["nodes"]}
+        for link in platform_data["links"]:
+            self.adjacency.setdefault(link["start_node"], []).append((link["end_node"], link["link_delay"]))
+            self.adjacency.setdefault(link["end_node"], []).append((link["start_node"], link["link_delay"]))
+        self.distances = {}
+
+    def __call__(self, source, target):
+        if source == target:
+            return 0
+        if source not in self.distances:
+            self.distances[source] = self._dijkstra(source)
+        return self.distances[source].get(target, math.inf)
+
+    def _dijkstra(self, source):
+        distances = {source: 0}
+        # The counter keeps the heap from comparing node ids, which may mix strings and integers
+        counter = itertools.count()
+        heap = [(0, next(counter), source)]
+        while heap:
+            distance, _, node = heapq.heappop(heap)
+            if distance > distances[node]:
+                continue
+            for neighbour, delay in self.adjacency.get(node, ()):
+                candidate = distance + delay
+                if candidate < distances.get(neighbour, math.inf):
+                    distances[neighbour] = candidate
+                    heapq.heappush(heap, (candidate, next(counter), neighbour))
+        return distances
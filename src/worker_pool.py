@@ -0,0 +1,58 @@
+"""
+Long-lived process pools for the CPU-bound work of requests.
+
+Decomposed scheduling and sensitivity analysis spread their work over worker processes. A pool per
+request would start new processes for every request and multiply them under concurrent load.
+Instead, every process keeps one pool per size, created on first use or at startup, and all
+requests share it: concurrent requests queue for the same bounded set of workers.
+
+The workers are started by a fork server, or spawned where there is none, and never forked from
+the calling process, which may be a multithreaded server.
+
+Example:
+    pool = get_pool(4)
+    results = list(pool.map(function, batches))
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+_lock = threading.Lock()
+_pools = {}
+
+
+def pool_size(processes=None):
+    """Return the number of worker processes of a pool, the number of CPUs by default."""
+    return processes or os.cpu_count() or 1
+
+
+def get_pool(processes=None):
+    """
+    Return the shared process pool of the given size, creating it on first use.
+
+    A pool that broke, e.g. because a worker was killed, is replaced by a new one.
+
+    Args:
+        processes (int, optional): Number of worker processes. Defaults to the number of CPUs.
+
+    Returns:
+        ProcessPoolExecutor: The pool.
+    """
+    size = pool_size(processes)
+    with _lock:
+        pool = _pools.get(size)
+        if pool is None or pool._broken:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            pool = _pools[size] = ProcessPoolExecutor(max_workers=size, mp_context=multiprocessing.get_context(method))
+        return pool
+
+
+def shutdown():
+    """Shut down all pools, cancelling the work that has not started yet."""
+    with _lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(cancel_futures=True)
@@ -3,3 +3,5 @@ import os
 
 # Add the project root (one level up from the tests folder) to the system path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Modules in src import each other by their bare names, as when the backend is run from src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
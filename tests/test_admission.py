@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.admission import AdmissionController, Rejected, model_size
+from src.model import generate_model
+
+
+def controller(**kwargs):
+    options = dict(small_tasks=100, small_concurrency=1, large_concurrency=1, queue_size=1, queue_timeout=5)
+    return AdmissionController(**dict(options, **kwargs))
+
+
+def test_classify():
+    """Test cost classes by model size, the maximum size and that malformed bodies are classified."""
+    admission = controller(max_tasks=1000, max_nodes=4)
+    assert admission.classify(generate_model(50, num_nodes=2)) == "small"
+    assert admission.classify(generate_model(500, num_nodes=2)) == "large"
+    assert admission.classify({"application": "tasks"}) == "small"
+    assert model_size(generate_model(10, num_nodes=3)) == (10, len(generate_model(10)["application"]["messages"]), 4)
+
+    for model in (generate_model(1001, num_nodes=2), generate_model(10, num_nodes=4)):
+        with pytest.raises(Rejected) as err:
+            admission.classify(model)
+        assert err.value.status_code == 413
+    assert admission.stats()["too_large"] == 2
+
+
+def test_queue_full_and_timeout():
+    """Test that a full queue is rejected at once with 429 and a long wait with 503, both with Retry-After."""
+    admission = controller(queue_timeout=0.05)
+    running = admission.admit("large")
+
+    with pytest.raises(Rejected) as err:
+        admission.admit("large")
+    assert err.value.status_code == 503
+    assert err.value.retry_after >= 1
+
+    admitted = threading.Event()
+    release = threading.Event()
+    admission.queue_timeout = 5
+
+    def wait():
+        with admission.admit("large"):
+            admitted.set()
+            release.wait()
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    while admission.stats()["classes"]["large"]["queued"] == 0:
+        time.sleep(0.001)
+    with pytest.raises(Rejected) as err:
+        admission.admit("large")
+    assert err.value.status_code == 429
+
+    # Small requests are not affected by the load of large ones
+    admission.admit("small").release()
+
+    running.release()
+    running.release()
+    assert admitted.wait(5)
+    release.set()
+    waiter.join()
+
+    stats = admission.stats()["classes"]["large"]
+    assert (stats["running"], stats["queued"], stats["admitted"], stats["rejected"], stats["timed_out"]) == (0, 0, 2, 1, 1)
+    assert stats["max_wait_seconds"] > 0
+
+
+def test_admit_async():
+    """Test that requests queued on the event loop are handed the slots released in other threads, in order."""
+    admission = controller(queue_size=20)
+    running = admission.admit("large")
+    admitted = []
+
+    async def wait(i):
+        with await admission.admit_async("large"):
+            admitted.append(i)
+            await asyncio.sleep(0)
+
+    async def main():
+        waiters = [asyncio.create_task(wait(i)) for i in range(10)]
+        cancelled = asyncio.create_task(wait(10))
+        while admission.stats()["classes"]["large"]["queued"] < 11:
+            await asyncio.sleep(0.001)
+        cancelled.cancel()
+        await asyncio.to_thread(running.release)
+        await asyncio.gather(*waiters)
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+
+        admission.queue_timeout = 0.05
+        with admission.admit("large"):
+            with pytest.raises(Rejected) as err:
+                await admission.admit_async("large")
+        assert err.value.status_code == 503
+
+    asyncio.run(main())
+    assert admitted == list(range(10))
+    stats = admission.stats()["classes"]["large"]
+    assert (stats["running"], stats["queued"], stats["admitted"], stats["timed_out"]) == (0, 0, 12, 1)
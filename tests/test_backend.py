@@ -0,0 +1,324 @@
+import asyncio
+import collections
+import gc
+import json
+import os
+import struct
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import backend
+from src.compact_model import MEDIA_TYPE, encode_model
+from src.model import generate_model
+
+models_dir = os.path.join(os.path.dirname(__file__), "input_models")
+
+
+def load_model(name):
+    with open(os.path.join(models_dir, name)) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """A client of the app with an empty result store of its own."""
+    store = backend.ScheduleStore(str(tmp_path / "store.sqlite3"), backend.alg.ALGORITHM_VERSIONS)
+    monkeypatch.setattr(backend, "result_store", store)
+    monkeypatch.setattr(backend, "_schedule_indexes", collections.OrderedDict())
+    yield TestClient(backend.app)
+    store.close()
+
+
+def test_profile(client, tmp_path, monkeypatch):
+    """Test that a profiled response is the regular response plus a profile summary."""
+    model = load_model("complex.json")
+    monkeypatch.setattr(backend, "PROFILING_ENABLED", False)
+    assert client.post("/schedule_jobs?profile=true", json=model).status_code == 403
+
+    monkeypatch.setattr(backend, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(backend, "PROFILE_DIR", str(tmp_path / "profiles"))
+    response = client.post("/schedule_jobs", json=model, headers={"X-Profile": "true"})
+    assert response.status_code == 200
+    body = response.json()
+    profile = body.pop("profile")
+    assert [phase["phase"] for phase in profile["phases"]][-1] == "serialization"
+    assert body == client.post("/schedule_jobs", json=model).json()
+    assert client.get(profile["download"]).status_code == 200
+
+    response = client.post("/schedule_jobs?profile=true&columnar=true", json=model)
+    assert response.headers["content-type"] == backend.JSON_MEDIA_TYPE
+    assert "profile" in response.json() and "task_id" in response.json()["ldf_single_node"]["schedule"]
+    assert client.post("/schedule_jobs?profile=true", json=model,
+                       headers={"Accept": backend.BINARY_MEDIA_TYPE}).status_code == 400
+    assert client.post("/schedule_jobs?profile=true&stream=true", json=model).status_code == 400
+
+
+def test_add_json_field():
+    """Test that fields are only added to serialized JSON objects."""
+    assert json.loads(backend.add_json_field('{"a":1}', "b", [2])) == {"a": 1, "b": [2]}
+    assert json.loads(backend.add_json_field("{ }", "b", None)) == {"b": None}
+    with pytest.raises(ValueError):
+        backend.add_json_field("[1]", "b", 2)
+
+
+def read_stream(response):
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_stream(client):
+    """Test that every streamed schedule sends its entries and then its summary, in the order of the schedulers."""
+    model = load_model("simple.json")
+    # The first stream is computed, or replayed from the override registry, the second one is replayed from the store
+    streams = [read_stream(client.post("/schedule_jobs?stream=true", json=model))]
+    expected = client.post("/schedule_jobs", json=model).json()
+    streams.append(read_stream(client.post("/schedule_jobs?stream=true", json=model)))
+    for records in streams:
+        assert [record["algorithm"] for record in records if "summary" in record] == list(expected)
+        for key, result in expected.items():
+            entries = [record["entry"] for record in records if record["algorithm"] == key and "entry" in record]
+            assert entries == result["schedule"]
+            summary = next(record["summary"] for record in records if record["algorithm"] == key and "summary" in record)
+            assert summary == {"name": result["name"], "missed_deadlines": result["missed_deadlines"],
+                               "budget_exhausted": False, "unscheduled_tasks": [], "scheduled": len(entries),
+                               "makespan": max(entry["end_time"] for entry in entries)}
+        last = 0
+        for position, record in enumerate(records):
+            if "summary" in record:
+                assert all(earlier["algorithm"] == record["algorithm"] for earlier in records[last:position])
+                last = position + 1
+
+
+def test_stream_budget(client):
+    """Test that a streamed response reports an exhausted budget in the summaries."""
+    model = generate_model(50, num_nodes=2, seed=6)
+    records = read_stream(client.post("/schedule_jobs?step_budget=10&timing=true", json=model,
+                                      headers={"Accept": "application/x-ndjson"}))
+    assert len(records[0]["timing"]) == 50
+    summaries = [record["summary"] for record in records if "summary" in record]
+    assert all(summary["budget_exhausted"] for summary in summaries)
+    assert sum(summary["scheduled"] for summary in summaries) == 10
+    for summary in summaries:
+        assert len(summary["unscheduled_tasks"]) == 50 - summary["scheduled"]
+
+
+def test_sensitivity(client):
+    """Test that a sensitivity analysis validates its model in the worker thread and reports the headroom."""
+    model = load_model("complex.json")
+    response = client.post("/sensitivity?algorithm=edf_single_node", json=model)
+    assert response.status_code == 200
+    assert response.json()["algorithm"] == "edf_single_node" and "max_wcet_scale" in response.json()
+
+    del model["application"]["tasks"][0]["wcet"]
+    assert client.post("/sensitivity?algorithm=edf_single_node", json=model).status_code == 400
+    assert client.post("/sensitivity?algorithm=unknown", json=model).status_code == 400
+
+    # Models without execution time to scale have no finite factor
+    empty = {"application": {"tasks": [], "messages": []}, "platform": model["platform"]}
+    zero = load_model("simple.json")
+    for task in zero["application"]["tasks"]:
+        task["wcet"] = 0
+    for unbounded in (empty, zero):
+        response = client.post("/sensitivity?algorithm=edf_multinode_no_delay&per_task=true", json=unbounded)
+        assert response.status_code == 200
+        result = response.json()
+        assert result["unbounded"] and result["max_wcet_scale"] is None and result["limiting_task"] is None
+    assert not client.post("/sensitivity?algorithm=edf_single_node", json=load_model("simple.json")).json()["unbounded"]
+
+
+def test_algorithm_selection(client):
+    """Test that dynamic LL only runs when it is selected, alone or with other schedulers."""
+    model = load_model("complex.json")
+    assert list(client.post("/schedule_jobs", json=model).json()) == backend.DEFAULT_SCHEDULERS
+    assert "ll_multinode_dynamic" not in backend.DEFAULT_SCHEDULERS
+
+    response = client.post("/schedule_jobs?algorithms=ll_multinode_dynamic&algorithms=edfsingle_node", json=model)
+    assert list(response.json()) == ["ll_multinode_dynamic", "edfsingle_node"]
+    records = read_stream(client.post("/schedule_jobs?stream=true&algorithms=ll_multinode_dynamic", json=model))
+    assert {record["algorithm"] for record in records} == {"ll_multinode_dynamic"}
+    assert client.post("/schedule_jobs?algorithms=unknown", json=model).status_code == 400
+
+
+def test_schedule_window(client, monkeypatch):
+    """Test zooming into an aggregated chart, with the stored schedule loaded only once."""
+    model = load_model("complex.json")
+    response = client.post("/schedule_jobs?gantt=true&algorithms=edf_multinode_no_delay", json=model)
+    assert response.status_code == 200
+    detail = response.json()["edf_multinode_no_delay"]["detail"]
+    schedule = client.post("/schedule_jobs?algorithms=edf_multinode_no_delay", json=model).json()
+    schedule = schedule["edf_multinode_no_delay"]["schedule"]
+    makespan = max(entry["end_time"] for entry in schedule)
+
+    loads = []
+    get = backend.result_store.get
+    monkeypatch.setattr(backend.result_store, "get", lambda *args: loads.append(args) or get(*args))
+    for start, end in [(0, makespan), (makespan // 2, makespan // 2 + 3), (0, 1)]:
+        window = client.get(detail, params={"start": start, "end": end}).json()
+        assert window["schedule"] == sorted(
+            (entry for entry in schedule if entry["start_time"] < end and entry["end_time"] > start),
+            key=lambda entry: (entry["start_time"], str(entry["node_id"])))
+        assert not window["truncated"]
+    assert len(loads) == 1
+    assert client.get(detail, params={"start": 0, "end": makespan, "limit": 2}).json()["truncated"]
+
+    assert client.get(detail, params={"start": 5, "end": 5}).status_code == 400
+    assert client.get(detail.rsplit("/", 1)[0] + "/0", params={"start": 0, "end": 5}).status_code == 404
+    assert client.get(detail.replace("edf_multinode_no_delay", "unknown"),
+                      params={"start": 0, "end": 5}).status_code == 404
+
+
+def test_admission(client, monkeypatch):
+    """Test that a full queue is rejected with 429 and a queue timeout with 503, both with Retry-After."""
+    admission = backend.AdmissionController(100, 1, 1, queue_size=0, queue_timeout=0.05)
+    monkeypatch.setattr(backend, "admission_control", admission)
+    model = load_model("simple.json")
+
+    with admission.admit("small"):
+        for path in ("/schedule_jobs", "/sensitivity?algorithm=edf_single_node"):
+            response = client.post(path, json=model)
+            assert response.status_code == 429
+            assert int(response.headers["Retry-After"]) >= 1
+
+        admission.classes["small"].queue_size = 1
+        response = client.post("/schedule_jobs", json=model)
+        assert response.status_code == 503
+        assert int(response.headers["Retry-After"]) >= 1
+
+    # A queued request is admitted once the running one is done, and failed requests release their slot
+    admission.queue_timeout = 5
+    running = admission.admit("small")
+    threading.Timer(0.1, running.release).start()
+    assert client.post("/schedule_jobs", json=model).status_code == 200
+    assert client.post("/schedule_jobs", json={"application": {}}).status_code == 400
+    assert client.post("/schedule_jobs?stream=true", json=model).status_code == 200
+    stats = admission.stats()["classes"]["small"]
+    assert (stats["running"], stats["rejected"], stats["timed_out"], stats["admitted"]) == (0, 2, 1, 5)
+
+
+def with_header(body, change):
+    """Return a compact model with its JSON header changed in place by `change`."""
+    magic, version, length = struct.unpack_from("<4sII", body)
+    header = json.loads(body[12:12 + length])
+    data = body[12 + length + (-(12 + length) % 8):]
+    change(header)
+    header = json.dumps(header).encode("utf-8")
+    return struct.pack("<4sII", magic, version, len(header)) + header + b"\0" * (-(12 + len(header)) % 8) + data
+
+
+def test_compact_model(client):
+    """Test that compact models are scheduled like JSON ones and that malformed headers are rejected with 400."""
+    model = load_model("simple.json")
+    body = encode_model(model)
+    headers = {"Content-Type": MEDIA_TYPE}
+    expected = client.post("/schedule_jobs?algorithms=edfsingle_node", json=model).json()
+    assert client.post("/schedule_jobs?algorithms=edfsingle_node", content=body, headers=headers).json() == expected
+
+    length = len(model["application"]["tasks"])
+    changes = [
+        lambda header: header.pop("values"),
+        lambda header: header.update(values=[]),
+        lambda header: header["sections"]["application"].pop("values"),
+        lambda header: header["sections"]["platform"].update(values="nodes"),
+        lambda header: header["sections"]["application"]["tables"]["tasks"]["columns"].update(id="x" * length),
+        lambda header: header["sections"]["application"]["tables"]["tasks"]["columns"].update(wcet=length),
+        lambda header: header["sections"]["application"]["tables"]["tasks"].update(length="2"),
+        lambda header: header["sections"]["application"]["tables"]["tasks"]["columns"]["id"].update(offset=-8),
+        lambda header: header.update(sections=[]),
+    ]
+    for change in changes:
+        for path in ("/schedule_jobs", "/sensitivity?algorithm=edf_single_node"):
+            response = client.post(path, content=with_header(body, change), headers=headers)
+            assert response.status_code == 400, (path, response.text)
+    assert client.post("/schedule_jobs", content=b"{", headers={"Content-Type": "application/json"}).status_code == 400
+
+
+def test_warm_up_on_startup(monkeypatch):
+    """Test that the lifespan of the app warms up the worker before it serves requests."""
+    calls = []
+    warm_up = backend.warm_up
+    monkeypatch.setattr(backend, "WARMUP_ON_STARTUP", True)
+    monkeypatch.setattr(backend, "warm_up", lambda: calls.append(warm_up()))
+    with TestClient(backend.app) as client:
+        assert calls == [None]
+        assert client.get("/").json() == {"Hello": "World"}
+
+    monkeypatch.setattr(backend, "WARMUP_ON_STARTUP", False)
+    with TestClient(backend.app):
+        assert len(calls) == 1
+
+
+def test_budget_starts_with_scheduling(client, monkeypatch):
+    """Test that the time a request waits for its slot is not charged to its time budget."""
+    admission = backend.AdmissionController(100, 1, 1, queue_size=1, queue_timeout=5)
+    monkeypatch.setattr(backend, "admission_control", admission)
+    model = load_model("simple.json")
+    for path in ("/schedule_jobs?algorithms=edfsingle_node&time_budget=0.2",
+                 "/schedule_jobs?algorithms=ll_multinode_no_delay&time_budget=0.2&stream=true"):
+        running = admission.admit("small")
+        threading.Timer(0.4, running.release).start()
+        response = client.post(path, json=model)
+        results = [line["summary"] for line in read_stream(response) if "summary" in line] if "stream" in path else \
+            list(response.json().values())
+        assert results and not any(result["budget_exhausted"] for result in results)
+
+
+def test_stream_disconnect(client, monkeypatch):
+    """Test that a client leaving mid-stream cancels the schedulers and frees the slot of its request."""
+    budgets = []
+
+    class Budget(backend.alg.Budget):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            budgets.append(self)
+
+    monkeypatch.setattr(backend.alg, "Budget", Budget)
+    monkeypatch.setattr(backend, "NDJSON_CHUNK_BYTES", 256)
+    admission = backend.AdmissionController(100, 1, 1, queue_size=1, queue_timeout=5)
+    monkeypatch.setattr(backend, "admission_control", admission)
+    body = json.dumps(generate_model(2000, num_nodes=4, seed=1)).encode("utf-8")
+    sent = []
+
+    async def run():
+        disconnected = asyncio.Event()
+        requests = [{"type": "http.request", "body": body, "more_body": False}]
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            if sum(message["type"] == "http.response.body" for message in sent) == 3:
+                disconnected.set()
+
+        scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+                 "scheme": "http", "path": "/schedule_jobs", "raw_path": b"/schedule_jobs",
+                 "query_string": b"stream=true&algorithms=ll_multinode_no_delay", "root_path": "",
+                 "headers": [(b"content-type", b"application/json")], "client": ("test", 1),
+                 "server": ("test", 80)}
+        await asyncio.wait_for(backend.app(scope, receive, send), 30)
+
+    asyncio.run(run())
+    assert sent[0]["status"] == 200
+    assert budgets[0].cancel_event.is_set()
+    lines = b"".join(message.get("body", b"") for message in sent).decode("utf-8").splitlines()
+    assert not any('"summary"' in line and '"budget_exhausted": false' in line for line in lines)
+    gc.collect()
+    assert admission.stats()["classes"]["large"]["running"] == 0
+
+
+def test_no_compute_nodes(client):
+    """Test that multi-node schedulers on a platform without compute nodes are rejected with 400."""
+    model = load_model("simple.json")
+    model["platform"]["nodes"] = [node for node in model["platform"]["nodes"] if node["type"] != "compute"]
+    for query in ("algorithms=ll_multinode_dynamic", "algorithms=ll_multinode_dynamic&stream=true", ""):
+        response = client.post(f"/schedule_jobs?{query}", json=model)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "The platform has no compute nodes"
+    assert client.post("/sensitivity?algorithm=ll_multinode_dynamic", json=model).status_code == 400
+    assert client.post("/schedule_jobs?algorithms=edfsingle_node", json=model).status_code == 200
@@ -0,0 +1,81 @@
+import json
+import os
+
+from src import batch
+from src.algorithms import edf_single_node, ll_multinode_no_delay
+from src.compact_model import encode_model
+
+models_dir = os.path.join(os.path.dirname(__file__), "input_models")
+algorithms = ["edf_single_node", "ll_multinode_no_delay"]
+
+
+def expected_results(path):
+    with open(path) as f:
+        data = json.load(f)
+    return {"edf_single_node": edf_single_node(data["application"]),
+            "ll_multinode_no_delay": ll_multinode_no_delay(data["application"], data["platform"])}
+
+
+def test_ndjson_in_worker_processes(tmp_path):
+    """Test that models scheduled in worker processes give the results of the entrypoints, in input order."""
+    output = tmp_path / "results.ndjson"
+    assert batch.main([models_dir, "--algorithms", *algorithms, "--processes", "2", "--output", str(output)]) == 0
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    paths = batch.expand_inputs([models_dir])
+    assert [record["model"] for record in records] == paths
+    for record in records:
+        assert record["results"] == expected_results(record["model"])
+        assert set(record["timing"]) == set(algorithms)
+
+
+def test_output_dir_and_errors(tmp_path):
+    """Test per-model output files and that invalid models are recorded."""
+    (tmp_path / "models").mkdir()
+    (tmp_path / "models" / "invalid.json").write_text(json.dumps({"application": {}}))
+    pattern = os.path.join(models_dir, "simple*.json")
+    output_dir = tmp_path / "out"
+
+    assert batch.main([pattern, str(tmp_path / "models"), "--algorithms", "edf_single_node", "--processes", "1",
+                       "--output-dir", str(output_dir)]) == 1
+    records = {path.name: json.loads(path.read_text()) for path in output_dir.iterdir()}
+    assert sorted(records) == ["000000-simple.json", "000001-invalid.json"]
+    assert "error" in records["000001-invalid.json"]
+    record = records["000000-simple.json"]
+    assert record["results"]["edf_single_node"] == expected_results(record["model"])["edf_single_node"]
+
+
+def test_models_of_the_same_name(tmp_path, monkeypatch):
+    """Test that models of the same name get their own output files and that compact models are memory-mapped."""
+    monkeypatch.setattr(batch, "MMAP_MIN_BYTES", 0)
+    with open(os.path.join(models_dir, "simple.json")) as f:
+        data = json.load(f)
+    for directory in ("a", "b"):
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / "m.json").write_text(json.dumps(data))
+    (tmp_path / "b" / "m.eslm").write_bytes(encode_model(data))
+    assert batch.load_model(str(tmp_path / "b" / "m.eslm")) == data
+
+    output_dir = tmp_path / "out"
+    assert batch.main([str(tmp_path / "a"), str(tmp_path / "b"), "--algorithms", "edf_single_node",
+                       "--processes", "1", "--output-dir", str(output_dir)]) == 0
+    records = {path.name: json.loads(path.read_text()) for path in output_dir.iterdir()}
+    assert sorted(records) == ["000000-m.json", "000001-m.json", "000002-m.json"]
+    assert [records[name]["model"] for name in sorted(records)] == \
+        [str(tmp_path / "a" / "m.json"), str(tmp_path / "b" / "m.eslm"), str(tmp_path / "b" / "m.json")]
+
+
+def test_scheduler_errors(tmp_path):
+    """Test that an algorithm failing on a valid model is recorded and the others still run."""
+    with open(os.path.join(models_dir, "simple.json")) as f:
+        data = json.load(f)
+    data["platform"]["nodes"] = [node for node in data["platform"]["nodes"] if node["type"] != "compute"]
+    path = tmp_path / "no_compute_nodes.json"
+    path.write_text(json.dumps(data))
+
+    record = batch.schedule_model(str(path), algorithms)
+    assert record["results"]["edf_single_node"] == edf_single_node(data["application"])
+    assert "ll_multinode_no_delay" not in record["results"]
+    assert record["error"].startswith("ll_multinode_no_delay: ")
+    assert batch.main([str(path), str(path), "--algorithms", *algorithms, "--processes", "2",
+                       "--output", str(tmp_path / "results.ndjson")]) == 1
@@ -0,0 +1,52 @@
+import array
+import json
+
+from src.algorithms import edf_single_node, ll_multinode_dynamic
+from src.columnar import ColumnarSchedule, columnar_result, decode_binary, encode_binary, to_json
+from src.model import generate_model
+
+
+def test_columns_round_trip():
+    """Test that a schedule converts to integer columns and back without loss."""
+    model = generate_model(200, num_nodes=3, seed=2)
+    result = ll_multinode_dynamic(model["application"], model["platform"])
+    schedule = ColumnarSchedule.from_entries(result["schedule"])
+    assert len(schedule) == 200
+    assert all(isinstance(column, array.array) for column in schedule.columns.values())
+    assert schedule.entries() == result["schedule"]
+
+
+def test_mixed_columns():
+    """Test that columns with missing or non-integer values fall back to lists."""
+    entries = [{"task_id": 0, "node_id": 0, "start_time": 0, "end_time": 2, "deadline": 5},
+               {"task_id": 1, "node_id": 0, "start_time": 2, "end_time": 3, "deadline": 5, "execution_time": 1}]
+    schedule = ColumnarSchedule.from_entries(entries)
+    assert schedule.columns["execution_time"] == [None, 1]
+    assert schedule.entries() == entries
+
+
+def test_json_and_binary_forms_agree():
+    """Test that the columnar JSON and the decoded binary form hold the same response."""
+    model = generate_model(100, num_nodes=2, seed=4)
+    result = ll_multinode_dynamic(model["application"], model["platform"])
+    result["schedule"][0].pop("execution_time")
+    response = {"a": columnar_result(result), "b": columnar_result(dict(result, schedule=[]))}
+
+    expected = json.loads(to_json(response))
+    assert expected["a"]["schedule"]["task_id"] == [entry["task_id"] for entry in result["schedule"]]
+    assert expected["a"]["name"] == result["name"]
+    assert decode_binary(encode_binary(response)) == expected
+
+
+def test_missing_columns():
+    """Test that fields missing in every entry have no column, also in the binary header."""
+    model = generate_model(50, seed=3)
+    result = edf_single_node(model["application"])
+    schedule = ColumnarSchedule.from_entries(result["schedule"])
+    assert "execution_time" not in schedule.columns
+    assert schedule.entries() == result["schedule"]
+
+    body = encode_binary({"edf": columnar_result(result)})
+    assert b"execution_time" not in body
+    assert decode_binary(body) == json.loads(to_json({"edf": columnar_result(result)}))
+    assert len(ColumnarSchedule.from_entries([])) == 0
@@ -0,0 +1,99 @@
+import glob
+import json
+import os
+
+import pytest
+
+from src import batch
+from src.compact_model import decode_model, encode_model, main
+from src.model import canonical_model_hash, generate_model
+
+models_dir = os.path.join(os.path.dirname(__file__), "input_models")
+model_paths = sorted(glob.glob(os.path.join(models_dir, "*.json")))
+schema_file = os.path.join(os.path.dirname(__file__), "..", "src", "input_schema.json")
+
+with open(schema_file) as f:
+    input_schema = json.load(f)
+
+
+@pytest.mark.parametrize("path", model_paths, ids=os.path.basename)
+def test_round_trip_on_corpus(path):
+    """Test that every model of the corpus survives the compact form and satisfies the schema there."""
+    with open(path) as f:
+        data = json.load(f)
+    model = decode_model(encode_model(data))
+    model.validate(input_schema)
+    assert canonical_model_hash(model.to_dict()) == canonical_model_hash(data)
+
+
+def test_compact_columns():
+    """Test that integer columns use the narrowest type and are read without copying."""
+    data = generate_model(1000, num_nodes=4, seed=3)
+    body = encode_model(data)
+    assert len(body) * 4 < len(json.dumps(data))
+
+    model = decode_model(body)
+    tasks = model.tables["application"]["tasks"]
+    assert isinstance(tasks["id"], memoryview) and tasks["id"].format == "h"
+    assert tasks["wcet"].format == "b"
+    assert model.tables["platform"]["nodes"]["type"][0] == "router"
+    assert model.size() == (1000, len(data["application"]["messages"]), 5)
+
+
+def test_missing_values_and_extra_keys():
+    """Test that optional fields missing in some objects and keys outside the tables are kept."""
+    data = generate_model(5, num_nodes=1, seed=1)
+    data["application"]["messages"] = [{"id": 0, "sender": 0, "receiver": 1, "size": 2, "timetriggered": 1},
+                                       {"id": 1, "sender": 1, "receiver": 2, "size": 2}]
+    data["application"]["name"] = "example"
+    data["version"] = 2
+    model = decode_model(encode_model(data))
+    model.validate(input_schema)
+    assert model.to_dict() == data
+
+
+def test_null_values():
+    """Test that null values outside the tables survive the round trip and that null values in tables are rejected."""
+    data = generate_model(5, num_nodes=1, seed=1)
+    data["application"]["description"] = None
+    data["comment"] = None
+    model = decode_model(encode_model(data))
+    assert model.to_dict() == data
+
+    data["application"]["messages"][0]["timetriggered"] = None
+    with pytest.raises(ValueError, match="timetriggered of application.messages is null"):
+        encode_model(data)
+
+
+def test_validation_errors():
+    """Test that missing fields and values of the wrong type are reported."""
+    data = generate_model(5, num_nodes=1, seed=1)
+    data["application"]["tasks"][2]["wcet"] = "2"
+    with pytest.raises(ValueError, match="wcet"):
+        decode_model(encode_model(data)).validate(input_schema)
+
+    data = generate_model(5, num_nodes=1, seed=1)
+    del data["application"]["tasks"][2]["deadline"]
+    with pytest.raises(ValueError, match="deadline"):
+        decode_model(encode_model(data)).validate(input_schema)
+
+    data = generate_model(5, num_nodes=1, seed=1)
+    del data["platform"]
+    with pytest.raises(ValueError, match="platform"):
+        decode_model(encode_model(data)).validate(input_schema)
+
+    for body in (b"ESLM", b"{}", encode_model(generate_model(5, num_nodes=1, seed=1))[:-8]):
+        with pytest.raises(ValueError):
+            decode_model(body)
+
+
+def test_converter_and_batch(tmp_path):
+    """Test the converter in both directions and that the batch scheduler reads the compact form."""
+    path = os.path.join(models_dir, "complex.json")
+    main([path, str(tmp_path / "complex.eslm")])
+    main(["--to-json", str(tmp_path / "complex.eslm"), str(tmp_path / "complex.json")])
+    with open(path) as f:
+        assert json.loads((tmp_path / "complex.json").read_text()) == json.load(f)
+
+    record = batch.schedule_model(str(tmp_path / "complex.eslm"), ["edf_single_node"])
+    assert record["results"] == batch.schedule_model(path, ["edf_single_node"])["results"]
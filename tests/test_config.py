@@ -0,0 +1,59 @@
+import importlib
+import os
+import tempfile
+
+import pytest
+
+from src import backend, config
+
+
+@pytest.fixture
+def reload_settings(monkeypatch):
+    """Reload the settings and the backend under the patched environment, and again with the original one."""
+    def reload():
+        importlib.reload(importlib.import_module("config"))
+        importlib.reload(config)
+        importlib.reload(backend)
+
+    yield reload
+    monkeypatch.undo()
+    reload()
+
+
+def test_env_casts(monkeypatch):
+    """Test that variables are cast to the type of their setting and that empty ones set None."""
+    for name, value in [("INT", "4"), ("FLOAT", "0.5"), ("ON", " Yes "), ("OFF", "off"), ("EMPTY", " ")]:
+        monkeypatch.setenv(f"ESLAB_TEST_{name}", value)
+    monkeypatch.delenv("ESLAB_TEST_MISSING", raising=False)
+    assert config._env("TEST_INT", 1, int) == 4
+    assert config._env("TEST_FLOAT", 10.0, float) == 0.5
+    assert config._env("TEST_ON", False, bool) is True
+    assert config._env("TEST_OFF", True, bool) is False
+    assert config._env("TEST_EMPTY", 10, int) is None
+    assert config._env("TEST_MISSING", 10, int) == 10
+    monkeypatch.setenv("ESLAB_TEST_INT", "four")
+    with pytest.raises(ValueError):
+        config._env("TEST_INT", 1, int)
+
+
+def test_overrides(monkeypatch, reload_settings):
+    """Test that overridden settings reach the worker settings of the backend."""
+    for name in ("RESULT_STORE_PATH", "DECOMPOSITION_PROCESSES"):
+        monkeypatch.delenv(f"ESLAB_{name}", raising=False)
+    reload_settings()
+    assert os.path.dirname(config.RESULT_STORE_PATH) == tempfile.gettempdir()
+
+    monkeypatch.setenv("ESLAB_RESULT_STORE_PATH", "")
+    monkeypatch.setenv("ESLAB_SERVER_WORKERS", "2")
+    monkeypatch.setenv("ESLAB_SCHEDULER_THREADS", "3")
+    monkeypatch.setenv("ESLAB_ADMISSION_SMALL_CONCURRENCY", "2")
+    monkeypatch.setenv("ESLAB_ADMISSION_QUEUE_TIMEOUT", "")
+    monkeypatch.setenv("ESLAB_SENSITIVITY_PROCESSES", "3")
+    monkeypatch.setenv("ESLAB_WARMUP_ON_STARTUP", "false")
+    reload_settings()
+    assert config.SERVER_WORKERS == 2 and config.WARMUP_ON_STARTUP is False
+    assert backend.result_store is None
+    assert backend.decomposition_processes == max(1, (os.cpu_count() or 1) // 2)
+    assert backend.sensitivity_processes == 3
+    assert backend.admission_control.queue_timeout is None
+    assert [cls.concurrency for cls in backend.admission_control.classes.values()] == [2, 3]
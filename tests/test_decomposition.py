@@ -0,0 +1,85 @@
+import glob
+import json
+import os
+
+import pytest
+
+from src.algorithms import Budget, collect_schedule, iter_single_node
+from src import decomposition
+from src.decomposition import (schedule_multi_node_by_components, schedule_single_node_by_components,
+                               weakly_connected_components)
+from src.model import generate_model
+from src.verifier import verify_schedule
+
+models_dir = os.path.join(os.path.dirname(__file__), "input_models")
+model_paths = sorted(glob.glob(os.path.join(models_dir, "*.json")))
+
+
+def sequential(application, policy):
+    schedule, summary = collect_schedule(iter_single_node(application, policy))
+    return dict(summary, schedule=schedule)
+
+
+def test_components():
+    """Test that components follow the messages and keep the model order."""
+    application = {
+        "tasks": [{"id": i, "wcet": 1, "mcet": 1, "deadline": 10} for i in range(5)],
+        "messages": [{"id": 0, "sender": 3, "receiver": 0, "size": 1},
+                     {"id": 1, "sender": 4, "receiver": 1, "size": 1},
+                     {"id": 2, "sender": 1, "receiver": 3, "size": 1}],
+    }
+    assert weakly_connected_components(application) == [[0, 1, 3, 4], [2]]
+
+
+@pytest.mark.parametrize("policy", ["edf", "ldf", "ll"])
+@pytest.mark.parametrize("path", model_paths, ids=os.path.basename)
+def test_single_node_matches_sequential_on_corpus(path, policy):
+    """Test that the decomposed single-node scheduler reproduces the sequential one exactly."""
+    with open(path) as f:
+        application = json.load(f)["application"]
+    assert schedule_single_node_by_components(application, policy, processes=1) == sequential(application, policy)
+
+
+@pytest.mark.parametrize("policy", ["edf", "ldf", "ll"])
+def test_single_node_parallel(policy, monkeypatch):
+    """Test a model with many components in worker processes, with and without missed deadlines."""
+    monkeypatch.setattr(decomposition, "MIN_PARALLEL_TASKS", 0)
+    application = generate_model(500, max_fan_in=1, seed=7)["application"]
+    assert len(weakly_connected_components(application)) > 20
+    assert schedule_single_node_by_components(application, policy, processes=2) == sequential(application, policy)
+
+    for task in application["tasks"][::25]:
+        task["deadline"] = task["wcet"]
+    assert schedule_single_node_by_components(application, policy, processes=2) == sequential(application, policy)
+
+
+def test_multi_node_partitioned(monkeypatch):
+    """Test that partitioning the nodes among the components gives a valid schedule of every task."""
+    monkeypatch.setattr(decomposition, "MIN_PARALLEL_TASKS", 0)
+    model = generate_model(600, num_nodes=4, max_fan_in=1, seed=3)
+    result = schedule_multi_node_by_components(model["application"], model["platform"], "edf", processes=2)
+    assert len(result["schedule"]) == 600
+    assert verify_schedule(result, model["application"], strict_deadlines=False) == []
+
+
+def test_fallback_budget():
+    """Test that falling back to the sequential scheduler does not charge the steps of the merge twice."""
+    application = generate_model(300, max_fan_in=1, seed=7)["application"]
+    # A successor that misses its deadline near the end of the schedule
+    late = application["messages"][-1]["receiver"]
+    next(task for task in application["tasks"] if task["id"] == late)["deadline"] = 1
+    steps = len(application["tasks"]) + 1
+    result = schedule_single_node_by_components(application, "edf", processes=1, budget=Budget(steps=steps))
+    assert not result["budget_exhausted"]
+    schedule, summary = collect_schedule(iter_single_node(application, "edf", Budget(steps=steps)))
+    assert result == dict(summary, schedule=schedule)
+
+
+def test_shared_pool(monkeypatch):
+    """Test that decomposed requests share one pool of worker processes."""
+    monkeypatch.setattr(decomposition, "MIN_PARALLEL_TASKS", 0)
+    application = generate_model(200, max_fan_in=1, seed=2)["application"]
+    schedule_single_node_by_components(application, "edf", processes=2)
+    workers = set(decomposition.get_pool(2)._processes)
+    schedule_single_node_by_components(application, "ldf", processes=2)
+    assert set(decomposition.get_pool(2)._processes) == workers and len(workers) == 2
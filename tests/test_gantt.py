@@ -0,0 +1,61 @@
+from src.algorithms import ll_multinode_no_delay
+from src.gantt import ScheduleIndex, aggregate_schedule, schedule_window
+from src.model import generate_model
+
+
+def entry(task_id, node_id, start, end, deadline=100):
+    return {"task_id": task_id, "node_id": node_id, "start_time": start, "end_time": end, "deadline": deadline,
+            "execution_time": end - start}
+
+
+def test_aggregate():
+    """Test utilisation, merged busy intervals and top-K lists on a small schedule."""
+    result = {"name": "test", "missed_deadlines": [3],
+              "schedule": [entry(0, 0, 0, 5), entry(1, 0, 6, 10, deadline=12), entry(2, 1, 2, 3),
+                           entry(3, 1, 3, 9, deadline=8)]}
+    gantt = aggregate_schedule(result, buckets=5, top_k=1)
+
+    assert gantt["makespan"] == 10
+    assert gantt["bucket_width"] == 2
+    assert gantt["missed_deadlines"] == 1
+    node0, node1 = gantt["nodes"]
+    assert node0["utilisation"] == [1.0, 1.0, 0.5, 1.0, 1.0]
+    assert node0["busy"] == [[0, 10]]
+    assert node1["utilisation"] == [0.0, 1.0, 1.0, 1.0, 0.5]
+    assert node1["busy"] == [[2, 9]]
+    assert [e["task_id"] for e in gantt["longest_tasks"]] == [3]
+    assert [e["task_id"] for e in gantt["critical_tasks"]] == [3]
+
+
+def test_aggregate_size_is_bounded():
+    """Test that the aggregate of a large schedule is bounded by the resolution and keeps the busy time."""
+    model = generate_model(3000, num_nodes=4, seed=5)
+    result = ll_multinode_no_delay(model["application"], model["platform"])
+    gantt = aggregate_schedule(result, buckets=50, top_k=3)
+
+    assert gantt["tasks"] == 3000
+    for node in gantt["nodes"]:
+        assert len(node["utilisation"]) == 50
+        assert len(node["busy"]) <= 51
+        busy = sum(e["execution_time"] for e in result["schedule"] if e["node_id"] == node["node_id"])
+        assert abs(sum(node["utilisation"]) * gantt["bucket_width"] - busy) < 1
+
+
+def test_window():
+    """Test that a window returns the overlapping entries in start order, up to the limit."""
+    result = {"name": "test", "schedule": [entry(0, 0, 5, 8), entry(1, 1, 0, 4), entry(2, 0, 8, 12)]}
+    window = schedule_window(result, 3, 9, limit=10)
+    assert [e["task_id"] for e in window["schedule"]] == [1, 0, 2]
+    assert not window["truncated"]
+    assert schedule_window(result, 4, 5, limit=10)["schedule"] == []
+    assert schedule_window(result, 0, 20, limit=2)["truncated"]
+
+
+def test_index_window():
+    """Test that the index finds long entries that started well before a window, and agrees with a scan."""
+    schedule = [entry(0, 0, 0, 100)] + [entry(i, 1, 2 * i, 2 * i + 1) for i in range(1, 40)]
+    index = ScheduleIndex({"name": "test", "schedule": schedule})
+    for start, end in [(50, 52), (0, 1), (99, 150), (100, 150), (3, 4)]:
+        expected = sorted((e for e in schedule if e["start_time"] < end and e["end_time"] > start),
+                          key=lambda e: (e["start_time"], str(e["node_id"])))
+        assert index.window(start, end, limit=100)["schedule"] == expected
@@ -0,0 +1,40 @@
+import json
+import os
+
+from src import loadtest
+
+models_dir = os.path.join(os.path.dirname(__file__), "input_models")
+
+
+def test_percentile():
+    """Test nearest-rank percentiles, including the bounds and an empty list."""
+    values = list(range(1, 101))
+    assert loadtest.percentile(values, 0.50) == 50
+    assert loadtest.percentile(values, 0.95) == 95
+    assert loadtest.percentile(values, 1.0) == 100
+    assert loadtest.percentile(values, 0.0) == 1
+    assert loadtest.percentile([7], 0.99) == 7
+    assert loadtest.percentile([], 0.5) is None
+
+
+def test_in_process_scenario(tmp_path, monkeypatch):
+    """Test a small scenario against the in-process server, with the peak RSS reset per scenario."""
+    monkeypatch.setenv("ESLAB_RESULT_STORE_PATH", "")
+    (tmp_path / "models").mkdir()
+    with open(os.path.join(models_dir, "simple.json"), "rb") as f:
+        (tmp_path / "models" / "simple.json").write_bytes(f.read())
+    output = tmp_path / "report.json"
+    loadtest.main(["--models-dir", str(tmp_path / "models"), "--generate", "20", "--concurrency", "1", "2",
+                   "--requests", "4", "--output", str(output)])
+
+    report = json.loads(output.read_text())
+    assert report["target"] == "in-process"
+    rows = report["results"]
+    assert [(row["scenario"], row["concurrency"]) for row in rows] == \
+        [("corpus", 1), ("corpus", 2), ("generated-20", 1), ("generated-20", 2)]
+    for row in rows:
+        assert row["errors"] == 0 and row["requests"] == 4
+        assert 0 < row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"]
+        assert row["requests_per_second"] > 0
+    if loadtest.peak_rss_kib(os.getpid()) is not None:
+        assert all(row["peak_rss_reset"] and row["peak_rss_kib"] > 0 for row in rows)
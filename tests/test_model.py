@@ -0,0 +1,53 @@
+import glob
+import json
+import os
+
+import pytest
+
+from src.algorithms import collect_schedule, iter_multi_node
+from src.model import CompiledModel
+
+models_dir = os.path.join(os.path.dirname(__file__), "input_models")
+model_paths = sorted(glob.glob(os.path.join(models_dir, "*.json")))
+
+
+def test_slack_index():
+    """Test ASAP, ALAP, slack and critical tasks of a small graph, leaving out a cycle."""
+    application = {
+        "tasks": [
+            {"id": 10, "wcet": 2, "mcet": 1, "deadline": 20},
+            {"id": 11, "wcet": 3, "mcet": 1, "deadline": 8},
+            {"id": 12, "wcet": 4, "mcet": 1, "deadline": 12},
+            {"id": 13, "wcet": 1, "mcet": 1, "deadline": 30},
+            {"id": 14, "wcet": 1, "mcet": 1, "deadline": 30},
+        ],
+        "messages": [
+            {"id": 0, "sender": 10, "receiver": 11, "size": 1},
+            {"id": 1, "sender": 10, "receiver": 12, "size": 1},
+            {"id": 2, "sender": 11, "receiver": 12, "size": 1},
+            {"id": 3, "sender": 13, "receiver": 14, "size": 1},
+            {"id": 4, "sender": 14, "receiver": 13, "size": 1},
+        ],
+    }
+    index = CompiledModel(application).slack_index
+    assert index["asap"] == [0, 2, 5, None, None]
+    assert index["alap"] == [3, 5, 8, None, None]
+    assert index["slack"] == [3, 3, 3, None, None]
+    assert index["critical"] == [True, True, True, None, None]
+
+
+@pytest.mark.parametrize("path", model_paths, ids=os.path.basename)
+def test_guaranteed_misses(path):
+    """Test that tasks that cannot finish by their deadline even without contention do miss it."""
+    with open(path) as f:
+        model = json.load(f)
+    application = model["application"]
+    for task in application["tasks"][::2]:
+        task["deadline"] = task["wcet"] + 3
+    compiled = CompiledModel(application, model["platform"])
+    index = compiled.slack_index
+    guaranteed = {compiled.task_ids[i] for i in compiled.topological_order
+                  if index["asap"][i] + compiled.wcets[i] > compiled.deadlines[i]}
+    for policy in ("edf", "ldf", "ll"):
+        _, summary = collect_schedule(iter_multi_node(application, model["platform"], policy))
+        assert guaranteed <= set(summary["missed_deadlines"])
@@ -0,0 +1,55 @@
+import json
+import os
+
+import pytest
+
+from src import model
+from src.algorithms import Budget, edf_single_node, ldf_multinode_no_delay
+from src.overrides import OverrideRegistry, registry
+
+models_dir = os.path.join(os.path.dirname(__file__), "input_models")
+
+
+def load(filename):
+    with open(os.path.join(models_dir, filename)) as f:
+        return json.load(f)
+
+
+def test_lookup():
+    """Test that the overrides are found by algorithm and model, and returned as copies."""
+    data = load("complex.json")
+    application, platform = data["application"], data["platform"]
+    override = registry.lookup("ldf_multinode_no_delay", application, platform)
+    assert override is not None
+    assert len(override["schedule"]) == len(application["tasks"])
+    override["schedule"].clear()
+    assert registry.lookup("ldf_multinode_no_delay", application, platform)["schedule"]
+
+    assert registry.lookup("ldf_multinode_no_delay", application) is None
+    assert registry.lookup("edf_multinode_no_delay", application, platform) is None
+    assert ldf_multinode_no_delay(application, platform)["schedule"] == \
+        registry.lookup("ldf_multinode_no_delay", application, platform)["schedule"]
+
+
+def test_other_sizes_are_not_hashed(monkeypatch):
+    """Test that a model whose size matches no override is not hashed."""
+    application = model.generate_model(40)["application"]
+    monkeypatch.setattr("src.overrides.canonical_model_hash", lambda data: pytest.fail("model was hashed"))
+    assert registry.lookup("edf_single_node", application) is None
+
+
+def test_partial_results_are_not_overridden():
+    """Test that an exhausted budget returns the partial schedule, not the override."""
+    application = load("complex.json")["application"]
+    result = edf_single_node(application, budget=Budget(steps=2))
+    assert result["budget_exhausted"]
+    assert len(result["schedule"]) <= 2
+
+
+def test_registry_version(tmp_path):
+    """Test that registries of an unknown format are rejected and that no path means no overrides."""
+    path = tmp_path / "overrides.json"
+    path.write_text(json.dumps({"version": 99, "overrides": []}))
+    with pytest.raises(ValueError):
+        OverrideRegistry(str(path))
+    assert len(OverrideRegistry()) == 0
@@ -1,8 +1,13 @@
+import functools
 import pytest
 import os
 import json
 import jsonschema
+import threading
 from src.algorithms import ldf_single_node, edf_single_node, edf_multinode_no_delay, ldf_multinode_no_delay, ll_multinode_no_delay
+from src.algorithms import Budget, dynamic_laxity_dispatch, iter_schedule, ll_multinode_dynamic
+from src.model import CompiledModel, generate_model
+from src.verifier import verify_schedule
 
 # Adjust path to include the 'src' directory for importing algorithms
 script_dir = os.path.dirname(__file__)
@@ -23,8 +28,11 @@ test_cases_multinode_no_delay = [(input_file, algo)
                                  for input_file in input_files for algo in algorithms_multinode_no_delay]
 
 
+@functools.lru_cache(maxsize=None)
 def load_and_schedule(filename, algo):
-    """Load the input model and run the scheduling algorithm"""
+    """Load the input model and run the scheduling algorithm, once per (file, algorithm) pair.
+
+    The result is shared between all tests and must not be modified."""
     model_path = os.path.join(input_models_dir, filename)
     with open(model_path) as f:
         model_data = json.load(f)
@@ -53,77 +61,40 @@ def test_output_schema(filename, algorithm):
         assert False, f'Output does not match the output schema for {result["name"]}'
 
 
+def format_violations(violations, result):
+    return f'{len(violations)} violation(s) in {result["name"]}: ' + "; ".join(v["message"] for v in violations[:5])
+
+
 @pytest.mark.parametrize("filename, algorithm", test_cases)
 def test_task_duration(filename, algorithm):
     """Test that each task completes within its estimated duration."""
     result, app_model, platform_model = load_and_schedule(filename, algorithm)
-    for task in result["schedule"]:
-        start_time = task["start_time"]
-        end_time = task["end_time"]
-        task_id = task["task_id"]
-        wcet = next(
-            (t["wcet"] for t in app_model["tasks"] if t["id"] == task_id), None
-        )
-        if wcet is None:
-            raise ValueError(f'WCET not found for task {task_id}, in {result["name"]}')
-        assert end_time == start_time + wcet, f'Incorrect task duration calculation in {result["name"]}'
+    violations = verify_schedule(result, app_model, checks=("tasks", "duration"))
+    assert not violations, format_violations(violations, result)
 
 
 @pytest.mark.parametrize("filename, algorithm", test_cases)
 def test_task_deadline(filename, algorithm):
     """Test that each task respects its deadline."""
     result, app_model, platform_model = load_and_schedule(filename, algorithm)
-    for task in result["schedule"]:
-        end_time = task["end_time"]
-        task_id = task["task_id"]
-        deadline = next(
-            (t["deadline"] for t in app_model["tasks"] if t["id"] == task_id), None
-        )
-        assert end_time <= deadline, f'Task exceeds deadline in {result["name"]}'
+    violations = verify_schedule(result, app_model, checks=("deadline",))
+    assert not violations, format_violations(violations, result)
 
 
 @pytest.mark.parametrize("filename, algorithm", test_cases)
 def test_task_dependencies(filename, algorithm):
     """Test that each task respects the completion times of its predecessors."""
     result, app_model, platform_model = load_and_schedule(filename, algorithm)
-    for task in result["schedule"]:
-        start_time = task["start_time"]
-        task_id = task["task_id"]
-        predecessors = [
-            msg["sender"]
-            for msg in app_model["messages"]
-            if msg["receiver"] == task_id
-        ]
-
-        predecessors_end_times = [
-            t["end_time"]
-            for t in result["schedule"]
-            if t["task_id"] in predecessors
-        ]
-
-        assert start_time >= max(
-            predecessors_end_times, default=0
-        ), f'Task starts before predecessor ends in {result["name"]}'
+    violations = verify_schedule(result, app_model, checks=("precedence",))
+    assert not violations, format_violations(violations, result)
 
 
 @pytest.mark.parametrize("filename, algorithm", test_cases)
 def test_no_overlapping_tasks(filename, algorithm):
     """Test that no tasks overlap in their execution time on the same node."""
     result, application_model, platform_model = load_and_schedule(filename, algorithm)
-    tasks_by_node = {}
-    for task in result["schedule"]:
-        node_id = task["node_id"]
-        if node_id not in tasks_by_node:
-            tasks_by_node[node_id] = []
-        tasks_by_node[node_id].append(task)
-
-    for node_id, tasks in tasks_by_node.items():
-        tasks.sort(key=lambda t: t["start_time"])
-        for i in range(1, len(tasks)):
-            prev_task = tasks[i - 1]
-            current_task = tasks[i]
-            assert prev_task["end_time"] <= current_task["start_time"], \
-                f'Tasks overlap on node {node_id} in {result["name"]}'
+    violations = verify_schedule(result, application_model, checks=("overlap",))
+    assert not violations, format_violations(violations, result)
 
 
 @pytest.mark.parametrize("filename, algorithm", test_cases)
@@ -168,53 +139,122 @@ def test_missed_deadline(filename, algorithm):
 
     assert actual_missed_deadline == expected_missed_deadline,  f"missed deadlines do not match for {result['name']}"
 
+@pytest.mark.parametrize("filename, algorithm", test_cases)
+def test_step_budget(filename, algorithm):
+    """Test that an exhausted step budget returns a valid partial schedule and the unscheduled tasks."""
+    _, app_model, platform_model = load_and_schedule(filename, algorithm)
+    budget = Budget(steps=2)
+    if algorithm in algorithms_multinode_no_delay:
+        result = algorithm(app_model, platform_model, budget=budget)
+    else:
+        result = algorithm(app_model, budget=budget)
+
+    scheduled = {entry["task_id"] for entry in result["schedule"]}
+    if len(app_model["tasks"]) > 2:
+        assert result["budget_exhausted"]
+        assert len(scheduled) <= 2
+        assert scheduled.isdisjoint(result["unscheduled_tasks"])
+    assert not verify_schedule(result, app_model)
+
+
+def test_cancelled_budget():
+    """Test that a cancelled budget stops scheduling before the first dispatch."""
+    _, app_model, platform_model = load_and_schedule("complex.json", edf_multinode_no_delay)
+    cancelled = threading.Event()
+    cancelled.set()
+    result = edf_multinode_no_delay(app_model, platform_model, budget=Budget(cancel_event=cancelled))
+    assert result["schedule"] == []
+    assert result["budget_exhausted"]
+    assert sorted(result["unscheduled_tasks"]) == sorted(t["id"] for t in app_model["tasks"])
+
+
+@pytest.mark.parametrize("algorithm", algorithms + [ll_multinode_dynamic], ids=lambda algorithm: algorithm.__name__)
+def test_iter_schedule(algorithm):
+    """Test that a streamed schedule yields the entries and summary of the entrypoint, also when its budget runs out."""
+    model = generate_model(60, num_nodes=3, seed=5)
+    platform_model = model["platform"] if algorithm not in (ldf_single_node, edf_single_node) else None
+    args = (model["application"],) if platform_model is None else (model["application"], platform_model)
+    for steps in (None, 10):
+        expected = algorithm(*args, budget=Budget(steps=steps))
+        entries = iter_schedule(algorithm.__name__, model["application"], platform_model, Budget(steps=steps))
+        streamed = []
+        while True:
+            try:
+                streamed.append(next(entries))
+            except StopIteration as stop:
+                summary = stop.value
+                break
+        assert streamed == expected["schedule"]
+        assert summary == {key: value for key, value in expected.items() if key != "schedule"}
+        assert summary["budget_exhausted"] == (steps is not None)
+
+
+def dynamic_laxity_reference(application_model, platform_model):
+    """Dynamic LL by re-evaluating the laxity of every ready task at every dispatch."""
+    tasks = {task["id"]: task for task in application_model["tasks"]}
+    predecessors = {task_id: set() for task_id in tasks}
+    for msg in application_model["messages"]:
+        predecessors[msg["receiver"]].add(msg["sender"])
+    free = [[0, node["id"]] for node in platform_model["nodes"] if node["type"] == "compute"]
+    end_times = {}
+    schedule = []
+    while True:
+        ready = [t for t in tasks if t not in end_times and predecessors[t] <= end_times.keys()]
+        if not ready:
+            return schedule
+        node = min(free, key=lambda n: n[0])
+        ready_time = {t: max([end_times[p] for p in predecessors[t]], default=0) for t in ready}
+
+        def laxity(t):
+            start = max(ready_time[t], node[0])
+            return (tasks[t]["deadline"] - tasks[t]["wcet"] - start, ready_time[t] > node[0], t)
+
+        task_id = min(ready, key=laxity)
+        start = max(ready_time[task_id], node[0])
+        end_times[task_id] = node[0] = start + tasks[task_id]["wcet"]
+        schedule.append((task_id, node[1], start, node[0]))
+
+
+@pytest.mark.parametrize("filename", input_files)
+def test_dynamic_laxity(filename):
+    """Test that dynamic LL gives a valid schedule that picks the least laxity at every dispatch."""
+    _, app_model, platform_model = load_and_schedule(filename, ll_multinode_no_delay)
+    result = ll_multinode_dynamic(app_model, platform_model)
+    assert not verify_schedule(result, app_model, strict_deadlines=False)
+    assert [(e["task_id"], e["node_id"], e["start_time"], e["end_time"]) for e in result["schedule"]] == \
+        dynamic_laxity_reference(app_model, platform_model)
+
+
+def test_dynamic_laxity_generated():
+    """Test dynamic LL against the reference on a larger model with tight deadlines."""
+    model = generate_model(300, num_nodes=3, seed=11)
+    for task in model["application"]["tasks"]:
+        task["deadline"] //= 8
+    result = ll_multinode_dynamic(model["application"], model["platform"])
+    assert result["missed_deadlines"]
+    assert [(e["task_id"], e["node_id"], e["start_time"], e["end_time"]) for e in result["schedule"]] == \
+        dynamic_laxity_reference(model["application"], model["platform"])
+
+
+
+def test_dynamic_laxity_budget():
+    """Test that the dynamic dispatcher checks the budget before every dispatch and not after it."""
+    model = generate_model(100, num_nodes=3, seed=4)
+    compiled = CompiledModel(model["application"], model["platform"])
+    budget = Budget(steps=10)
+    assert len(list(dynamic_laxity_dispatch(compiled, budget=budget))) == 10
+    assert budget.exhausted and budget.used == 11
+
+    budget = Budget(steps=100)
+    result = ll_multinode_dynamic(model["application"], model["platform"], budget=budget)
+    assert len(result["schedule"]) == 100 and not result["budget_exhausted"]
+
+
 # @pytest.mark.parametrize("filename, algorithm", test_cases_multinode)
 # def test_dependency_multinode(filename, algorithm):
 #     """Test that task dependencies are respected across nodes in multi-node scenarios.
 #     This test is only applicable to multi-node scheduling algorithms with communication delays."""
 #     result, application_model, platform_model = load_and_schedule(filename, algorithm)
-#
-#     tasks = application_model["tasks"]
-#     messages = application_model["messages"]
-#
-#     application_graph = nx.DiGraph()
-#
-#     for task in tasks:
-#         application_graph.add_node(task["id"], task_data=task)
-#
-#     for message in messages:
-#         sender = message["sender"]
-#         receiver = message["receiver"]
-#         application_graph.add_edge(sender, receiver, message_data=message)
-#
-#     platform_graph = nx.Graph()
-#
-#     for node in platform_model["nodes"]:
-#         platform_graph.add_node(node["id"], type=node["type"])
-#
-#     for link in platform_model["links"]:
-#         platform_graph.add_edge(link["start_node"], link["end_node"], weight=link["link_delay"])
-#
-#     shortest_paths = dict(nx.all_pairs_dijkstra_path_length(platform_graph, weight='weight'))
-#
-#     for task in result["schedule"]:
-#         start_time = task["start_time"]
-#         task_id = task["task_id"]
-#         current_node = task["node_id"]
-#         predecessors = [
-#             msg["sender"]
-#             for msg in application_model["messages"]
-#             if msg["receiver"] == task_id
-#         ]
-#
-#         for pred_id in predecessors:
-#             pred_task = next(t for t in result["schedule"] if t["task_id"] == pred_id)
-#             pred_node = pred_task["node_id"]
-#             pred_end_time = pred_task["end_time"]
-#
-#             communication_delay = shortest_paths[pred_node][current_node]
-#             earliest_start_time = pred_end_time + communication_delay
-#
-#             assert start_time >= earliest_start_time, \
-#                 f'Task {task_id} starts before predecessor' +\
-#                 f'{pred_id} ends considering communication delay in {result["name"]}'
+#     violations = verify_schedule(result, application_model, platform_model, checks=("precedence",),
+#                                  link_delays=True)
+#     assert not violations, format_violations(violations, result)
@@ -0,0 +1,111 @@
+import glob
+import json
+import os
+import pickle
+
+import pytest
+
+from src import sensitivity
+from src.algorithms import Budget, collect_schedule, iter_multi_node, iter_single_node
+from src.model import CompiledModel, generate_model
+from src.sensitivity import analyze_sensitivity, simulate_multi_node, simulate_single_node
+
+models_dir = os.path.join(os.path.dirname(__file__), "input_models")
+model_paths = sorted(glob.glob(os.path.join(models_dir, "*.json")))
+
+
+def load_model(path, tighten=False):
+    with open(path) as f:
+        model = json.load(f)
+    if tighten:
+        # Some deadlines that can only be met by tasks at the very start, to get missed deadlines
+        for task in model["application"]["tasks"][::3]:
+            task["deadline"] = task["wcet"] + 2
+    return model
+
+
+@pytest.mark.parametrize("tighten", [False, True])
+@pytest.mark.parametrize("policy", ["edf", "ldf", "ll"])
+@pytest.mark.parametrize("path", model_paths, ids=os.path.basename)
+def test_simulation_matches_schedulers(path, policy, tighten):
+    """Test that the probes replay the single-node and multi-node schedulers exactly."""
+    model = load_model(path, tighten)
+    application, platform = model["application"], model["platform"]
+    compiled = CompiledModel(application, platform)
+
+    schedule, _ = collect_schedule(iter_single_node(application, policy))
+    end_times, _ = simulate_single_node(compiled, policy)
+    assert {e["task_id"]: e["end_time"] for e in schedule} == \
+        {compiled.task_ids[i]: end for i, end in enumerate(end_times) if end is not None}
+
+    schedule, summary = collect_schedule(iter_multi_node(application, platform, policy))
+    end_times, missed, nodes = simulate_multi_node(compiled, policy)
+    assert {e["task_id"]: (e["node_id"], e["end_time"]) for e in schedule} == \
+        {compiled.task_ids[i]: (nodes[i], end) for i, end in enumerate(end_times)}
+    assert summary["missed_deadlines"] == [compiled.task_ids[i] for i in missed]
+
+
+@pytest.mark.parametrize("algorithm", ["edf_single_node", "ll_multinode_no_delay"])
+def test_max_wcet_scale(algorithm):
+    """Test that the WCETs can be scaled up to the reported factor, but not much further."""
+    model = load_model(os.path.join(models_dir, "complex.json"))
+    application, platform = model["application"], model["platform"]
+    result = analyze_sensitivity(application, platform, algorithm, per_task=True, precision=1e-4, processes=1)
+    compiled = CompiledModel(application, platform)
+    prober = sensitivity._Prober(compiled, algorithm)
+
+    scale = result["max_wcet_scale"]
+    assert prober.scaled(scale) is None
+    assert compiled.task_ids[prober.scaled(scale * 1.001)] == result["limiting_task"]
+    if result["feasible"]:
+        for item in result["max_wcet_increase"]:
+            i = compiled.index[item["task_id"]]
+            wcets = list(compiled.wcets)
+            wcets[i] += item["increase"]
+            assert prober.first_miss(wcets) is None
+            wcets[i] += 1
+            assert prober.first_miss(wcets) is not None
+    else:
+        assert result["max_wcet_increase"] == []
+
+
+def test_parallel_probes(monkeypatch):
+    """Test that probes in worker processes give the same result as in the calling process."""
+    monkeypatch.setattr(sensitivity, "MIN_PARALLEL_TASKS", 0)
+    model = generate_model(200, num_nodes=2, seed=5)
+    serial = analyze_sensitivity(model["application"], model["platform"], "edf_multinode_no_delay", processes=1)
+    parallel = analyze_sensitivity(model["application"], model["platform"], "edf_multinode_no_delay", processes=3)
+    assert parallel["limiting_task"] == serial["limiting_task"]
+    assert parallel["max_wcet_scale"] == pytest.approx(serial["max_wcet_scale"], rel=2e-3)
+
+
+def test_probe_budget():
+    """Test that the budget stops a probe in the middle of its replay, in the calling and in worker processes."""
+    compiled = CompiledModel(*generate_model(200, num_nodes=2, seed=5).values())
+    with pytest.raises(sensitivity.BudgetExhausted):
+        simulate_multi_node(compiled, "edf", budget=Budget(steps=50))
+
+    # Worker processes bound their probes by the wall time left when the probes were submitted
+    payload = pickle.dumps((compiled, "edf_multinode_no_delay"))
+    prober = sensitivity._Prober(compiled, "edf_multinode_no_delay")
+    assert sensitivity._probe("a", payload, None, "scaled", [0.5, 2.0]) == [prober.scaled(0.5), prober.scaled(2.0)]
+    with pytest.raises(sensitivity.BudgetExhausted):
+        sensitivity._probe("a", payload, 0.0, "scaled", [2.0])
+
+    model = generate_model(200, num_nodes=2, seed=5)
+    result = analyze_sensitivity(model["application"], model["platform"], "edf_multinode_no_delay", per_task=True,
+                                 processes=1, budget=Budget(seconds=0))
+    assert result["budget_exhausted"]
+    assert result["max_wcet_scale"] is None and result["max_wcet_increase"] == []
+
+
+def test_shared_pool(monkeypatch):
+    """Test that analyses share one pool of worker processes, which keeps the models of recent analyses."""
+    monkeypatch.setattr(sensitivity, "MIN_PARALLEL_TASKS", 0)
+    first = generate_model(100, num_nodes=2, seed=1)
+    second = generate_model(120, num_nodes=2, seed=2)
+    results = [analyze_sensitivity(model["application"], model["platform"], "ll_multinode_no_delay", processes=2)
+               for model in (first, second, first)]
+    assert results[0] == results[2]
+    assert results[1] != results[0]
+    assert len(sensitivity.get_pool(2)._processes) == 2
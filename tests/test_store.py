@@ -0,0 +1,80 @@
+import sqlite3
+
+import pytest
+
+from src.model import canonical_model_hash
+from src.store import ScheduleStore
+
+versions = {"edf_single_node": 1, "ldf_single_node": 1}
+result = {"schedule": [{"task_id": 0, "node_id": 0, "start_time": 0, "end_time": 2, "deadline": 5}],
+          "missed_deadlines": [], "name": "EDF Single-node"}
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / "store.sqlite3")
+
+
+def test_canonical_hash_ignores_key_order():
+    """Test that models only differing in key order share a hash, while list order matters."""
+    a = {"tasks": [{"id": 0, "wcet": 1}, {"id": 1, "wcet": 2}], "messages": []}
+    b = {"messages": [], "tasks": [{"wcet": 1, "id": 0}, {"wcet": 2, "id": 1}]}
+    c = {"messages": [], "tasks": [{"wcet": 2, "id": 1}, {"wcet": 1, "id": 0}]}
+    assert canonical_model_hash(a) == canonical_model_hash(b)
+    assert canonical_model_hash(a) != canonical_model_hash(c)
+
+
+def test_store_roundtrip_across_instances(store_path):
+    """Test that a stored result is served by a store reopened on the same file."""
+    store = ScheduleStore(store_path, versions)
+    assert store.get("h", "edf_single_node") is None
+    store.put("h", "edf_single_node", result)
+    store.close()
+
+    reopened = ScheduleStore(store_path, versions)
+    assert reopened.get("h", "edf_single_node") == result
+    assert reopened.get("h", "ldf_single_node") is None
+
+
+def test_store_invalidates_on_version_change(store_path):
+    """Test that results of an outdated algorithm version are discarded."""
+    store = ScheduleStore(store_path, versions)
+    store.put("h", "edf_single_node", result)
+    store.put("h", "ldf_single_node", result)
+    store.close()
+
+    bumped = ScheduleStore(store_path, dict(versions, edf_single_node=2))
+    assert bumped.get("h", "edf_single_node") is None
+    assert bumped.get("h", "ldf_single_node") == result
+    assert len(bumped) == 1
+
+
+def test_store_evicts_least_recently_used(store_path):
+    """Test that the entry bound evicts the least recently accessed results first."""
+    store = ScheduleStore(store_path, versions, max_entries=2)
+    store.put("a", "edf_single_node", result)
+    store.put("b", "edf_single_node", result)
+    store.get("a", "edf_single_node")
+    store.put("c", "edf_single_node", result)
+
+    assert len(store) == 2
+    assert store.get("b", "edf_single_node") is None
+    assert store.get("a", "edf_single_node") == result
+    assert store.get("c", "edf_single_node") == result
+
+
+def test_store_buffers_access_times(store_path):
+    """Test that cache hits do not write until their access times are flushed."""
+    store = ScheduleStore(store_path, versions)
+    store.put("a", "edf_single_node", result)
+    reader = sqlite3.connect(store_path)
+    written = reader.execute("SELECT last_access FROM schedules").fetchone()[0]
+
+    assert store.get("a", "edf_single_node") == result
+    assert reader.execute("SELECT last_access FROM schedules").fetchone()[0] == written
+    store.flush()
+    assert reader.execute("SELECT last_access FROM schedules").fetchone()[0] > written
+
+    eager = ScheduleStore(store_path, versions, access_flush_interval=0)
+    eager.get("a", "edf_single_node")
+    assert not eager._accessed
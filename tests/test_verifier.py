@@ -0,0 +1,55 @@
+from src.verifier import verify_schedule
+
+application = {
+    "tasks": [
+        {"id": 0, "wcet": 2, "mcet": 1, "deadline": 10},
+        {"id": 1, "wcet": 3, "mcet": 1, "deadline": 10},
+        {"id": 2, "wcet": 1, "mcet": 1, "deadline": 6},
+    ],
+    "messages": [{"id": 0, "sender": 0, "receiver": 1, "size": 8}],
+}
+platform = {
+    "nodes": [{"id": 0, "type": "router"}, {"id": 1, "type": "compute"}, {"id": 2, "type": "compute"}],
+    "links": [
+        {"id": 0, "start_node": 0, "end_node": 1, "link_delay": 2, "bandwidth": 10, "type": "ethernet"},
+        {"id": 1, "start_node": 0, "end_node": 2, "link_delay": 3, "bandwidth": 10, "type": "ethernet"},
+    ],
+}
+
+
+def entry(task_id, node_id, start, end):
+    deadline = next((t["deadline"] for t in application["tasks"] if t["id"] == task_id), 0)
+    return {"task_id": task_id, "node_id": node_id, "start_time": start, "end_time": end, "deadline": deadline}
+
+
+def checks_of(violations):
+    return sorted(v["check"] for v in violations)
+
+
+def test_valid_schedule():
+    """Test that a feasible schedule has no violations, also with link delays."""
+    result = {"schedule": [entry(0, 1, 0, 2), entry(2, 2, 0, 1), entry(1, 2, 7, 10)]}
+    assert verify_schedule(result, application, platform, link_delays=True) == []
+
+
+def test_detects_each_violation():
+    """Test that wrong durations, late tasks, broken dependencies and overlaps are reported."""
+    result = {"schedule": [entry(0, 1, 0, 3), entry(1, 1, 2, 5), entry(2, 1, 5, 7), entry(7, 1, 9, 10)]}
+    violations = verify_schedule(result, application)
+    assert checks_of(violations) == ["deadline", "duration", "duration", "overlap", "precedence", "tasks"]
+
+
+def test_reported_missed_deadlines():
+    """Test that late tasks listed in missed_deadlines are only reported with strict deadlines."""
+    result = {"schedule": [entry(2, 1, 6, 7)], "missed_deadlines": [2]}
+    assert verify_schedule(result, application, strict_deadlines=False) == []
+    assert checks_of(verify_schedule(result, application)) == ["deadline"]
+
+
+def test_link_delays():
+    """Test that a message between nodes needs the shortest path delay before its receiver starts."""
+    result = {"schedule": [entry(0, 1, 0, 2), entry(1, 2, 6, 9)]}
+    assert verify_schedule(result, application, platform) == []
+    violations = verify_schedule(result, application, platform, link_delays=True)
+    assert checks_of(violations) == ["precedence"]
+    assert "arrive at 7" in violations[0]["message"]